@@ -1,35 +1,85 @@
 # streamlit_app.py
 import os
+import sys
+from collections import deque
 import streamlit as st
-import sqlite3
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')
 
+# 프로젝트 루트의 modules 패키지를 import 하기 위함 (streamlit run app/streamlit_app.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.log_export import load_recent_logs
+from modules.news_store import search_news
+from modules.tick_bus import TickSubscriber
+from modules.candle_store import list_series, cached_specs, load_chart_data
+
 DB_FILE = "data/trade_logs.db"
+TICK_BUS_FILE = "data/tick_bus.ring"  # config.TICK_BUS_FILE과 같은 경로
+LIVE_REFRESH_SECONDS = 2  # 실시간 패널 갱신 주기 (초)
+LIVE_EVENT_LIMIT = 1000  # 실시간 패널에 보관하는 최근 틱 수
+
+# 화면에서 실제로 사용하는 컬럼만 읽음
+TRADE_COLUMNS = [
+    "id", "timestamp", "current_price", "rsi", "sentiment", "action",
+    "trade_amount", "trade_price", "balance", "position", "fee", "reason"
+]
+DECISION_COLUMNS = [
+    "id", "timestamp", "end_timestamp", "current_price", "rsi", "sentiment",
+    "decision", "reason", "hold_count"
+]
 
 @st.cache_data
-def load_data(table_name: str, limit: int = 1000):
+def load_data(table_name: str, limit: int = 1000, columns=None):
+    """
+    주어진 table_name에 대해 최근 limit 건을 DataFrame으로 반환 (log_export.load_recent_logs 캐시).
+    Parquet export가 있으면 Parquet + export 이후 SQLite 행을 합쳐서 읽음.
+    """
+    return load_recent_logs(table_name, limit=limit, columns=columns, db_file=DB_FILE)
+
+@st.cache_data(ttl=60)
+def load_candle_chart(symbol: str, timeframe: str, start_ms: int, end_ms: int, specs: tuple, max_points: int):
+    """
+    candle_store.load_chart_data 캐시 (화면 구간 + 지표 캐시 컬럼, max_points 버킷으로 축소).
+    """
+    return load_chart_data(symbol, timeframe, start_ms, end_ms, specs=specs, max_points=max_points)
+
+@st.cache_data(ttl=300)
+def load_candle_series():
+    return list_series(), {(sym, tf): cached_specs(sym, tf) for sym, tf, *_ in list_series()}
+
+def expand_decision_runs(df_decision: pd.DataFrame) -> pd.DataFrame:
+    """
+    압축된 hold 구간(hold_count > 1)을 틱 단위 행으로 펼침.
+    각 틱의 timestamp는 구간 시작~끝 사이를 균등 분할하여 추정하고, 값은 구간의 마지막 값을 사용.
     """
-    주어진 table_name에 대해 SQLite에서 데이터를 읽어 DataFrame으로 반환.
-    최근 limit 건만 가져오도록 쿼리 제한.
+    if "hold_count" not in df_decision.columns or df_decision.empty:
+        return df_decision
+
+    counts = df_decision["hold_count"].clip(lower=1)
+    expanded = df_decision.loc[df_decision.index.repeat(counts)].copy()
+    step = expanded.groupby(level=0).cumcount()
+    span = (expanded["end_timestamp"] - expanded["timestamp"]) / (expanded["hold_count"].clip(lower=2) - 1)
+    expanded["timestamp"] = expanded["timestamp"] + span * step
+    expanded["hold_count"] = 1
+    return expanded.reset_index(drop=True)
+
+def decision_run_points(df_decision: pd.DataFrame) -> pd.DataFrame:
     """
-    conn = sqlite3.connect(DB_FILE)
-    query = f"""
-        SELECT * FROM {table_name}
-        ORDER BY id DESC
-        LIMIT {limit}
+    차트용: 각 행을 (구간 시작, 구간 끝) 두 점으로 만들어 압축 구간을 계단형으로 표시.
     """
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    if "end_timestamp" not in df_decision.columns:
+        return df_decision
 
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-    df = df.sort_values("timestamp").reset_index(drop=True)
-    return df
+    ends = df_decision.copy()
+    ends["timestamp"] = ends["end_timestamp"]
+    points = pd.concat([df_decision, ends]).sort_values("timestamp", kind="stable")
+    return points.reset_index(drop=True)
 
 def display_trade_logs(df_trades: pd.DataFrame):
     """
@@ -91,23 +141,35 @@ def display_decision_logs(df_decision: pd.DataFrame):
         st.warning("Decision Logs 데이터가 없습니다.")
         return
 
-    st.write(f"표시 중: 최근 {len(df_decision)} 건")
+    if "hold_count" in df_decision.columns:
+        total_ticks = int(df_decision["hold_count"].sum())
+        st.write(f"표시 중: 최근 {len(df_decision)} 건 (압축 해제 시 {total_ticks} 틱)")
+    else:
+        st.write(f"표시 중: 최근 {len(df_decision)} 건")
 
     # 데이터 표시
-    st.dataframe(df_decision.tail(100))
+    if st.checkbox("hold 구간 펼쳐보기", value=False):
+        st.dataframe(expand_decision_runs(df_decision.tail(100)).tail(100))
+    else:
+        st.dataframe(df_decision.tail(100))
 
-    # 의사결정 빈도
+    # 의사결정 빈도 (압축된 hold 구간은 hold_count만큼 집계)
     st.subheader("Decision Frequency")
-    decision_counts = df_decision["decision"].value_counts()
+    if "hold_count" in df_decision.columns:
+        decision_counts = df_decision.groupby("decision")["hold_count"].sum()
+    else:
+        decision_counts = df_decision["decision"].value_counts()
     st.bar_chart(decision_counts)
 
+    df_points = decision_run_points(df_decision)
+
     # 세부 지표 탭
     tab_rsi, tab_senti = st.tabs(["RSI 차트", "Sentiment 차트"])
 
     with tab_rsi:
         if "rsi" in df_decision.columns:
             fig_rsi = px.line(
-                df_decision, x="timestamp", y="rsi",
+                df_points, x="timestamp", y="rsi",
                 title="RSI Over Time"
             )
             st.plotly_chart(fig_rsi, use_container_width=True)
@@ -117,7 +179,7 @@ def display_decision_logs(df_decision: pd.DataFrame):
     with tab_senti:
         if "sentiment" in df_decision.columns:
             fig_senti = px.line(
-                df_decision, x="timestamp", y="sentiment",
+                df_points, x="timestamp", y="sentiment",
                 title="Sentiment Over Time"
             )
             st.plotly_chart(fig_senti, use_container_width=True)
@@ -163,6 +225,148 @@ def display_analysis_chart(df_trades: pd.DataFrame):
     )
     st.plotly_chart(fig, use_container_width=True)
 
+def display_candle_chart():
+    """
+    캔들 차트 탭: 로컬 캔들 저장소(data/candles.db) + 지표 캐시 오버레이.
+    선택한 구간만 조회하고, 캔들이 많으면 SQLite에서 버킷 단위로 합쳐서 가져옴.
+    """
+    st.subheader("캔들 차트 (Candle Store)")
+
+    series, specs_by_series = load_candle_series()
+    if not series:
+        st.warning("저장된 캔들이 없습니다. (트레이더 실행 또는 python -m modules.candle_store --backfill)")
+        return
+
+    labels = {f"{sym} {tf} ({count:,}개)": (sym, tf, first_ts, last_ts) for sym, tf, count, first_ts, last_ts in series}
+    col1, col2 = st.columns([3, 1])
+    symbol, timeframe, first_ts, last_ts = labels[col1.selectbox("심볼 / 타임프레임", list(labels))]
+    max_points = col2.selectbox("최대 캔들 수", [500, 1000, 2000, 5000], index=2)
+
+    first_dt = pd.to_datetime(first_ts, unit="ms").to_pydatetime()
+    last_dt = pd.to_datetime(last_ts, unit="ms").to_pydatetime()
+    default_start = max(first_dt, last_dt - pd.Timedelta(days=3))
+    start_dt, end_dt = st.slider(
+        "구간", min_value=first_dt, max_value=last_dt, value=(default_start, last_dt), format="YYYY-MM-DD HH:mm"
+    )
+
+    available = specs_by_series.get((symbol, timeframe), [])
+    chosen = st.multiselect(
+        "지표", available, default=[spec for spec in available if spec[0] in ("sma", "bb", "rsi", "macd")],
+        format_func=lambda spec: f"{spec[0].upper()}({spec[1]})"
+    )
+
+    start_ms = int(pd.Timestamp(start_dt).value // 1_000_000)
+    end_ms = int(pd.Timestamp(end_dt).value // 1_000_000)
+    df = load_candle_chart(symbol, timeframe, start_ms, end_ms, tuple(chosen), max_points)
+    if df.empty:
+        st.info("선택한 구간에 캔들이 없습니다.")
+        return
+
+    show_rsi = any(spec[0] == "rsi" for spec in chosen)
+    show_macd = any(spec[0] == "macd" for spec in chosen)
+    rows = 1 + show_rsi + show_macd
+    fig = make_subplots(rows=rows, cols=1, shared_xaxes=True, vertical_spacing=0.03,
+                        row_heights=[0.6] + [0.4 / (rows - 1)] * (rows - 1) if rows > 1 else [1.0])
+    fig.add_trace(go.Candlestick(
+        x=df.index, open=df["open"], high=df["high"], low=df["low"], close=df["close"], name=symbol
+    ), row=1, col=1)
+
+    row = 1
+    for indicator, window in chosen:
+        if indicator in ("sma", "ema"):
+            fig.add_trace(go.Scatter(x=df.index, y=df[f"{indicator}_{window}"], mode="lines",
+                                     name=f"{indicator.upper()}({window})"), row=1, col=1)
+        elif indicator == "bb":
+            for name in ("bb_upper", "bb_lower"):
+                fig.add_trace(go.Scatter(x=df.index, y=df[f"{name}_{window}"], mode="lines",
+                                         line=dict(dash="dot", width=1), name=f"{name}({window})"), row=1, col=1)
+    if show_rsi:
+        row += 1
+        for indicator, window in chosen:
+            if indicator == "rsi":
+                fig.add_trace(go.Scatter(x=df.index, y=df[f"rsi_{window}"], mode="lines",
+                                         name=f"RSI({window})"), row=row, col=1)
+        fig.update_yaxes(range=[0, 100], row=row, col=1)
+    if show_macd:
+        row += 1
+        for indicator, window in chosen:
+            if indicator == "macd":
+                fig.add_trace(go.Bar(x=df.index, y=df[f"macd_hist_{window}"], name=f"MACD hist({window})"),
+                              row=row, col=1)
+                fig.add_trace(go.Scatter(x=df.index, y=df[f"macd_{window}"], mode="lines",
+                                         name=f"MACD({window})"), row=row, col=1)
+                fig.add_trace(go.Scatter(x=df.index, y=df[f"macd_signal_{window}"], mode="lines",
+                                         name=f"Signal({window})"), row=row, col=1)
+
+    fig.update_layout(height=350 + 200 * (rows - 1), xaxis_rangeslider_visible=False,
+                      margin=dict(t=30, b=10))
+    st.plotly_chart(fig, use_container_width=True)
+    bucket_min = df.attrs.get("bucket_ms", 0) / 60_000
+    st.caption(f"표시 캔들 {len(df):,}개 (버킷 {bucket_min:g}분)")
+
+def display_live_panel():
+    """
+    실시간 패널: 트레이더가 tick_bus(공유 메모리 링)에 발행한 틱 이벤트를 세션별로 이어 받아 표시.
+    trade_logs.db는 읽지 않고, 새 이벤트만 세션 버퍼에 덧붙임.
+    """
+    if "live_subscriber" not in st.session_state:
+        st.session_state.live_subscriber = TickSubscriber(TICK_BUS_FILE)
+        st.session_state.live_events = deque(maxlen=LIVE_EVENT_LIMIT)
+    events = st.session_state.live_events
+    events.extend(st.session_state.live_subscriber.poll(max_events=LIVE_EVENT_LIMIT))
+
+    if not events:
+        st.info("실시간 틱 이벤트가 없습니다. (트레이더 실행 중인지, TICK_BUS_ENABLED 확인)")
+        return
+
+    latest = events[-1]
+    previous = events[-2] if len(events) > 1 else latest
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("현재가", f"{latest['price']:,.0f}원", f"{latest['price'] - previous['price']:,.0f}")
+    col2.metric("총 자산", f"{latest['equity']:,.0f}원", f"{latest['equity'] - previous['equity']:,.0f}")
+    col3.metric("RSI", f"{latest['rsi']:.2f}")
+    col4.metric("감성", f"{latest['sentiment']:.3f}")
+    col5.metric("결정 / 목표비중", f"{latest['decision']} / {latest['target_ratio']:.2f}")
+
+    df_live = pd.DataFrame(list(events))
+    df_live["time"] = pd.to_datetime(df_live["ts"], unit="s")
+    df_live = df_live.set_index("time")
+    chart1, chart2 = st.columns(2)
+    chart1.line_chart(df_live[["price", "sma"]])
+    chart2.line_chart(df_live[["equity"]])
+    st.caption(f"마지막 틱: {df_live.index[-1]:%Y-%m-%d %H:%M:%S} UTC (seq={latest['seq']}, "
+               f"{LIVE_REFRESH_SECONDS}초마다 갱신)")
+
+def display_news_search():
+    """
+    수집된 뉴스 검색(FTS5) 페이지 구성
+    """
+    st.subheader("뉴스 검색 (News Search)")
+
+    col1, col2, col3 = st.columns([3, 2, 1])
+    keyword = col1.text_input("키워드", "")
+    date_range = col2.date_input("기간", value=())
+    source = col3.selectbox("소스", ["All", "RSS", "CryptoPanic", "reddit"])
+
+    start = end = None
+    if len(date_range) == 2:
+        start = f"{date_range[0]:%Y-%m-%d} 00:00:00"
+        end = f"{date_range[1]:%Y-%m-%d} 23:59:59"
+
+    results = search_news(
+        keyword=keyword,
+        start=start,
+        end=end,
+        source=None if source == "All" else source,
+        limit=200
+    )
+    if not results:
+        st.info("검색 결과가 없습니다.")
+        return
+
+    st.write(f"검색 결과: {len(results)} 건")
+    st.dataframe(pd.DataFrame(results))
+
 def main():
     st.set_page_config(
         page_title="Paper Trading Dashboard",
@@ -173,17 +377,25 @@ def main():
     st.title("Paper Trading Logs Dashboard :chart_with_upwards_trend:")
     st.markdown("---")
 
+    # ====== 실시간 패널 (fragment만 주기적으로 다시 실행, 페이지 전체/DB 캐시는 그대로) ======
+    st.subheader("실시간 (Live)")
+    if hasattr(st, "fragment"):
+        st.fragment(run_every=LIVE_REFRESH_SECONDS)(display_live_panel)()
+    else:
+        display_live_panel()
+    st.markdown("---")
+
     # ====== 새로고침 버튼 ======
     if st.button("데이터 새로고침"):
         st.cache_data.clear()  # 캐시 초기화
         st.rerun()  # 페이지 재실행
 
     # 상단 Tab 구성
-    tabs = st.tabs(["Trade Logs", "Decision Logs", "분석(차트)"])
+    tabs = st.tabs(["Trade Logs", "Decision Logs", "분석(차트)", "캔들 차트", "뉴스 검색"])
 
     # 최근 5,000건만 불러옴
-    df_trades = load_data("trade_logs", limit=5000)
-    df_decision = load_data("decision_logs", limit=5000)
+    df_trades = load_data("trade_logs", limit=5000, columns=TRADE_COLUMNS)
+    df_decision = load_data("decision_logs", limit=5000, columns=DECISION_COLUMNS)
 
     with tabs[0]:
         display_trade_logs(df_trades)
@@ -194,6 +406,12 @@ def main():
     with tabs[2]:
         display_analysis_chart(df_trades)
 
+    with tabs[3]:
+        display_candle_chart()
+
+    with tabs[4]:
+        display_news_search()
+
     st.markdown("---")
     st.info("데이터는 페이퍼 트레이딩 기준으로 기록되며, 실제 시세 및 시장 상황과 다를 수 있습니다.")
 
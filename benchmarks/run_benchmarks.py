@@ -0,0 +1,444 @@
+# run_benchmarks.py
+"""
+오프라인 벤치마크 모음 (네트워크/거래소/LLM 호출 없음).
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.run_benchmarks                       # 기본 크기
+    python -m benchmarks.run_benchmarks --large               # 1M 캔들, 1M~10M 행 등 큰 크기 포함
+    python -m benchmarks.run_benchmarks --only indicators,db
+    python -m benchmarks.run_benchmarks --save-baseline       # 결과를 기준선으로 저장
+
+결과는 JSON(data/benchmarks/)으로 저장하고, 기준선(benchmarks/baseline.json)이 있으면
+중앙값(median) 기준으로 비교해 tolerance를 넘게 느려진 항목이 있으면 종료 코드 1을 반환.
+
+- indicators : calculate_sma / calculate_rsi / calculate_macd, update_indicator_state(새 캔들 1개),
+               indicators_batch.compute_all(심볼 200 x 캔들 200)
+- db         : write_trade_log_db / write_decision_log_db 처리량
+- dashboard  : log_export.load_recent_logs (대시보드 load_data 본체), 테이블 10k ~ 10M 행
+- backtest   : temp/simple_sma_backtest.run_sweep
+- tick       : main.run_tick 1회 (합성 캔들 + 합성 뉴스 + 로컬 LLM stand-in 서버)
+"""
+import os
+import sys
+import copy
+import json
+import time
+import shutil
+import sqlite3
+import platform
+import argparse
+import subprocess
+import tempfile
+import statistics
+import contextlib
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "data", "benchmarks")
+BASELINE_FILE = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+DEFAULT_TOLERANCE = 0.25  # 기준선 대비 25% 넘게 느려지면 회귀
+NOISE_FLOOR = 0.001  # 초. 이보다 작은 차이는 회귀로 보지 않음
+SEED = 42
+
+GROUPS = ("indicators", "db", "dashboard", "backtest", "tick")
+SIZES = {
+    "indicators": ([1_000, 10_000, 100_000], [1_000_000]),
+    "db": ([500], [5_000]),
+    "dashboard": ([10_000, 100_000], [1_000_000, 10_000_000]),
+    "backtest": ([500], [5_000]),
+}
+
+
+@contextlib.contextmanager
+def _quiet():
+    """
+    측정 대상의 [LOG] 출력은 버림 (문자열 포맷 비용은 그대로 포함).
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _measure(fn, repeat=5, setup=None, warmup=1) -> dict:
+    """
+    fn()을 repeat회 실행한 시간 통계 (초). setup()은 매 회 측정 전에 실행하고 시간에서 제외.
+    setup의 반환값이 있으면 fn에 인자로 전달.
+    """
+    times = []
+    for i in range(warmup + repeat):
+        arg = setup() if setup else None
+        with _quiet():
+            start = time.perf_counter()
+            fn(arg) if setup else fn()
+            elapsed = time.perf_counter() - start
+        if i >= warmup:
+            times.append(elapsed)
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "max_s": max(times),
+        "repeat": repeat
+    }
+
+
+def synthetic_ohlcv(n: int, seed: int = SEED, freq: str = "5min") -> pd.DataFrame:
+    """
+    fetch_ohlc_data()와 같은 형태(index=timestamp)의 기하 브라운 운동 캔들.
+    """
+    rng = np.random.default_rng(seed)
+    close = 1e8 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    spread = np.abs(rng.normal(0, 0.001, n)) * close
+    index = pd.date_range("2024-01-01", periods=n, freq=freq, name="timestamp")
+    return pd.DataFrame({
+        "open": np.roll(close, 1),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.uniform(0.1, 5.0, n)
+    }, index=index)
+
+
+###################
+# 벤치마크 그룹   #
+###################
+def bench_indicators(sizes, repeat):
+    from modules.trading_utils import (
+        calculate_sma, calculate_rsi, calculate_macd, update_indicator_state
+    )
+    results = {}
+    for n in sizes:
+        base = synthetic_ohlcv(n)
+        reps = repeat if n < 1_000_000 else max(2, repeat // 2)
+        results[f"indicators.sma.n={n}"] = dict(
+            _measure(lambda df: calculate_sma(df, window=20), reps, setup=base.copy), n=n)
+        results[f"indicators.rsi.n={n}"] = dict(
+            _measure(lambda df: calculate_rsi(df, period=14), reps, setup=base.copy), n=n)
+        results[f"indicators.macd.n={n}"] = dict(
+            _measure(lambda df: calculate_macd(df), reps, setup=base.copy), n=n)
+
+    # 실시간 경로: 상태가 있을 때 새 캔들 1개 반영 (MAX_CANDLE 크기 창)
+    window = synthetic_ohlcv(60)
+    with _quiet():
+        state = update_indicator_state(None, window.iloc[:-1])
+
+    def _setup():
+        return copy.deepcopy(state)  # update_indicator_state는 상태를 제자리에서 갱신
+
+    results["indicators.incremental_update"] = dict(
+        _measure(lambda s: update_indicator_state(s, window), repeat * 20, setup=_setup), n=1)
+
+    # 마켓 전체 스캔: (심볼 200 x 캔들 200) 행렬에 전체 지표 한 번에 계산
+    from modules.indicators_batch import compute_all
+    frames = [synthetic_ohlcv(200, seed=SEED + i) for i in range(200)]
+    market = {col: np.vstack([f[col].to_numpy() for f in frames])
+              for col in ("open", "high", "low", "close", "volume")}
+    results["indicators.batch_scan.symbols=200"] = dict(
+        _measure(lambda: compute_all(market), repeat), n=200 * 200)
+    return results
+
+
+def bench_db(sizes, repeat, workdir):
+    import modules.db_utils as db_utils
+    results = {}
+    for n in sizes:
+        def _fresh_db():
+            path = os.path.join(workdir, "bench_writes.db")
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            db_utils.DB_FILE = path
+            db_utils.init_db()
+
+        def _trades(_):
+            for i in range(n):
+                db_utils.write_trade_log_db(1e8 + i, 50.0, 0.1, "buy", 0.001, 1e8 + i,
+                                            1_000_000.0, 0.01, "bench", fee=50.0)
+
+        def _decisions(compact):
+            def run(_):
+                for i in range(n):
+                    db_utils.write_decision_log_db(1e8 + i, 50.0, 0.1, "hold",
+                                                   "diff_value < REBALANCE_THRESHOLD", compact=compact)
+            return run
+
+        for name, fn in (("trade_log", _trades),
+                         ("decision_log", _decisions(False)),
+                         ("decision_log_compact", _decisions(True))):
+            stats = _measure(fn, max(1, repeat // 2), setup=_fresh_db, warmup=0)
+            stats["n"] = n
+            stats["rows_per_s"] = n / stats["median_s"] if stats["median_s"] else None
+            results[f"db.{name}.n={n}"] = stats
+    return results
+
+
+def _populate_trade_logs(path, n, batch=200_000):
+    """
+    trade_logs 테이블에 합성 행 n개를 executemany로 채움 (대시보드 읽기 벤치마크용).
+    """
+    import modules.db_utils as db_utils
+    db_utils.DB_FILE = path
+    db_utils.init_db()
+    rng = np.random.default_rng(SEED)
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(path)
+    with conn:
+        for offset in range(0, n, batch):
+            m = min(batch, n - offset)
+            price = 1e8 * np.exp(np.cumsum(rng.normal(0, 0.001, m)))
+            rows = (
+                (
+                    (start + timedelta(minutes=offset + i)).strftime("%Y-%m-%d %H:%M:%S"),
+                    float(price[i]), 50.0, 0.1, "buy" if i % 2 else "sell",
+                    0.001, float(price[i]), 1_000_000.0, 0.01, "bench", 50.0
+                )
+                for i in range(m)
+            )
+            conn.executemany(
+                """
+                INSERT INTO trade_logs
+                (timestamp, current_price, rsi, sentiment, action, trade_amount, trade_price,
+                 balance, position, reason, fee)
+                VALUES (?,?,?,?,?,?,?,?,?,?,?)
+                """,
+                rows
+            )
+    conn.close()
+
+
+def bench_dashboard(sizes, repeat, workdir):
+    from modules.log_export import load_recent_logs
+    columns = [
+        "id", "timestamp", "current_price", "rsi", "sentiment", "action",
+        "trade_amount", "trade_price", "balance", "position", "fee", "reason"
+    ]
+    export_dir = os.path.join(workdir, "no_export")  # Parquet export 없이 SQLite 경로만 측정
+    results = {}
+    for n in sizes:
+        path = os.path.join(workdir, f"bench_dashboard_{n}.db")
+        started = time.perf_counter()
+        _populate_trade_logs(path, n)
+        print(f"[INFO] dashboard: {n:,}행 생성 {time.perf_counter() - started:.1f}s")
+
+        results[f"dashboard.load_recent.rows={n}"] = dict(_measure(
+            lambda: load_recent_logs("trade_logs", limit=5000, columns=columns,
+                                     db_file=path, export_dir=export_dir),
+            repeat
+        ), n=n, limit=5000)
+        if n <= 1_000_000:
+            results[f"dashboard.load_all.rows={n}"] = dict(_measure(
+                lambda: load_recent_logs("trade_logs", limit=n, columns=columns,
+                                         db_file=path, export_dir=export_dir),
+                max(1, repeat // 2)
+            ), n=n, limit=n)
+        os.remove(path)
+    return results
+
+
+def bench_backtest(sizes, repeat, large):
+    from temp.simple_sma_backtest import run_sweep, sma_param_list
+    params = sma_param_list
+    if large:
+        params = [(s, l) for s in range(2, 31, 2) for l in range(10, 201, 10) if s < l]
+    results = {}
+    for n in sizes:
+        df = synthetic_ohlcv(n, freq="1D")
+        results[f"backtest.sma_sweep.n={n}"] = dict(
+            _measure(lambda: run_sweep(df, params), repeat), n=n, params=len(params))
+    return results
+
+
+def bench_tick(repeat, workdir):
+    """
+    main.run_tick 1회: 거래소 시세는 합성 캔들, 뉴스 수집은 합성 item,
+    LLM은 로컬 stand-in 서버(modules.llm_stub_server, 지연 0)로 대체.
+    - tick.with_llm_refresh : 새 파이프라인(첫 틱) -> 요약/감성 LLM 호출 포함
+    - tick.steady           : 갱신 정책이 LLM을 건너뛰는 일반 틱
+    """
+    from modules.llm_stub_server import start_server
+    from modules.llm_client import reset_client
+
+    server, _ = start_server(port=0, latency_ms=0)
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    reset_client()
+
+    import config.config as config
+    import modules.db_utils as db_utils
+    config.SENTIMENT_WORKER_MODE = "inline"
+    with _quiet():
+        import main
+        import modules.sentiment_worker as sentiment_worker
+        import modules.candle_store as candle_store
+    db_utils.DB_FILE = os.path.join(workdir, "bench_tick.db")
+    db_utils.init_db()
+    # 합성 캔들이 대시보드 캔들 저장소(data/candles.db)에 섞이지 않도록 작업 폴더로 돌림
+    original_candle_db = candle_store.CANDLE_DB_FILE
+    candle_store.CANDLE_DB_FILE = os.path.join(workdir, "bench_candles.db")
+    candle_store.init_candle_db()
+
+    candles = synthetic_ohlcv(config.MAX_CANDLE)
+    rng = np.random.default_rng(SEED)
+    words = ["bitcoin", "surges", "rally", "crash", "etf", "inflows", "fear", "adoption", "hack", "record"]
+
+    def _fake_collect(**kwargs):
+        now = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+        return {
+            "rss": [{"title": " ".join(rng.choice(words, 5)), "text": " ".join(rng.choice(words, 40)),
+                     "timestamp": now} for _ in range(10)],
+            "cryptopanic": [],
+            "reddit": [{"title": " ".join(rng.choice(words, 5)), "text": " ".join(rng.choice(words, 60)),
+                        "created_utc": time.time(), "subreddit": "Bitcoin", "score": int(rng.integers(0, 500))}
+                       for _ in range(10)]
+        }
+
+    original_fetch = main.fetch_ohlc_data
+    original_collect = sentiment_worker.data_collector_main
+    main.fetch_ohlc_data = lambda *args, **kwargs: candles.copy()
+    sentiment_worker.data_collector_main = _fake_collect
+    try:
+        def _fresh_runtime():
+            config.balance, config.position = 1_000_000.0, 0.0
+            return {"last_price": None, "average_sentiment": 0.0, "indicator_state": None,
+                    "sentiment_pipeline": sentiment_worker.SentimentPipeline()}
+
+        results = {"tick.with_llm_refresh": _measure(main.run_tick, repeat, setup=_fresh_runtime)}
+
+        with _quiet():
+            runtime = _fresh_runtime()
+            main.run_tick(runtime)
+        results["tick.steady"] = _measure(lambda: main.run_tick(runtime), repeat)
+    finally:
+        main.fetch_ohlc_data = original_fetch
+        sentiment_worker.data_collector_main = original_collect
+        candle_store.CANDLE_DB_FILE = original_candle_db
+        server.shutdown()
+        os.environ.pop("OPENAI_BASE_URL", None)
+        reset_client()
+    return results
+
+
+###################
+# 기준선 비교     #
+###################
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    항목별 중앙값 비교. 반환: [(이름, 기준선, 현재, 비율, 회귀 여부)]
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, stats in results.items():
+        base = base_results.get(name)
+        if base is None:
+            continue
+        ratio = stats["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        regressed = ratio > 1 + tolerance and stats["median_s"] - base["median_s"] > NOISE_FLOOR
+        rows.append((name, base["median_s"], stats["median_s"], ratio, regressed))
+    return rows
+
+
+def _metadata(args) -> dict:
+    meta = {
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "large": args.large,
+        "repeat": args.repeat,
+        "seed": SEED
+    }
+    try:
+        meta["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        meta["git_commit"] = None
+    return meta
+
+
+def run(args) -> dict:
+    groups = args.only.split(",") if args.only else list(GROUPS)
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        raise SystemExit(f"unknown benchmark group(s): {', '.join(sorted(unknown))}")
+
+    def sizes(group):
+        default, large = SIZES[group]
+        return default + (large if args.large else [])
+
+    workdir = tempfile.mkdtemp(prefix="invest_bench_")
+    results = {}
+    try:
+        for group in groups:
+            print(f"[START] benchmark group: {group}")
+            started = time.perf_counter()
+            if group == "indicators":
+                results.update(bench_indicators(sizes(group), args.repeat))
+            elif group == "db":
+                results.update(bench_db(sizes(group), args.repeat, workdir))
+            elif group == "dashboard":
+                results.update(bench_dashboard(sizes(group), args.repeat, workdir))
+            elif group == "backtest":
+                results.update(bench_backtest(sizes(group), args.repeat, args.large))
+            elif group == "tick":
+                results.update(bench_tick(args.repeat, workdir))
+            print(f"[END] benchmark group: {group} ({time.perf_counter() - started:.1f}s)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {"meta": _metadata(args), "results": results}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="offline benchmark suite")
+    parser.add_argument("--only", default=None, help=f"쉼표로 구분한 그룹 ({','.join(GROUPS)})")
+    parser.add_argument("--large", action="store_true", help="큰 크기(1M 캔들, 1M~10M 행) 포함")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: data/benchmarks/results-<시각>.json)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 --baseline 경로에 저장")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run(args)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"results-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] 결과 저장: {output}")
+
+    print(f"\n{'benchmark':<45}{'median(ms)':>12}{'min(ms)':>12}")
+    for name, stats in report["results"].items():
+        print(f"{name:<45}{stats['median_s'] * 1000:>12.3f}{stats['min_s'] * 1000:>12.3f}")
+
+    exit_code = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare_to_baseline(report["results"], baseline, args.tolerance)
+        print(f"\n기준선 비교 ({args.baseline}, tolerance={args.tolerance:.0%})")
+        print(f"{'benchmark':<45}{'base(ms)':>12}{'now(ms)':>12}{'ratio':>8}")
+        for name, base, now, ratio, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:<45}{base * 1000:>12.3f}{now * 1000:>12.3f}{ratio:>8.2f}{flag}")
+        regressions = [r for r in rows if r[4]]
+        if regressions:
+            print(f"[WARN] 성능 회귀 {len(regressions)}건")
+            exit_code = 1
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] 기준선 저장: {args.baseline}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
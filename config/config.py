@@ -12,6 +12,7 @@ EXCHANGE = ccxt.upbit({
 SYMBOL = 'BTC/KRW'
 TIMEFRAME = '5m'
 MAX_CANDLE = 50
+TICK_INTERVAL = 60  # 초. 메인 루프 틱 주기
 
 # ----- 트레이딩 환경 파라미터
 TARGET_BTC_RATIO = 0.5
@@ -26,4 +27,148 @@ TAKER_FEE = 0.00139
 CURRENT_FEE = TAKER_FEE
 
 MIN_ORDER_AMOUNT = 5000
-MAX_ORDER_AMOUNT = 1_000_000_000
\ No newline at end of file
+MAX_ORDER_AMOUNT = 1_000_000_000
+
+# ----- 체결 시뮬레이터 (Paper Trading)
+EXECUTION_SIMULATOR = "orderbook"   # "flat"(현재가 전량 체결) | "orderbook"(호가 긁기)
+ORDER_BOOK_SOURCE = "synthetic"     # "synthetic"(가상 호가) | "recorded"(거래소 호가 스냅샷)
+ORDER_LIQUIDITY = "taker"           # "taker" | "maker" | "auto"(maker 후 잔량 taker)
+MAX_CHILD_ORDER_VALUE = 10_000_000  # 원화 기준 분할 주문 단위 (None이면 분할 없음)
+BOOK_RECOVERY_RATIO = 0.5           # 분할 주문 사이 호가 잔량 회복 비율
+MAKER_FILL_RATIO = 0.6              # maker 주문의 예상 체결 비율
+
+SIM_BOOK_LEVELS = 20
+SIM_SPREAD_BPS = 2.0
+SIM_STEP_BPS = 1.0
+SIM_LEVEL_QTY = 0.05
+SIM_DEPTH_GROWTH = 0.1
+
+# ----- 의사결정 로그
+COMPACT_HOLD_DECISIONS = False  # 연속된 동일 유형 hold를 decision_logs 한 행으로 병합
+COMPACT_HOLD_MAX_GAP = 2 * TICK_INTERVAL  # 초. 직전 hold 구간 끝과 이보다 멀면 (중단/재시작 후) 병합하지 않고 새 행
+
+# ----- 뉴스 소스 (type별 플러그인: modules/news_sources.py)
+# interval: 수집 주기(초), rate_limit: 분당 최대 요청 수
+NEWS_SOURCES = [
+    {
+        "type": "rss",
+        "name": "google_news_bitcoin",
+        "url": "https://news.google.com/rss/search?q=bitcoin",
+        "interval": 300,
+        "rate_limit": 30
+    },
+    {
+        "type": "cryptopanic",
+        "name": "cryptopanic_btc_eth",
+        "currencies": "BTC,ETH",
+        "kind": "news",
+        "interval": 300,
+        "rate_limit": 5
+    },
+    {
+        "type": "reddit",
+        "name": "reddit_crypto",
+        "subreddits": [
+            "CryptoCurrency",
+            "Bitcoin",
+            "Ethereum",
+            "CryptoMarkets",
+            "CryptoMoonShots",
+            "Altcoin",
+            "CoinBase",
+            "Binance",
+            "KrakenSupport",
+            "BitcoinBeginners"
+        ],
+        "listing": "new",
+        "limit": 25,
+        "interval": 600,
+        "rate_limit": 60
+    }
+]
+
+# ----- 감성 분석
+SENTIMENT_MODE = "hybrid"  # "llm"(LLM만) | "local"(로컬 사전만) | "hybrid"(로컬 + LLM 점수를 확신도 가중으로 함께 누적)
+
+# ----- 감성 누적 (시간감쇠 + 확신도 가중, modules/sentiment_state.py)
+SENTIMENT_HALF_LIFE = 6 * 3600  # 초. 관측치 가중치가 절반이 되는 시간
+SENTIMENT_PRIOR_WEIGHT = 0.0  # 중립(0.0) 사전 가중치. 0보다 크면 근거가 적을수록 점수가 0쪽으로 줄어듦 (main.py ±0.5 임계값도 함께 조정)
+SENTIMENT_SOURCE_WEIGHTS = {"rss": 1.0, "cryptopanic": 1.0, "reddit": 0.7, "local": 1.0}
+LOCAL_SENTIMENT_CONFIDENCE_SCALE = 0.3  # 로컬 사전 점수는 낮은 확신도로 반영
+
+# ----- 감성 갱신 정책 (modules/refresh_policy.py): 변동성 + 뉴스 도착 + 감성 나이, 시간당 토큰 예산
+REFRESH_VOL_WINDOW = 12  # 최근 변동성 계산 캔들 수 (5분봉 1시간)
+REFRESH_VOL_BASELINE = 48  # 기준 변동성 계산 캔들 수 (MAX_CANDLE 이하)
+REFRESH_VOL_WEIGHT = 1.0
+REFRESH_NEWS_TARGET = 20  # 이만큼 새 item이 쌓이면 그것만으로 갱신
+REFRESH_MAX_AGE = 3600  # 초. 감성이 이만큼 오래되면 그것만으로 갱신
+REFRESH_MIN_INTERVAL = 300  # 초. LLM 갱신 최소 간격 (실패한 시도 포함)
+REFRESH_MAX_BACKOFF = 3600  # 초. 연속 실패 시 재시도 간격 상한 (min_interval x 2^(실패 수 - 1))
+LLM_TOKEN_BUDGET_PER_HOUR = 40000
+MAX_PENDING_ITEMS = 500  # LLM 갱신 대기 item 최대 보관 수 (오래된 것부터 버림)
+
+# ----- 감성 워커 (modules/sentiment_worker.py)
+SENTIMENT_WORKER_MODE = "inline"  # "inline"(트레이딩 루프 안) | "process"(main.py가 별도 프로세스로 실행) | "external"(따로 실행)
+SENTIMENT_WORKER_INTERVAL = 60  # 초. 워커 실행 주기
+SENTIMENT_SIGNAL_MAX_AGE = 1800  # 초. 이보다 오래된 감성 신호는 경고 (값은 그대로 사용)
+
+# ----- 런타임 프로파일링 (modules/profiling.py): kill -USR1 <pid> 또는 data/profile.control
+PROFILE_TICKS = 3  # 한 번 켜면 프로파일링할 틱 수
+PROFILE_MODES = ("cprofile", "tracemalloc")  # cprofile | sample | tracemalloc
+PROFILE_SAMPLE_INTERVAL = 0.01  # 초. sample 모드 스택 샘플링 간격
+PROFILE_SLOW_TICK_SECONDS = 30  # 이보다 오래 걸린 틱 다음부터 자동 프로파일링 (None이면 끔)
+PROFILE_SLOW_TICK_COOLDOWN = 3600  # 초. 느린 틱 자동 프로파일링 최소 간격
+
+# ----- 섀도 전략 (modules/shadow_strategies.py): 같은 데이터로 여러 설정을 동시에 페이퍼 트레이딩
+SHADOW_STRATEGIES_ENABLED = True
+SHADOW_INITIAL_BALANCE = 1_000_000.0
+SHADOW_STRATEGY_GRID = {
+    "base_ratio": [0.3, 0.4, 0.5, 0.6, 0.7],
+    "rsi_band": [(30, 70), (25, 75), (35, 65)],
+    "sentiment_band": [(-0.5, 0.5), (-0.3, 0.3), (-0.7, 0.7)]
+}
+SHADOW_EQUITY_LOG_INTERVAL = 5  # 틱. shadow_equity 기록 주기
+
+# ----- 몬테카를로 강건성 테스트 (modules/monte_carlo.py)
+MC_PATHS = 2000  # 시뮬레이션 경로 수
+MC_BLOCK_SIZE = 48  # 블록 부트스트랩 블록 길이 (캔들 수, 5분봉 4시간)
+MC_FEE_JITTER = 0.2  # 경로별 수수료를 ±20% 범위에서 흔듦
+MC_MAX_SLIPPAGE_BPS = 5.0  # 경로별 슬리피지 0 ~ 이 값(bps) 균등 분포
+MC_MAX_SIGNAL_LAG = 2  # 경로별 신호 지연 0 ~ 이 값(캔들 수)
+
+# ----- 거래소 호출 관문 (modules/exchange_gateway.py)
+# 엔드포인트 그룹별 초당 요청 수 (업비트 Remaining-Req 그룹, 시세 API 그룹당 초당 10회)
+# 프로세스마다 따로 적용됨. 트레이더 + 대시보드 + 백필을 함께 오래 돌리면 프로세스 수만큼 나눠 잡을 것
+EXCHANGE_RATE_LIMITS = {
+    "candles": 10,
+    "orderbook": 10,
+    "ticker": 10,
+    "trades": 10,
+    "market": 10,
+    "order": 8,
+    "default": 8
+}
+EXCHANGE_MAX_RETRIES = 4  # RateLimitExceeded / DDoSProtection / NetworkError 재시도 횟수
+EXCHANGE_BACKOFF_BASE = 0.5  # 초. 재시도 대기 상한 = min(BACKOFF_MAX, BASE * 2^시도)
+EXCHANGE_BACKOFF_MAX = 10.0
+
+# ----- 실시간 틱 이벤트 채널 (modules/tick_bus.py): 트레이더 -> 대시보드 공유 메모리 링 버퍼
+TICK_BUS_ENABLED = True
+TICK_BUS_FILE = "data/tick_bus.ring"
+TICK_BUS_SLOTS = 1024  # 보관 이벤트 수 (5분봉 1분 틱 기준 약 17시간)
+TICK_BUS_SLOT_SIZE = 512  # bytes. 이벤트 1개(JSON) 최대 크기
+
+# ----- 캔들 저장소 + 지표 캐시 (modules/candle_store.py, data/candles.db)
+CANDLE_STORE_ENABLED = True  # 틱마다 받은 캔들을 저장하고 지표 캐시를 증분 확장
+CANDLE_CACHE_INDICATORS = [  # (indicator, window): sma | ema | rsi | bb | macd(window=slow 기간)
+    ("sma", 20),
+    ("sma", 50),
+    ("ema", 20),
+    ("bb", 20),
+    ("rsi", 14),
+    ("macd", 26)
+]
+
+# ----- Paper Trading 원장 (modules/ledger.py, trade_logs.db의 ledger_events / ledger_snapshots)
+LEDGER_ENABLED = True  # 체결/수수료/입금/판단을 추가 전용 이벤트로 기록하고 재시작 시 잔고/포지션을 원장에서 복원
+LEDGER_SNAPSHOT_EVERY = 500  # 이벤트 n개마다 상태 스냅샷 (구간 재생은 직전 스냅샷부터)
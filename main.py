@@ -1,20 +1,19 @@
 # main.py
+import sys
 import time
 import datetime
 import os
+import signal
+import subprocess
 
 from modules.trading_utils import (
     fetch_ohlc_data,
     calculate_sma,
     calculate_rsi,
-    calculate_macd
+    calculate_macd,
+    update_indicator_state
 )
 
-# ---- 메모리 기반 import
-from modules.data_collector import main as data_collector_main
-from modules.summarize_content import main as summarize_content_main
-from modules.sentiment_analysis import main as sentiment_analysis_main
-
 # DB 관련 함수
 from modules.db_utils import (
     init_db, 
@@ -22,21 +21,64 @@ from modules.db_utils import (
     load_last_sentiment,  # ### ADD
     write_trade_log_db,
     write_decision_log_db,
-    save_meta_info,
-    load_meta_info
+    load_meta_info,
+    save_state_snapshot,
+    load_state_snapshot,
+    load_sentiment_signal,
+    tick_transaction
 )
 
+from modules.execution_simulator import get_execution_simulator
+from modules.profiling import TickProfiler
+from modules.shadow_strategies import build_shadow_portfolios, run_shadow_step
+from modules.tick_bus import TickPublisher
+from modules.candle_store import init_candle_db, record_tick_candles
+from modules.ledger import get_ledger
+
 import config.config as config
 
-THRESHOLD_PERCENT = 5.0  # 5% 이상 변동 시 감성 분석
+EXECUTION_SIMULATOR = get_execution_simulator()
+
+
+# inline 모드에서만 수집/LLM 모듈을 import (process/external 모드의 트레이더는 가볍게 유지)
+if config.SENTIMENT_WORKER_MODE == "inline":
+    from modules.sentiment_worker import SentimentPipeline
+
 
 ############################
 # Paper Trading 보조 함수 #
 ############################
+def record_fill_in_ledger(side: str, fill: dict, current_price: float, rsi_latest: float,
+                          average_sentiment: float) -> bool:
+    """
+    체결을 원장에 먼저 기록. 원장 기록이 실패하면 이번 체결은 반영하지 않음
+    (config.balance / position / trade_logs가 원장보다 앞서가지 않도록).
+    """
+    if not config.LEDGER_ENABLED:
+        return True
+    try:
+        get_ledger(config.LEDGER_SNAPSHOT_EVERY).record_fill(
+            side, fill["filled_base"], fill["filled_quote"], fill["avg_price"], fill["fee"], note=fill["liquidity"])
+        return True
+    except Exception as e:
+        print(f"[ERROR] 원장 기록 실패 -> {side} 체결 취소: {e}")
+        write_decision_log_db(
+            current_price=current_price,
+            rsi=rsi_latest,
+            sentiment=average_sentiment,
+            decision="hold",
+            reason=f"{side} 체결 취소 (원장 기록 실패)",
+            compact=config.COMPACT_HOLD_DECISIONS,
+            max_gap=config.COMPACT_HOLD_MAX_GAP
+        )
+        return False
+
+
 def paper_trade_rebalance(target_ratio: float, current_price: float, rsi_latest: float, average_sentiment: float):
     """
     목표 비중(target_ratio)에 맞춰 보유 자산을 리밸런싱(Paper Trading) 후
     trade_logs / decision_logs 모두 기록.
+    체결은 EXECUTION_SIMULATOR(호가 긁기/분할/부분 체결)를 통해 계산.
     """
     total_value = config.balance + (config.position * current_price)
     target_value = total_value * target_ratio
@@ -50,7 +92,9 @@ def paper_trade_rebalance(target_ratio: float, current_price: float, rsi_latest:
             rsi=rsi_latest,
             sentiment=average_sentiment,
             decision="hold",
-            reason=f"diff_value={diff_value:.2f} < REBALANCE_THRESHOLD"
+            reason=f"diff_value={diff_value:.2f} < REBALANCE_THRESHOLD",
+            compact=config.COMPACT_HOLD_DECISIONS,
+            max_gap=config.COMPACT_HOLD_MAX_GAP
         )
         return
 
@@ -69,7 +113,9 @@ def paper_trade_rebalance(target_ratio: float, current_price: float, rsi_latest:
                 rsi=rsi_latest,
                 sentiment=average_sentiment,
                 decision=decision,
-                reason=reason_msg
+                reason=reason_msg,
+                compact=config.COMPACT_HOLD_DECISIONS,
+                max_gap=config.COMPACT_HOLD_MAX_GAP
             )
             return
         
@@ -78,11 +124,32 @@ def paper_trade_rebalance(target_ratio: float, current_price: float, rsi_latest:
             buy_cost = config.balance
             reason_msg = "잔고 부족 -> 전액 매수"
 
-        buy_amount = (buy_cost * (1 - config.CURRENT_FEE)) / current_price
-        config.balance -= buy_cost
+        fill = EXECUTION_SIMULATOR.execute("buy", buy_cost, current_price)
+        if fill["filled_base"] <= 0:
+            print("[WARN] 호가 부족으로 매수 체결 실패.")
+            write_decision_log_db(
+                current_price=current_price,
+                rsi=rsi_latest,
+                sentiment=average_sentiment,
+                decision="hold",
+                reason="매수 체결 실패 (호가 부족)",
+                compact=config.COMPACT_HOLD_DECISIONS,
+                max_gap=config.COMPACT_HOLD_MAX_GAP
+            )
+            return
+
+        if not record_fill_in_ledger("buy", fill, current_price, rsi_latest, average_sentiment):
+            return
+
+        buy_amount = fill["filled_base"]
+        spent = fill["filled_quote"] + fill["fee"]
+        config.balance -= spent
         config.position += buy_amount
 
-        print(f"[TRADE] 매수 체결: {buy_cost:.2f}원 -> {buy_amount:.6f} BTC")
+        print(f"[TRADE] 매수 체결: {spent:.2f}원 -> {buy_amount:.6f} BTC "
+              f"(평균가={fill['avg_price']:.2f}, 수수료={fill['fee']:.2f}, {fill['liquidity']})")
+        if fill["partial"]:
+            reason_msg = f"부분 체결 ({spent:.2f}/{buy_cost:.2f}원)"
 
         # 기록
         write_trade_log_db(
@@ -91,10 +158,11 @@ def paper_trade_rebalance(target_ratio: float, current_price: float, rsi_latest:
             sentiment=average_sentiment,
             action="buy",
             trade_amount=buy_amount,
-            trade_price=current_price,
+            trade_price=fill["avg_price"],
             balance=config.balance,
             position=config.position,
-            reason=f"PaperTrading rebalancing (buy). target_ratio={target_ratio:.2f}"
+            reason=f"PaperTrading rebalancing (buy). target_ratio={target_ratio:.2f}",
+            fee=fill["fee"]
         )
 
         decision = "buy"
@@ -104,22 +172,42 @@ def paper_trade_rebalance(target_ratio: float, current_price: float, rsi_latest:
     else:
         # 매도
         sell_value = abs(diff_value)
-        receive_amount = sell_value * (1 - config.CURRENT_FEE)
 
         if sell_value > current_value:
             print("[WARN] 보유량보다 큰 매도 요청 -> 전량 매도")
             sell_value = current_value
-            receive_amount = sell_value * (1 - config.CURRENT_FEE)
             reason_msg = "보유량보다 큰 매도 요청 -> 전량 매도"
 
         sell_btc_amount = sell_value / current_price
         if sell_btc_amount > config.position:
             sell_btc_amount = config.position
 
-        config.position -= sell_btc_amount
+        fill = EXECUTION_SIMULATOR.execute("sell", sell_btc_amount, current_price)
+        if fill["filled_base"] <= 0:
+            print("[WARN] 호가 부족으로 매도 체결 실패.")
+            write_decision_log_db(
+                current_price=current_price,
+                rsi=rsi_latest,
+                sentiment=average_sentiment,
+                decision="hold",
+                reason="매도 체결 실패 (호가 부족)",
+                compact=config.COMPACT_HOLD_DECISIONS,
+                max_gap=config.COMPACT_HOLD_MAX_GAP
+            )
+            return
+
+        if not record_fill_in_ledger("sell", fill, current_price, rsi_latest, average_sentiment):
+            return
+
+        sold_btc = fill["filled_base"]
+        receive_amount = fill["filled_quote"] - fill["fee"]
+        config.position -= sold_btc
         config.balance += receive_amount
 
-        print(f"[TRADE] 매도 체결: {sell_value:.2f}원 -> {receive_amount:.2f}원")
+        print(f"[TRADE] 매도 체결: {sold_btc:.6f} BTC -> {receive_amount:.2f}원 "
+              f"(평균가={fill['avg_price']:.2f}, 수수료={fill['fee']:.2f}, {fill['liquidity']})")
+        if fill["partial"]:
+            reason_msg = f"부분 체결 ({sold_btc:.6f}/{sell_btc_amount:.6f} BTC)"
 
         # 기록
         write_trade_log_db(
@@ -127,11 +215,12 @@ def paper_trade_rebalance(target_ratio: float, current_price: float, rsi_latest:
             rsi=rsi_latest,
             sentiment=average_sentiment,
             action="sell",
-            trade_amount=sell_btc_amount,
-            trade_price=current_price,
+            trade_amount=sold_btc,
+            trade_price=fill["avg_price"],
             balance=config.balance,
             position=config.position,
-            reason=f"PaperTrading rebalancing (sell). target_ratio={target_ratio:.2f}"
+            reason=f"PaperTrading rebalancing (sell). target_ratio={target_ratio:.2f}",
+            fee=fill["fee"]
         )
 
         decision = "sell"
@@ -144,7 +233,9 @@ def paper_trade_rebalance(target_ratio: float, current_price: float, rsi_latest:
         rsi=rsi_latest,
         sentiment=average_sentiment,
         decision=decision,
-        reason=reason_msg
+        reason=reason_msg,
+        compact=config.COMPACT_HOLD_DECISIONS,
+        max_gap=config.COMPACT_HOLD_MAX_GAP
     )
 
 
@@ -169,16 +260,80 @@ def adjust_target_ratio_with_signals(base_ratio: float, rsi_value: float, sentim
     return max(0.0, min(1.0, new_ratio))
 
 
-######################
-# 메인 루프 시작점   #
-######################
-if __name__ == "__main__":
-    print("=== 코인 자동매매 프로그램 (Paper Trading) 시작 ===")
+#########################
+# 상태 복원 / 틱 실행   #
+#########################
+def build_sentiment_pipeline(extra_state: dict = None):
+    """
+    inline 모드면 스냅샷(extra_state)에서 감성 파이프라인 복원, 그 외 모드는 None.
+    """
+    if config.SENTIMENT_WORKER_MODE != "inline":
+        return None
+    return SentimentPipeline.from_dict(extra_state)
 
-    # 1) DB 초기화
-    init_db()
 
-    # 2) 마지막 잔고/포지션 상태 불러오기
+def read_sentiment_signal(default: float) -> float:
+    """
+    process/external 모드: 감성 워커가 발행한 sentiment_signal 1행만 읽음.
+    신호가 없거나 점수가 None이면 default(이전 값) 유지.
+    """
+    signal = load_sentiment_signal(with_state=False)
+    if signal is None or signal["sentiment"] is None:
+        print("[INFO] 감성 신호 없음 -> 이전 감성점수 유지")
+        return default
+    age = time.time() - signal["updated_ts"]
+    if age > config.SENTIMENT_SIGNAL_MAX_AGE:
+        print(f"[WARN] 감성 신호가 오래됨 ({age:.0f}초 전, seq={signal['seq']})")
+    print(f"[INFO] 감성 신호: {signal['sentiment']:.4f} (seq={signal['seq']}, 소스별: {signal['source_scores']})")
+    return signal["sentiment"]
+
+
+def start_sentiment_worker() -> subprocess.Popen:
+    """
+    process 모드: 감성 워커를 별도 인터프리터로 실행 (트레이더는 수집/LLM 모듈을 import하지 않음).
+    """
+    print("[INFO] 감성 워커 프로세스 시작")
+    return subprocess.Popen([sys.executable, "-m", "modules.sentiment_worker", "--loop"])
+
+
+def stop_sentiment_worker(worker: subprocess.Popen, timeout: float = 10):
+    """
+    트레이더 종료 시 감성 워커도 종료 (재시작할 때마다 고아 워커가 같은 테이블에 쓰지 않도록).
+    """
+    if worker is None or worker.poll() is not None:
+        return
+    print("[INFO] 감성 워커 프로세스 종료")
+    worker.terminate()
+    try:
+        worker.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        worker.kill()
+        worker.wait()
+
+
+def restore_state() -> dict:
+    """
+    재시작 시 트레이더 상태를 복원.
+    state_snapshot이 있으면 한 번의 조회로 전부 복원하고,
+    없으면 예전 방식(trade_logs / meta_info / decision_logs)으로 복원.
+    """
+    snapshot = load_state_snapshot()
+    if snapshot is not None:
+        config.balance = snapshot["balance"]
+        config.position = snapshot["position"]
+        runtime = {
+            "last_price": snapshot["last_price"],
+            "average_sentiment": snapshot["sentiment"] if snapshot["sentiment"] is not None else 0.0,
+            "indicator_state": snapshot["indicator_state"],
+            "sentiment_pipeline": build_sentiment_pipeline(snapshot["extra_state"]),
+            "shadow": build_shadow_portfolios()
+        }
+        print(f"[INFO] 상태 스냅샷({snapshot['updated_at']}) 복원: balance={config.balance:.2f}, "
+              f"position={config.position:.6f}, last_price={runtime['last_price']}, "
+              f"sentiment={runtime['average_sentiment']:.4f}, candle_cursor={snapshot['candle_cursor']}")
+        return runtime
+
+    # 1) 마지막 잔고/포지션 상태 불러오기
     last_state = load_last_state()
     if last_state is not None:
         balance_from_db, position_from_db = last_state
@@ -188,7 +343,7 @@ if __name__ == "__main__":
     else:
         print(f"[INFO] 이전 기록 없음. 기본 시드값 사용: balance={config.balance:.2f}, position={config.position:.6f}")
 
-    # 3) last_price 불러오기 (meta_info)
+    # 2) last_price 불러오기 (meta_info)
     stored_last_price = load_meta_info("last_price")
     if stored_last_price is not None:
         last_price = float(stored_last_price)
@@ -197,8 +352,8 @@ if __name__ == "__main__":
         last_price = None
         print("[INFO] 저장된 last_price가 없어 None으로 초기화.")
 
-    # 4) 최근 감성 점수 불러오기 (decision_logs)
-    last_sentiment = load_last_sentiment()  # ### ADD
+    # 3) 최근 감성 점수 불러오기 (decision_logs)
+    last_sentiment = load_last_sentiment()
     if last_sentiment is not None:
         average_sentiment = last_sentiment
         print(f"[INFO] DB에서 최근 감성점수를 복원: {average_sentiment:.4f}")
@@ -206,72 +361,235 @@ if __name__ == "__main__":
         average_sentiment = 0.0
         print("[INFO] 이전 감성점수가 없어 기본값(0.0) 사용.")
 
-    # 메인 루프
-    while True:
+    return {
+        "last_price": last_price,
+        "average_sentiment": average_sentiment,
+        "indicator_state": None,
+        "sentiment_pipeline": build_sentiment_pipeline(),
+        "shadow": build_shadow_portfolios()
+    }
+
+
+def sync_ledger_state(last_price: float = None):
+    """
+    원장을 잔고/포지션의 기준으로 사용.
+    원장이 비어 있으면 현재 복원된 잔고/포지션을 입금 이벤트로 기록하고,
+    있으면 원장(마지막 스냅샷 + 이후 이벤트) 상태로 config.balance / config.position을 덮어씀.
+    """
+    ledger = get_ledger(config.LEDGER_SNAPSHOT_EVERY)
+    if ledger.is_empty():
+        ledger.record_deposit(cash=config.balance, qty=config.position, price=last_price, note="bootstrap")
+        ledger.save_snapshot()
+        print(f"[INFO] 원장 시작: balance={config.balance:.2f}, position={config.position:.6f}")
+        return
+
+    state = ledger.state
+    if abs(state.cash - config.balance) > 1e-6 or abs(state.position - config.position) > 1e-9:
+        print(f"[WARN] 복원 상태와 원장 불일치 -> 원장 사용: "
+              f"balance {config.balance:.2f} -> {state.cash:.2f}, position {config.position:.6f} -> {state.position:.6f}")
+    config.balance = state.cash
+    config.position = state.position
+    summary = state.summary(last_price)
+    print(f"[INFO] 원장 복원(seq={state.seq}): 실현손익={summary['realized_pnl']:.2f}, "
+          f"수수료={summary['fees']:.2f}, 순손익={summary['net_pnl']:.2f}")
+
+
+def run_tick(runtime: dict):
+    """
+    트레이딩 루프 1회(틱) 실행. runtime(dict)의 상태를 갱신하고,
+    이 틱의 매매/판단 로그, 원장 이벤트, 섀도 기록, state_snapshot을 한 트랜잭션으로 커밋.
+    틱 도중 예외가 나면 전부 롤백하고 메모리의 잔고/포지션/원장 상태도 틱 시작 시점으로 되돌림.
+    """
+    balance_before, position_before = config.balance, config.position
+    if config.LEDGER_ENABLED:
+        get_ledger(config.LEDGER_SNAPSHOT_EVERY)  # 원장 연결/테이블 준비는 틱 트랜잭션이 쓰기 잠금을 잡기 전에
+    try:
+        with tick_transaction():
+            _run_tick(runtime)
+    except Exception:
+        config.balance, config.position = balance_before, position_before
+        if config.LEDGER_ENABLED:
+            get_ledger(config.LEDGER_SNAPSHOT_EVERY).reload()
+        raise
+
+
+def _run_tick(runtime: dict):
+    last_price = runtime["last_price"]
+    average_sentiment = runtime["average_sentiment"]
+
+    print("[INFO] 트레이딩 알고리즘 실행 중...")
+
+    # (1) 현재 시세
+    df = fetch_ohlc_data(config.SYMBOL, config.TIMEFRAME, limit=config.MAX_CANDLE)
+    current_price = df['close'].iloc[-1]
+
+    # (1-1) 캔들 저장 + 지표 캐시 증분 확장 (대시보드 캔들 차트용, data/candles.db)
+    if config.CANDLE_STORE_ENABLED:
         try:
-            print("[INFO] 트레이딩 알고리즘 실행 중...")
-
-            # (1) 현재 시세
-            df = fetch_ohlc_data(config.SYMBOL, config.TIMEFRAME, limit=config.MAX_CANDLE)
-            current_price = df['close'].iloc[-1]
-
-            # (2) 가격 변동 체크
-            if last_price is not None:
-                price_change_percent = ((current_price - last_price) / last_price) * 100
-                abs_change = abs(price_change_percent)
-            else:
-                price_change_percent = 0.0
-                abs_change = 0.0
-
-            print(f"[INFO] 이전 가격: {last_price}, 현재 가격: {current_price:.2f}, 변동률: {price_change_percent:.2f}%")
-
-            # (3) 감성 분석 조건
-            if last_price is None or abs_change >= THRESHOLD_PERCENT:
-                print("[INFO] 변동률 임계초과 or last_price=None -> 감성 분석 수행...")
-                # 데이터 수집 -> 요약 -> 감성분석
-                collected_data = data_collector_main()
-                all_summaries = summarize_content_main(collected_data)
-                analysis_results = sentiment_analysis_main(all_summaries)
-
-                if analysis_results:
-                    average_sentiment = sum(r["sentiment_score"] for r in analysis_results) / len(analysis_results)
-                    average_confidence = sum(r["confidence"] for r in analysis_results) / len(analysis_results)
-                else:
-                    average_sentiment = 0.0
-                    average_confidence = 0.0
-
-                print(f"[INFO] 평균 감성: {average_sentiment:.4f}, 평균 확신도: {average_confidence:.2f}")
-            else:
-                print("[INFO] 큰 변동 없음 -> 감성 분석 스킵 (이전 감성점수 유지)")
-
-            # (4) 기술적 지표 계산
-            df = calculate_sma(df, window=20)
-            df = calculate_rsi(df, period=14)
-            df = calculate_macd(df)
-
-            # (5) 자산 평가
-            total_value = config.balance + (config.position * current_price)
-            print(f"[INFO] 현재 가격: {current_price:.2f}, 총 자산(Paper): {total_value:.2f}")
-
-            # (6) 목표 비중 계산
-            rsi_latest = df['RSI_14'].iloc[-1]
-            new_target_ratio = adjust_target_ratio_with_signals(
-                base_ratio=config.TARGET_BTC_RATIO,
-                rsi_value=rsi_latest,
-                sentiment=average_sentiment
-            )
-            print(f"[INFO] RSI={rsi_latest:.2f}, 감성={average_sentiment:.4f} -> 목표비중={new_target_ratio:.2f}")
+            record_tick_candles(config.SYMBOL, config.TIMEFRAME, df, config.CANDLE_CACHE_INDICATORS)
+        except Exception as e:
+            print(f"[WARN] 캔들 저장 실패: {e}")
+
+    # (2) 가격 변동 체크 (로그용)
+    if last_price is not None:
+        price_change_percent = ((current_price - last_price) / last_price) * 100
+    else:
+        price_change_percent = 0.0
+
+    print(f"[INFO] 이전 가격: {last_price}, 현재 가격: {current_price:.2f}, 변동률: {price_change_percent:.2f}%")
+
+    # (3) 감성: inline이면 파이프라인(수집 -> 로컬 감성 -> 갱신 정책 -> LLM) 실행,
+    #     process/external이면 워커가 발행한 신호만 읽음
+    pipeline = runtime["sentiment_pipeline"]
+    if pipeline is not None:
+        # 뉴스/감성 쪽 오류로 매매가 멈추지 않도록, 실패하면 이전 감성 점수를 그대로 사용
+        try:
+            score = pipeline.step(df["close"].to_numpy())
+        except Exception as e:
+            print(f"[WARN] 감성 파이프라인 실패 -> 이전 감성 점수 유지: {e}")
+            score = None
+        if score is not None:
+            average_sentiment = score
+            print(f"[INFO] 누적 감성: {average_sentiment:.4f}, 소스별: {pipeline.source_scores()}")
+    else:
+        average_sentiment = read_sentiment_signal(average_sentiment)
+
+    # (4) 기술적 지표 계산 (증분 상태는 재시작 후에도 이어서 계산)
+    df = calculate_sma(df, window=20)
+    df = calculate_rsi(df, period=14)
+    df = calculate_macd(df)
+    indicator_state = update_indicator_state(runtime["indicator_state"], df)
+
+    # (5) 자산 평가
+    total_value = config.balance + (config.position * current_price)
+    print(f"[INFO] 현재 가격: {current_price:.2f}, 총 자산(Paper): {total_value:.2f}")
+
+    # (6) 목표 비중 계산
+    # 매매 판단 RSI는 기존과 같이 최근 MAX_CANDLE개 캔들 창으로 계산한 값 사용
+    # (증분 상태의 RSI는 시작 이후 전체 캔들을 누적해 값이 달라지므로 30/70 기준에 쓰지 않음)
+    rsi_latest = df['RSI_14'].iloc[-1]
+    new_target_ratio = adjust_target_ratio_with_signals(
+        base_ratio=config.TARGET_BTC_RATIO,
+        rsi_value=rsi_latest,
+        sentiment=average_sentiment
+    )
+    print(f"[INFO] RSI={rsi_latest:.2f}, 감성={average_sentiment:.4f} -> 목표비중={new_target_ratio:.2f}")
 
-            # (7) 리밸런싱
-            paper_trade_rebalance(new_target_ratio, current_price, rsi_latest, average_sentiment)
+    # (7) 리밸런싱
+    position_before = config.position
+    paper_trade_rebalance(new_target_ratio, current_price, rsi_latest, average_sentiment)
 
-            # (8) last_price 갱신 & DB 저장
-            last_price = current_price
-            save_meta_info("last_price", last_price)
+    # (7-1) 섀도 전략: 같은 가격/지표/감성으로 여러 설정을 벡터 연산으로 동시에 리밸런싱
+    if runtime.get("shadow") is not None:
+        try:
+            run_shadow_step(runtime["shadow"], current_price, rsi_latest, average_sentiment)
+        except Exception as e:
+            print(f"[WARN] 섀도 전략 갱신 실패: {e}")
 
-            # (9) 주기적 대기
-            time.sleep(60)
+    if config.position > position_before:
+        decision = "buy"
+    elif config.position < position_before:
+        decision = "sell"
+    else:
+        decision = "hold"
 
+    # (7-2) 원장에 매매 판단 기록 (체결/수수료는 paper_trade_rebalance에서 기록)
+    if config.LEDGER_ENABLED:
+        try:
+            get_ledger(config.LEDGER_SNAPSHOT_EVERY).record_decision(
+                decision, float(current_price), note=f"target_ratio={new_target_ratio:.2f}")
         except Exception as e:
-            print(f"[ERROR] {e}")
-            time.sleep(60)
+            print(f"[WARN] 원장 기록 실패: {e}")
+
+    # (7-3) 대시보드 실시간 패널로 틱 이벤트 발행 (공유 메모리 링, DB 조회 없음)
+    if runtime.get("tick_bus") is not None:
+        latest = indicator_state["latest"]
+        try:
+            runtime["tick_bus"].publish({
+                "ts": time.time(),
+                "price": float(current_price),
+                "sma": latest.get("sma"),
+                "rsi": float(rsi_latest),
+                "macd": latest.get("macd"),
+                "macd_signal": latest.get("macd_signal"),
+                "sentiment": float(average_sentiment),
+                "target_ratio": new_target_ratio,
+                "decision": decision,
+                "balance": config.balance,
+                "position": config.position,
+                "equity": config.balance + config.position * float(current_price)
+            })
+        except Exception as e:
+            print(f"[WARN] 틱 이벤트 발행 실패: {e}")
+
+    # (8) 상태 갱신 & 스냅샷 저장 (한 트랜잭션)
+    runtime["last_price"] = float(current_price)
+    runtime["average_sentiment"] = average_sentiment
+    runtime["indicator_state"] = indicator_state
+    save_state_snapshot(
+        balance=config.balance,
+        position=config.position,
+        last_price=runtime["last_price"],
+        sentiment=average_sentiment,
+        indicator_state=indicator_state,
+        extra_state=pipeline.to_dict() if pipeline is not None else None
+    )
+
+
+######################
+# 메인 루프 시작점   #
+######################
+if __name__ == "__main__":
+    print("=== 코인 자동매매 프로그램 (Paper Trading) 시작 ===")
+
+    # 1) DB 초기화
+    init_db()
+    if config.CANDLE_STORE_ENABLED:
+        init_candle_db()
+
+    # 2) 상태 복원 (스냅샷 우선)
+    runtime = restore_state()
+    if config.LEDGER_ENABLED:
+        sync_ledger_state(runtime["last_price"])
+
+    # 3) 대시보드 실시간 패널용 틱 이벤트 채널
+    if config.TICK_BUS_ENABLED:
+        runtime["tick_bus"] = TickPublisher(
+            config.TICK_BUS_FILE, n_slots=config.TICK_BUS_SLOTS, slot_size=config.TICK_BUS_SLOT_SIZE)
+
+    # 3-1) process 모드: 감성 워커를 별도 프로세스로 실행 (죽으면 다음 틱에 재시작)
+    worker = start_sentiment_worker() if config.SENTIMENT_WORKER_MODE == "process" else None
+
+    # 4) 런타임 프로파일러 (kill -USR1 <pid> 또는 data/profile.control 로 켬, 꺼져 있으면 오버헤드 없음)
+    profiler = TickProfiler(
+        default_ticks=config.PROFILE_TICKS,
+        default_modes=config.PROFILE_MODES,
+        sample_interval=config.PROFILE_SAMPLE_INTERVAL,
+        slow_tick_seconds=config.PROFILE_SLOW_TICK_SECONDS,
+        slow_tick_cooldown=config.PROFILE_SLOW_TICK_COOLDOWN
+    )
+    profiler.install_signal_handler()
+    print(f"[INFO] PID={os.getpid()} (프로파일링: kill -USR1 {os.getpid()})")
+
+    # SIGTERM(kill)도 SystemExit로 바꿔 아래 finally(워커 종료)를 거치게 함
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    # 메인 루프
+    try:
+        while True:
+            try:
+                if worker is not None and worker.poll() is not None:
+                    print(f"[WARN] 감성 워커 종료됨 (code={worker.returncode}) -> 재시작")
+                    worker = start_sentiment_worker()
+
+                with profiler.tick():
+                    run_tick(runtime)
+
+                # 주기적 대기
+                time.sleep(config.TICK_INTERVAL)
+
+            except Exception as e:
+                print(f"[ERROR] {e}")
+                time.sleep(config.TICK_INTERVAL)
+    finally:
+        stop_sentiment_worker(worker)
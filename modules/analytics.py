@@ -0,0 +1,303 @@
+# analytics.py
+import os
+import json
+import sqlite3
+import argparse
+import numpy as np
+import pandas as pd
+
+from modules.db_utils import DB_FILE
+from modules.log_export import EXPORT_DIR, has_export, open_dataset
+
+# 분포 집계용 고정 구간
+RSI_BINS = np.linspace(0, 100, 11)
+SENTIMENT_BINS = np.linspace(-1, 1, 11)
+
+TRADE_COLUMNS = ["id", "timestamp", "current_price", "rsi", "sentiment", "action",
+                 "trade_amount", "trade_price", "balance", "position", "fee"]
+DECISION_COLUMNS = ["id", "timestamp", "rsi", "sentiment", "decision", "hold_count"]
+
+
+class RunningStats:
+    """
+    청크 단위로 count/평균/표준편차/최소/최대/히스토그램을 누적 (상수 메모리).
+    weights를 주면 가중치(예: hold_count) 반영.
+    """
+
+    def __init__(self, bins):
+        self.bins = bins
+        self.hist = np.zeros(len(bins) - 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values, weights=None):
+        values = np.asarray(values, dtype=float)
+        weights = np.ones_like(values) if weights is None else np.asarray(weights, dtype=float)
+        mask = ~np.isnan(values)
+        values, weights = values[mask], weights[mask]
+        if values.size == 0:
+            return
+        self.count += int(weights.sum())
+        self.total += float((values * weights).sum())
+        self.total_sq += float((values * values * weights).sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        hist, _ = np.histogram(np.clip(values, self.bins[0], self.bins[-1]), bins=self.bins, weights=weights)
+        self.hist += hist.astype(np.int64)
+
+    def result(self) -> dict:
+        if self.count == 0:
+            return {"count": 0}
+        mean = self.total / self.count
+        var = max(self.total_sq / self.count - mean * mean, 0.0)
+        return {
+            "count": self.count,
+            "mean": mean,
+            "std": var ** 0.5,
+            "min": self.min,
+            "max": self.max,
+            "histogram": {
+                f"{lo:g}~{hi:g}": int(n)
+                for lo, hi, n in zip(self.bins[:-1], self.bins[1:], self.hist)
+            }
+        }
+
+
+def iter_table_chunks(table, columns, source="sqlite", db_file=DB_FILE,
+                      export_dir=EXPORT_DIR, chunk_size=200_000):
+    """
+    테이블을 chunk_size 행씩 DataFrame으로 순회.
+    - sqlite  : read-only 연결 + fetchmany 기반 chunksize 조회
+    - parquet : 필요한 컬럼만 record batch 단위로 읽음 (live DB 미접근)
+    """
+    if source == "parquet":
+        dataset = open_dataset(os.path.join(export_dir, table))
+        if dataset is None:
+            return
+        cols = [c for c in columns if c in dataset.schema.names]
+        for batch in dataset.to_batches(columns=cols, batch_size=chunk_size):
+            if batch.num_rows:
+                yield batch.to_pandas()
+        return
+
+    conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+    try:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        cols = [c for c in columns if c in existing]
+        if not cols:
+            return
+        query = f"SELECT {', '.join(cols)} FROM {table}"
+        for chunk in pd.read_sql_query(query, conn, chunksize=chunk_size):
+            yield chunk
+    finally:
+        conn.close()
+
+
+def _new_day():
+    return {
+        "trades": 0, "buy": 0, "sell": 0, "turnover": 0.0, "fee": 0.0,
+        "decisions": 0, "hold": 0,
+        "first_id": None, "first_equity": None, "last_id": None, "last_equity": None
+    }
+
+
+def analyze(source="sqlite", db_file=DB_FILE, export_dir=EXPORT_DIR, chunk_size=200_000) -> dict:
+    """
+    trade_logs / decision_logs를 한 번씩만 훑으며 모든 통계를 계산.
+    메모리는 청크 크기 + 일(day) 수에만 비례.
+    """
+    kwargs = {"source": source, "db_file": db_file, "export_dir": export_dir, "chunk_size": chunk_size}
+
+    trades = {"count": 0, "buy": 0, "sell": 0, "turnover": 0.0, "fee": 0.0, "fee_missing": 0}
+    first = (None, None)  # (id, equity)
+    last = (None, None)
+    trade_rsi = RunningStats(RSI_BINS)
+    trade_senti = RunningStats(SENTIMENT_BINS)
+    days = {}
+
+    # (1) trade_logs
+    for chunk in iter_table_chunks("trade_logs", TRADE_COLUMNS, **kwargs):
+        if "fee" not in chunk.columns:
+            chunk["fee"] = np.nan
+        chunk["date"] = chunk["timestamp"].str.slice(0, 10)
+        chunk["notional"] = chunk["trade_amount"].fillna(0) * chunk["trade_price"].fillna(0)
+        chunk["equity"] = chunk["balance"] + chunk["position"] * chunk["current_price"]
+        is_buy = chunk["action"] == "buy"
+        is_sell = chunk["action"] == "sell"
+
+        trades["count"] += len(chunk)
+        trades["buy"] += int(is_buy.sum())
+        trades["sell"] += int(is_sell.sum())
+        trades["turnover"] += float(chunk["notional"].sum())
+        trades["fee"] += float(chunk["fee"].sum(skipna=True))
+        trades["fee_missing"] += int(chunk["fee"].isna().sum())
+        trade_rsi.update(chunk["rsi"])
+        trade_senti.update(chunk["sentiment"])
+
+        # 전체 처음/마지막 자산 (청크 순서와 무관하게 id 기준)
+        lo = chunk["id"].idxmin()
+        hi = chunk["id"].idxmax()
+        if first[0] is None or chunk.at[lo, "id"] < first[0]:
+            first = (int(chunk.at[lo, "id"]), float(chunk.at[lo, "equity"]))
+        if last[0] is None or chunk.at[hi, "id"] > last[0]:
+            last = (int(chunk.at[hi, "id"]), float(chunk.at[hi, "equity"]))
+
+        chunk["is_buy"] = is_buy
+        chunk["is_sell"] = is_sell
+        grouped = chunk.groupby("date").agg(
+            trades=("id", "size"),
+            buy=("is_buy", "sum"),
+            sell=("is_sell", "sum"),
+            turnover=("notional", "sum"),
+            fee=("fee", "sum"),
+            first_id=("id", "min"),
+            last_id=("id", "max")
+        )
+        id_to_equity = chunk.set_index("id")["equity"]
+        for date, row in grouped.iterrows():
+            day = days.setdefault(date, _new_day())
+            day["trades"] += int(row["trades"])
+            day["buy"] += int(row["buy"])
+            day["sell"] += int(row["sell"])
+            day["turnover"] += float(row["turnover"])
+            day["fee"] += float(row["fee"])
+            if day["first_id"] is None or row["first_id"] < day["first_id"]:
+                day["first_id"] = int(row["first_id"])
+                day["first_equity"] = float(id_to_equity[int(row["first_id"])])
+            if day["last_id"] is None or row["last_id"] > day["last_id"]:
+                day["last_id"] = int(row["last_id"])
+                day["last_equity"] = float(id_to_equity[int(row["last_id"])])
+
+    # (2) decision_logs (압축된 hold 구간은 hold_count만큼 가중)
+    decisions = {}
+    decision_rsi = RunningStats(RSI_BINS)
+    decision_senti = RunningStats(SENTIMENT_BINS)
+    for chunk in iter_table_chunks("decision_logs", DECISION_COLUMNS, **kwargs):
+        weights = chunk["hold_count"].fillna(1) if "hold_count" in chunk.columns else pd.Series(1, index=chunk.index)
+        chunk["weight"] = weights.astype(int)
+        chunk["date"] = chunk["timestamp"].str.slice(0, 10)
+
+        for decision, n in chunk.groupby("decision")["weight"].sum().items():
+            decisions[decision] = decisions.get(decision, 0) + int(n)
+        decision_rsi.update(chunk["rsi"], chunk["weight"])
+        decision_senti.update(chunk["sentiment"], chunk["weight"])
+
+        chunk["hold_weight"] = chunk["weight"].where(chunk["decision"] == "hold", 0)
+        per_day = chunk.groupby("date")[["weight", "hold_weight"]].sum()
+        for date, row in per_day.iterrows():
+            day = days.setdefault(date, _new_day())
+            day["decisions"] += int(row["weight"])
+            day["hold"] += int(row["hold_weight"])
+
+    pnl = None
+    if first[0] is not None:
+        pnl = {
+            "initial_equity": first[1],
+            "final_equity": last[1],
+            "pnl": last[1] - first[1],
+            "return_pct": (last[1] / first[1] - 1) * 100 if first[1] else 0.0
+        }
+
+    per_day = {}
+    for date in sorted(days):
+        day = days[date]
+        per_day[date] = {
+            k: v for k, v in day.items() if k not in ("first_id", "last_id")
+        }
+        if day["first_equity"] is not None:
+            per_day[date]["pnl"] = day["last_equity"] - day["first_equity"]
+
+    return {
+        "trades": trades,
+        "pnl": pnl,
+        "trade_rsi": trade_rsi.result(),
+        "trade_sentiment": trade_senti.result(),
+        "decisions": decisions,
+        "decision_rsi": decision_rsi.result(),
+        "decision_sentiment": decision_senti.result(),
+        "per_day": per_day
+    }
+
+
+def print_report(report: dict):
+    trades = report["trades"]
+    print("=== 체결(trade_logs) 요약 ===")
+    print("총 로그 수:", trades["count"])
+    print("매수 횟수:", trades["buy"])
+    print("매도 횟수:", trades["sell"])
+    print(f"거래대금 합계: {trades['turnover']:,.2f}원")
+    print(f"수수료 합계: {trades['fee']:,.2f}원 (수수료 미기록 행: {trades['fee_missing']})")
+
+    if report["pnl"]:
+        pnl = report["pnl"]
+        print(f"초기 자산: {pnl['initial_equity']:,.2f}원 -> 최종 자산: {pnl['final_equity']:,.2f}원 "
+              f"(손익 {pnl['pnl']:,.2f}원, {pnl['return_pct']:.2f}%)")
+
+    for title, key in [("RSI (체결)", "trade_rsi"), ("sentiment (체결)", "trade_sentiment"),
+                       ("RSI (의사결정)", "decision_rsi"), ("sentiment (의사결정)", "decision_sentiment")]:
+        stats = report[key]
+        if stats["count"]:
+            print(f"{title}: 평균={stats['mean']:.4f}, 표준편차={stats['std']:.4f}, "
+                  f"최소={stats['min']:.4f}, 최대={stats['max']:.4f}")
+            print("  분포:", stats["histogram"])
+
+    print("\n=== 의사결정(decision_logs) 빈도 ===")
+    for decision, n in sorted(report["decisions"].items()):
+        print(f"{decision}: {n}")
+
+    print("\n=== 일별 통계 ===")
+    for date, day in report["per_day"].items():
+        pnl = f"{day['pnl']:,.2f}" if "pnl" in day else "-"
+        print(f"{date} | 체결 {day['trades']} (매수 {day['buy']}/매도 {day['sell']}) | "
+              f"거래대금 {day['turnover']:,.0f} | 수수료 {day['fee']:,.2f} | "
+              f"의사결정 {day['decisions']} (hold {day['hold']}) | 손익 {pnl}")
+
+
+def plot_daily_equity(report: dict):
+    """
+    일별 마지막 자산 차트 (일 단위 집계값만 사용하므로 로그 크기와 무관).
+    """
+    import matplotlib.pyplot as plt
+    dates = [d for d, day in report["per_day"].items() if day["last_equity"] is not None]
+    equity = [report["per_day"][d]["last_equity"] for d in dates]
+    plt.figure(figsize=(10, 5))
+    plt.plot(pd.to_datetime(dates), equity, label="Equity")
+    plt.title("Daily Equity")
+    plt.legend()
+    plt.show()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="trade/decision logs 스트리밍 분석")
+    parser.add_argument("--source", choices=["auto", "sqlite", "parquet"], default="auto",
+                        help="auto: Parquet export가 있으면 Parquet, 없으면 SQLite")
+    parser.add_argument("--db", default=DB_FILE)
+    parser.add_argument("--export-dir", default=EXPORT_DIR)
+    parser.add_argument("--chunk-size", type=int, default=200_000)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--plot", action="store_true", help="일별 자산 차트 표시")
+    args = parser.parse_args(argv)
+
+    source = args.source
+    if source == "auto":
+        source = "parquet" if has_export("trade_logs", args.export_dir) else "sqlite"
+    if source == "sqlite" and not os.path.exists(args.db):
+        print(f"[ERROR] DB 파일이 존재하지 않습니다: {args.db}")
+        return None
+
+    report = analyze(source, args.db, args.export_dir, args.chunk_size)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"[INFO] source={source}")
+        print_report(report)
+    if args.plot:
+        plot_daily_equity(report)
+    return report
+
+
+if __name__ == "__main__":
+    main()
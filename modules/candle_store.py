@@ -0,0 +1,413 @@
+# candle_store.py
+"""
+로컬 캔들 저장소 + 지표 캐시 (data/candles.db, 트레이딩 DB와 분리).
+
+- candles         : (symbol, timeframe, ts) 기준 OHLCV. 진행 중인 마지막 캔들은 다음 upsert에서 덮어씀
+- indicator_cache : (symbol, timeframe, indicator, window, ts) 기준 지표 값
+  spec (indicator, window) 하나가 여러 출력 행을 만듦
+    sma  -> sma            ema -> ema            rsi -> rsi
+    bb   -> bb_upper, bb_lower (2 표준편차, 중앙선은 sma와 같음)
+    macd -> macd, macd_signal, macd_hist (window = slow 기간, fast/signal은 slow 비율 12/26, 9/26)
+- 증분 확장: spec별 마지막 캐시 ts 이후(그 ts 포함, 진행 중 캔들 갱신) 캔들만 다시 계산.
+  계산에 필요한 과거 구간(context)만 함께 읽음 — SMA/BB는 window-1개,
+  EWM 계열은 그보다 오래된 캔들의 가중치가 1e-15 미만이 되는 길이(약 35 x window)
+- 차트용 조회는 SQLite 집계(bare column + MIN/MAX)로 화면 구간을 max_points 버킷으로 줄여서 반환
+
+실행 (과거 캔들 채우기 + 지표 캐시 생성):
+    python -m modules.candle_store --backfill --symbol BTC/KRW --timeframe 5m --days 90
+"""
+import os
+import json
+import time
+import sqlite3
+import argparse
+
+import numpy as np
+import pandas as pd
+
+print("[LOG] candle_store.py module is being imported...")
+
+from modules import indicators_batch
+
+CANDLE_DB_FILE = "data/candles.db"
+
+CANDLE_DB_DIR = os.path.dirname(CANDLE_DB_FILE)
+if not os.path.exists(CANDLE_DB_DIR):
+    os.makedirs(CANDLE_DB_DIR)
+
+TIMEFRAME_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "10m": 600_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000, "1w": 604_800_000
+}
+EWM_CONTEXT_FACTOR = 35  # EWM 계열 context = window x 이 값 (decay^n < 1e-15)
+
+# spec 이름 -> 출력 지표 이름
+SPEC_OUTPUTS = {
+    "sma": ("sma",),
+    "ema": ("ema",),
+    "rsi": ("rsi",),
+    "bb": ("bb_upper", "bb_lower"),
+    "macd": ("macd", "macd_signal", "macd_hist"),
+}
+
+
+def _connect():
+    conn = sqlite3.connect(CANDLE_DB_FILE)
+    return conn
+
+
+def init_candle_db():
+    """
+    candles / indicator_cache 테이블 생성 (WAL: 트레이더 쓰기 중에도 대시보드 읽기 가능).
+    """
+    conn = _connect()
+    cur = conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS candles (
+            symbol TEXT,
+            timeframe TEXT,
+            ts INTEGER,
+            open REAL,
+            high REAL,
+            low REAL,
+            close REAL,
+            volume REAL,
+            PRIMARY KEY (symbol, timeframe, ts)
+        ) WITHOUT ROWID;
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS indicator_cache (
+            symbol TEXT,
+            timeframe TEXT,
+            indicator TEXT,
+            window INTEGER,
+            ts INTEGER,
+            value REAL,
+            PRIMARY KEY (symbol, timeframe, indicator, window, ts)
+        ) WITHOUT ROWID;
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+##############
+# 캔들       #
+##############
+def upsert_candles(symbol: str, timeframe: str, candles) -> int:
+    """
+    캔들 저장. candles는 fetch_ohlc_data() DataFrame(DatetimeIndex) 또는 ccxt ohlcv 리스트.
+    이미 있는 ts는 값만 갱신 (진행 중이던 마지막 캔들 확정). 반환: 처리한 행 수
+    """
+    if isinstance(candles, pd.DataFrame):
+        if candles.empty:
+            return 0
+        ts = candles.index.as_unit("ms").asi8.tolist()
+        values = candles[["open", "high", "low", "close", "volume"]].astype(float).itertuples(index=False)
+        rows = [(symbol, timeframe, t, *v) for t, v in zip(ts, values)]
+    else:
+        rows = [(symbol, timeframe, int(c[0]), *map(float, c[1:6])) for c in candles]
+    if not rows:
+        return 0
+
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO candles (symbol, timeframe, ts, open, high, low, close, volume)
+                VALUES (?,?,?,?,?,?,?,?)
+                ON CONFLICT(symbol, timeframe, ts) DO UPDATE SET
+                    open=excluded.open, high=excluded.high, low=excluded.low,
+                    close=excluded.close, volume=excluded.volume
+                """,
+                rows
+            )
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def load_candles(symbol: str, timeframe: str, start_ms: int = None, end_ms: int = None,
+                 limit: int = None) -> pd.DataFrame:
+    """
+    [start_ms, end_ms] 구간 캔들 (limit이면 끝에서부터 limit개). index=timestamp(UTC)
+    """
+    query = "SELECT ts, open, high, low, close, volume FROM candles WHERE symbol=? AND timeframe=?"
+    params = [symbol, timeframe]
+    if start_ms is not None:
+        query += " AND ts >= ?"
+        params.append(int(start_ms))
+    if end_ms is not None:
+        query += " AND ts <= ?"
+        params.append(int(end_ms))
+    if limit:
+        query = f"SELECT * FROM ({query} ORDER BY ts DESC LIMIT ?) ORDER BY ts"
+        params.append(int(limit))
+    else:
+        query += " ORDER BY ts"
+
+    conn = _connect()
+    try:
+        df = pd.read_sql_query(query, conn, params=params)
+    finally:
+        conn.close()
+    df.index = pd.to_datetime(df.pop("ts"), unit="ms")
+    df.index.name = "timestamp"
+    return df
+
+
+def list_series() -> list:
+    """저장된 (symbol, timeframe, 캔들 수, 첫 ts, 마지막 ts) 목록"""
+    conn = _connect()
+    try:
+        return conn.execute(
+            "SELECT symbol, timeframe, COUNT(*), MIN(ts), MAX(ts) FROM candles GROUP BY symbol, timeframe"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def cached_specs(symbol: str, timeframe: str) -> list:
+    """지표 캐시에 값이 있는 spec [(indicator, window), ...]"""
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT indicator, window FROM indicator_cache WHERE symbol=? AND timeframe=?",
+            (symbol, timeframe)
+        ).fetchall()
+    finally:
+        conn.close()
+    first_outputs = {outputs[0]: spec for spec, outputs in SPEC_OUTPUTS.items()}
+    return sorted((first_outputs[name], window) for name, window in rows if name in first_outputs)
+
+
+################
+# 지표 캐시    #
+################
+def _context_length(indicator: str, window: int) -> int:
+    if indicator in ("sma", "bb"):
+        return window - 1
+    return EWM_CONTEXT_FACTOR * window
+
+
+def _compute(indicator: str, window: int, close: np.ndarray) -> dict:
+    """
+    spec 하나의 출력 지표들 (indicators_batch 사용, 1 x n 행렬).
+    """
+    if indicator == "sma":
+        return {"sma": indicators_batch.sma(close, window)[0]}
+    if indicator == "ema":
+        return {"ema": indicators_batch.ema(close, window)[0]}
+    if indicator == "rsi":
+        return {"rsi": indicators_batch.rsi(close, window)[0]}
+    if indicator == "bb":
+        bb = indicators_batch.bollinger(close, window)
+        return {"bb_upper": bb["upper"][0], "bb_lower": bb["lower"][0]}
+    if indicator == "macd":
+        fast, signal = max(1, round(window * 12 / 26)), max(1, round(window * 9 / 26))
+        m = indicators_batch.macd(close, fast, window, signal)
+        return {"macd": m["macd"][0], "macd_signal": m["signal"][0], "macd_hist": m["hist"][0]}
+    raise ValueError(f"unknown indicator: {indicator}")
+
+
+def extend_indicator_cache(symbol: str, timeframe: str, specs) -> dict:
+    """
+    spec [(indicator, window), ...]마다 캐시 마지막 ts 이후 캔들만 계산해 indicator_cache에 upsert.
+    반환: {(indicator, window): 쓴 행 수}
+    """
+    conn = _connect()
+    written = {}
+    try:
+        for indicator, window in specs:
+            first_output = SPEC_OUTPUTS[indicator][0]
+            cursor = conn.execute(
+                "SELECT MAX(ts) FROM indicator_cache WHERE symbol=? AND timeframe=? AND indicator=? AND window=?",
+                (symbol, timeframe, first_output, window)
+            ).fetchone()[0]
+
+            if cursor is None:
+                rows = conn.execute(
+                    "SELECT ts, close FROM candles WHERE symbol=? AND timeframe=? ORDER BY ts",
+                    (symbol, timeframe)
+                ).fetchall()
+            else:
+                context = conn.execute(
+                    """
+                    SELECT ts, close FROM candles WHERE symbol=? AND timeframe=? AND ts < ?
+                    ORDER BY ts DESC LIMIT ?
+                    """,
+                    (symbol, timeframe, cursor, _context_length(indicator, window))
+                ).fetchall()
+                rows = context[::-1] + conn.execute(
+                    "SELECT ts, close FROM candles WHERE symbol=? AND timeframe=? AND ts >= ? ORDER BY ts",
+                    (symbol, timeframe, cursor)
+                ).fetchall()
+            if not rows:
+                written[(indicator, window)] = 0
+                continue
+
+            ts = np.array([r[0] for r in rows], dtype=np.int64)
+            close = np.array([r[1] for r in rows], dtype=float)
+            keep = ts >= cursor if cursor is not None else np.ones(len(ts), dtype=bool)
+            records = []
+            for name, values in _compute(indicator, window, close).items():
+                valid = keep & ~np.isnan(values)
+                records += [(symbol, timeframe, name, window, t, v)
+                            for t, v in zip(ts[valid].tolist(), values[valid].tolist())]
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO indicator_cache (symbol, timeframe, indicator, window, ts, value)
+                    VALUES (?,?,?,?,?,?)
+                    ON CONFLICT(symbol, timeframe, indicator, window, ts) DO UPDATE SET value=excluded.value
+                    """,
+                    records
+                )
+            written[(indicator, window)] = len(records)
+    finally:
+        conn.close()
+    return written
+
+
+def invalidate_indicator_cache(symbol: str, timeframe: str, specs=None):
+    """
+    지표 캐시 삭제 (specs=None이면 해당 심볼/타임프레임 전체). 과거 캔들을 고쳐 넣은 뒤 사용.
+    """
+    conn = _connect()
+    try:
+        with conn:
+            if specs is None:
+                conn.execute("DELETE FROM indicator_cache WHERE symbol=? AND timeframe=?", (symbol, timeframe))
+            for indicator, window in specs or []:
+                conn.executemany(
+                    "DELETE FROM indicator_cache WHERE symbol=? AND timeframe=? AND indicator=? AND window=?",
+                    [(symbol, timeframe, name, window) for name in SPEC_OUTPUTS[indicator]]
+                )
+    finally:
+        conn.close()
+
+
+##################
+# 차트용 조회    #
+##################
+def load_chart_data(symbol: str, timeframe: str, start_ms: int, end_ms: int, specs=(),
+                    max_points: int = 2000) -> pd.DataFrame:
+    """
+    [start_ms, end_ms] 구간 캔들 + 지표 컬럼(예: sma_20, rsi_14, macd_26) DataFrame.
+    구간 캔들 수가 max_points를 넘으면 버킷 단위로 합침 (SQLite 안에서 집계):
+    open=버킷 첫 캔들, close=마지막 캔들, high=최대, low=최소, volume=합, 지표=버킷 마지막 캔들의 값.
+    반환 df.attrs["bucket_ms"]에 사용한 버킷 크기(ms).
+    """
+    tf_ms = TIMEFRAME_MS.get(timeframe, 60_000)
+    n_candles = max(1, (end_ms - start_ms) // tf_ms + 1)
+    bucket = tf_ms * max(1, -(-n_candles // max_points))
+    params = (bucket, symbol, timeframe, int(start_ms), int(end_ms))
+
+    conn = _connect()
+    try:
+        # SQLite bare column: MAX(ts)/MIN(ts) 집계 시 같은 행의 close/open 값을 돌려줌
+        closes = pd.read_sql_query(
+            """
+            SELECT ts / ? AS b, MAX(ts) AS last_ts, close, MAX(high) AS high, MIN(low) AS low,
+                   SUM(volume) AS volume
+            FROM candles WHERE symbol=? AND timeframe=? AND ts BETWEEN ? AND ?
+            GROUP BY b
+            """,
+            conn, params=params
+        )
+        opens = pd.read_sql_query(
+            """
+            SELECT ts / ? AS b, MIN(ts) AS ts, open
+            FROM candles WHERE symbol=? AND timeframe=? AND ts BETWEEN ? AND ?
+            GROUP BY b
+            """,
+            conn, params=params
+        )
+        df = opens.merge(closes, on="b")
+        # 지표는 버킷 마지막 캔들 시점 값만 기본키로 점 조회 (구간 전체를 훑지 않음)
+        last_ts = json.dumps(df["last_ts"].astype(int).tolist())
+        for indicator, window in specs:
+            for name in SPEC_OUTPUTS[indicator]:
+                values = pd.read_sql_query(
+                    """
+                    SELECT ts AS last_ts, value FROM indicator_cache
+                    WHERE symbol=? AND timeframe=? AND indicator=? AND window=?
+                      AND ts IN (SELECT value FROM json_each(?))
+                    """,
+                    conn, params=(symbol, timeframe, name, window, last_ts)
+                )
+                df = df.merge(values.rename(columns={"value": f"{name}_{window}"}), on="last_ts", how="left")
+    finally:
+        conn.close()
+
+    df = df.sort_values("ts")
+    df.index = pd.to_datetime(df.pop("ts"), unit="ms")
+    df.index.name = "timestamp"
+    df = df.drop(columns=["b", "last_ts"])
+    df.attrs["bucket_ms"] = bucket
+    return df
+
+
+###################
+# 트레이더 연동   #
+###################
+def record_tick_candles(symbol: str, timeframe: str, df: pd.DataFrame, specs) -> dict:
+    """
+    트레이더 틱마다: 받은 캔들 upsert + 지표 캐시 증분 확장.
+    """
+    upsert_candles(symbol, timeframe, df)
+    return extend_indicator_cache(symbol, timeframe, specs)
+
+
+def backfill(symbol: str, timeframe: str, days: int, batch: int = 200) -> int:
+    """
+    거래소 관문으로 과거 캔들을 since 기준으로 이어 받아 저장. 반환: 저장한 캔들 수
+    """
+    from modules.exchange_gateway import get_gateway
+    gateway = get_gateway()
+    tf_ms = TIMEFRAME_MS[timeframe]
+    since = int(time.time() * 1000) - days * 86_400_000
+    total = 0
+    while True:
+        ohlcv = gateway.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=batch)
+        if not ohlcv:
+            break
+        total += upsert_candles(symbol, timeframe, ohlcv)
+        last_ts = ohlcv[-1][0]
+        print(f"[INFO] backfill {symbol} {timeframe}: {pd.to_datetime(last_ts, unit='ms')} 까지 {total}개")
+        if last_ts + tf_ms >= time.time() * 1000 or len(ohlcv) < batch:
+            break
+        since = last_ts + tf_ms
+    return total
+
+
+if __name__ == "__main__":
+    import config.config as config
+
+    parser = argparse.ArgumentParser(description="candle store")
+    parser.add_argument("--symbol", default=config.SYMBOL)
+    parser.add_argument("--timeframe", default=config.TIMEFRAME)
+    parser.add_argument("--backfill", action="store_true")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--rebuild", action="store_true", help="지표 캐시를 지우고 처음부터 다시 계산")
+    args = parser.parse_args()
+
+    print("[START] candle_store.py main()")
+    init_candle_db()
+    if args.backfill:
+        backfill(args.symbol, args.timeframe, args.days)
+    if args.backfill or args.rebuild:
+        # 과거 캔들이 새로 들어오면 앞부분 지표가 비므로 처음부터 다시 계산
+        invalidate_indicator_cache(args.symbol, args.timeframe)
+    started = time.perf_counter()
+    written = extend_indicator_cache(args.symbol, args.timeframe, config.CANDLE_CACHE_INDICATORS)
+    print(f"[INFO] 지표 캐시 갱신 ({time.perf_counter() - started:.2f}s): {written}")
+    for row in list_series():
+        print(f"[INFO] {row[0]} {row[1]}: {row[2]}개 ({pd.to_datetime(row[3], unit='ms')} ~ "
+              f"{pd.to_datetime(row[4], unit='ms')})")
+    print("[END] candle_store.py main()")
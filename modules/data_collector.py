@@ -1,10 +1,10 @@
 # data_collector.py
 import os
 import sys
+import time
 import asyncio
+import json
 import feedparser
-import requests
-import re
 
 print("[LOG] data_collector.py module is being imported...")
 
@@ -16,48 +16,61 @@ load_dotenv()
 
 import asyncpraw
 
-def clean_text(raw_text: str, max_length: int = 500) -> str:
-    text = re.sub(r'<.*?>', ' ', raw_text)
-    text = re.sub(r'http\S+', '', text)
-    text = re.sub(r'[\r\n]+', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-
-    if len(text) > max_length:
-        text = text[:max_length] + " ...(truncated)"
-    return text
-
-async def collect_reddit_data() -> list:
+from modules.news_store import init_news_db, upsert_items
+from modules.http_client import cached_get
+from modules.text_processing import clean_text, clean_records
+
+DEFAULT_SUBREDDITS = [
+    "CryptoCurrency",
+    "Bitcoin",
+    "Ethereum",
+    "CryptoMarkets",
+    "CryptoMoonShots",
+    "Altcoin",
+    "CoinBase",
+    "Binance",
+    "KrakenSupport",
+    "BitcoinBeginners"
+]
+
+async def collect_reddit_data(subreddits=None, limit: int = 5, listing: str = "hot",
+                              cursors: dict = None, rate_limiter=None) -> list:
+    """
+    서브레딧 게시물 수집.
+    - listing : "hot" | "new"
+    - cursors : {서브레딧: 마지막으로 본 created_utc}. 주어지면 그 이후 게시물만 수집
+                ("new" 목록은 최신순이므로 커서에 닿으면 바로 중단)
+    - rate_limiter : 서브레딧 요청 사이 간격을 맞추는 limiter (news_sources.RateLimiter)
+    """
     print("[LOG] collect_reddit_data() start...")
     reddit_data = []
+    reddit_subs = subreddits or DEFAULT_SUBREDDITS
+    cursors = cursors or {}
 
     async with asyncpraw.Reddit(
         client_id=os.getenv("REDDIT_CLIENT_ID"),
         client_secret=os.getenv("REDDIT_SECRET_ID"),
         user_agent=os.getenv("REDDIT_USER_AGENT")
     ) as reddit_client:
-        
-        reddit_subs = [
-            "CryptoCurrency",
-            "Bitcoin",
-            "Ethereum",
-            "CryptoMarkets",
-            "CryptoMoonShots",
-            "Altcoin",
-            "CoinBase",
-            "Binance",
-            "KrakenSupport",
-            "BitcoinBeginners"
-        ]
 
         for sub_name in reddit_subs:
             try:
+                if rate_limiter is not None:
+                    await rate_limiter.async_wait()
                 subreddit = await reddit_client.subreddit(sub_name)
-                async for submission in subreddit.hot(limit=5):
+                submissions = subreddit.new(limit=limit) if listing == "new" else subreddit.hot(limit=limit)
+                cursor = cursors.get(sub_name)
+                async for submission in submissions:
+                    if cursor is not None and submission.created_utc <= cursor:
+                        if listing == "new":
+                            break
+                        continue
                     post_info = {
                         "subreddit": sub_name,
                         "title": clean_text(submission.title, max_length=300),
                         "url": submission.url,
-                        "score": submission.score
+                        "score": submission.score,
+                        "created_utc": submission.created_utc
                     }
                     reddit_data.append(post_info)
             except Exception as e:
@@ -66,26 +79,47 @@ async def collect_reddit_data() -> list:
     print("[LOG] collect_reddit_data() end. total collected:", len(reddit_data))
     return reddit_data
 
-def get_rss_feed(url: str) -> list:
+def get_rss_feed(url: str, ttl: int = 300, workers: int = None) -> list:
+    """
+    RSS 피드 수집. 공용 세션 + 조건부 GET으로 받아오며,
+    서버가 304(변경 없음)를 주거나 ttl 이내 캐시면 파싱 없이 빈 리스트 반환.
+    workers: HTML이 많은 피드의 텍스트 정리를 스레드 풀로 분배
+    """
     print("[LOG] get_rss_feed() start...")
-    feed = feedparser.parse(url)
-    articles = []
-    for entry in feed.entries:
-        summary_clean = clean_text(getattr(entry, 'summary', ''), max_length=1000)
-        text_clean = clean_text(entry.title + " " + getattr(entry, 'summary', ''), max_length=1500)
+    response = cached_get(url, ttl=ttl)
+    if response.not_modified:
+        print("[LOG] get_rss_feed() end. 변경 없음 (304/cache) -> skip")
+        return []
+    if response.status_code != 200:
+        print(f"[ERROR] RSS Error: status={response.status_code}")
+        return []
 
+    feed = feedparser.parse(response.content)
+    # title/summary를 한 번씩만 정리하고, 정리된 결과로 text를 구성
+    cleaned = clean_records(
+        ({"title": entry.title, "summary": getattr(entry, 'summary', '')} for entry in feed.entries),
+        field_limits={"title": 300, "summary": 1000},
+        text_fields=("title", "summary"),
+        text_max_length=1500,
+        workers=workers
+    )
+    articles = []
+    for entry, c in zip(feed.entries, cleaned):
         articles.append({
             'source': 'RSS',
-            'title': clean_text(entry.title, max_length=300),
+            'title': c["title"],
             'link': entry.link,
-            'summary': summary_clean,
+            'summary': c["summary"],
             'timestamp': getattr(entry, 'published', ''),
-            'text': text_clean
+            'text': c["text"]
         })
     print("[LOG] get_rss_feed() end. total articles:", len(articles))
     return articles
 
-def get_cryptopanic_news(api_key: str, kind='news', currencies='BTC,ETH') -> list:
+def get_cryptopanic_news(api_key: str, kind='news', currencies='BTC,ETH', ttl: int = 300) -> list:
+    """
+    CryptoPanic 뉴스 수집. 304(변경 없음)/ttl 이내 캐시면 빈 리스트 반환.
+    """
     print("[LOG] get_cryptopanic_news() start...")
     url = "https://cryptopanic.com/api/v1/posts/"
     params = {
@@ -93,57 +127,74 @@ def get_cryptopanic_news(api_key: str, kind='news', currencies='BTC,ETH') -> lis
         'kind': kind,
         'currencies': currencies
     }
-    response = requests.get(url, params=params)
+    response = cached_get(url, params=params, ttl=ttl)
+    if response.not_modified:
+        print("[LOG] get_cryptopanic_news() end. 변경 없음 (304/cache) -> skip")
+        return []
     if response.status_code == 200:
-        data = response.json()
+        data = json.loads(response.content)
         results = data.get('results', [])
+        cleaned = clean_records(
+            results,
+            field_limits={"title": 300},
+            text_fields=("title", "body"),
+            text_max_length=1500
+        )
         parsed = []
-        for item in results:
-            body_text = item.get('body', '')
-            text_clean = clean_text(item['title'] + " " + body_text, max_length=1500)
+        for item, c in zip(results, cleaned):
             parsed.append({
                 'source': 'CryptoPanic',
-                'title': clean_text(item['title'], max_length=300),
+                'title': c["title"],
                 'timestamp': item['published_at'],
-                'text': text_clean,
+                'text': c["text"],
                 'domain': item['source']['domain']
             })
         print("[LOG] get_cryptopanic_news() end. total news:", len(parsed))
         return parsed
     else:
-        print("[ERROR] CryptoPanic Error:", response.text)
+        print("[ERROR] CryptoPanic Error:", response.content[:500])
         return []
 
-def main() -> dict:
+def main(dedupe: bool = True, force: bool = False, sources=None) -> dict:
+    """
+    등록된 뉴스 소스(config.NEWS_SOURCES)를 각자의 주기에 맞춰 수집.
+    - force=False : 수집 주기가 된 소스만 호출 (force=True면 전체 호출)
+    - 각 소스는 저장된 커서 이후의 새 item만 가져옴
+    dedupe=True이면 수집 결과를 news_store(SQLite + FTS5)에 저장하고,
+    이전에 이미 수집된 item은 제외한 '새 item'만 반환 (LLM 요약 전에 중복 제거).
+    """
     print("[START] data_collector.py main()")
-    
-    # 1) RSS
-    print("[INFO] Fetching RSS feed...")
-    rss_url = "https://news.google.com/rss/search?q=bitcoin"
-    rss_articles = get_rss_feed(rss_url)
-
-    # 2) CryptoPanic
-    print("[INFO] Fetching CryptoPanic news...")
-    api_key = os.getenv("CRYPTOPANIC_API_KEY", "")
-    cp_news = []
-    if api_key:
-        cp_news = get_cryptopanic_news(api_key, 'news', 'BTC,ETH')
-    else:
-        print("[INFO] CryptoPanic API Key가 설정되지 않았습니다. (데이터 수집 스킵)")
 
-    # 3) Reddit
-    print("[INFO] Fetching Reddit data...")
-    reddit_data = asyncio.run(collect_reddit_data())
+    # 순환 import 방지: news_sources가 이 모듈의 수집 함수를 사용
+    from modules.news_sources import build_sources, poll_sources, commit_source_states
+
+    if sources is None:
+        sources = build_sources()
+    polled_at = time.time()
+    collected, updates = poll_sources(sources, force=force, now=polled_at)
+
+    # 저장 + 중복 제거
+    if dedupe:
+        init_news_db()
+        for key, items in collected.items():
+            new_items = upsert_items(items)
+            print(f"[INFO] {key}: 수집 {len(items)}건 중 신규 {len(new_items)}건")
+            collected[key] = new_items
+
+    # 커서는 item이 news_store에 저장된 뒤에만 전진 (중간에 실패하면 다음 수집에서 다시 가져옴)
+    commit_source_states(updates, now=polled_at)
 
     print("[END] data_collector.py main()")
-    return {
-        "rss": rss_articles,
-        "cryptopanic": cp_news,
-        "reddit": reddit_data
-    }
+    return collected
 
 if __name__ == "__main__":
-    # 단독 실행 시 테스트
-    data = main()
-    print("[LOG] data_collector.py executed directly, data length:",
-          {k: len(v) for k, v in data.items()})
+    # 단독 실행 시 테스트 (--loop: 소스별 주기에 맞춰 계속 수집)
+    if "--loop" in sys.argv:
+        while True:
+            data = main()
+            print("[LOG] collected:", {k: len(v) for k, v in data.items()})
+            time.sleep(10)
+    else:
+        data = main(force=True)
+        print("[LOG] data_collector.py executed directly, data length:",
+              {k: len(v) for k, v in data.items()})
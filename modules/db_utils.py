@@ -1,6 +1,9 @@
 # db_utils.py
 import sqlite3
 import os
+import json
+import re
+import contextlib
 from datetime import datetime
 
 DB_FILE = "data/trade_logs.db"
@@ -9,6 +12,76 @@ DB_DIR = os.path.dirname(DB_FILE)
 if not os.path.exists(DB_DIR):
     os.makedirs(DB_DIR)
 
+# decision_logs의 hold 구간 압축(run-length)용 컬럼
+DECISION_RUN_COLUMNS = {
+    "end_timestamp": "TEXT",
+    "hold_count": "INTEGER DEFAULT 1",
+    "price_min": "REAL",
+    "price_max": "REAL",
+    "rsi_min": "REAL",
+    "rsi_max": "REAL",
+    "sentiment_min": "REAL",
+    "sentiment_max": "REAL"
+}
+
+HOLD_MERGE_MAX_GAP = 120  # 초. 직전 hold 구간 끝과 이보다 멀면 병합하지 않음 (틱 주기 60초 x 2)
+
+# main.run_tick()이 여는 틱 트랜잭션 연결 (없으면 None)
+_tick_conn = None
+
+
+@contextlib.contextmanager
+def tick_transaction():
+    """
+    틱 1회의 trade_logs / decision_logs / 원장 / state_snapshot 쓰기를 한 연결, 한 트랜잭션으로 묶음.
+    블록이 예외 없이 끝나면 커밋, 예외가 나면 전부 롤백 (중간에 죽어도 스냅샷과 로그가 어긋나지 않음).
+    쓰기 잠금은 첫 INSERT/UPDATE 때 잡히므로, 그 전 단계(시세/감성 수집)는 다른 쓰기를 막지 않음.
+    """
+    global _tick_conn
+    if _tick_conn is not None:
+        yield _tick_conn
+        return
+    conn = sqlite3.connect(DB_FILE, timeout=30)
+    _tick_conn = conn
+    try:
+        with conn:
+            yield conn
+    finally:
+        _tick_conn = None
+        conn.close()
+
+
+def active_tick_connection():
+    """진행 중인 틱 트랜잭션 연결 (없으면 None)"""
+    return _tick_conn
+
+
+@contextlib.contextmanager
+def write_connection():
+    """
+    trade_logs.db 쓰기용 연결. 틱 트랜잭션 안이면 그 연결을 그대로 쓰고(커밋은 틱 끝에서),
+    밖이면 새 연결로 바로 커밋.
+    """
+    if _tick_conn is not None:
+        yield _tick_conn
+        return
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def _ensure_columns(cur, table, columns):
+    """
+    기존 DB에 없는 컬럼을 ALTER TABLE로 추가 (간단 마이그레이션).
+    """
+    cur.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cur.fetchall()}
+    for name, col_type in columns.items():
+        if name not in existing:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
+
 def init_db():
     """
     trade_logs, decision_logs, meta_info 테이블이 없으면 생성.
@@ -30,10 +103,12 @@ def init_db():
             trade_price REAL,
             balance REAL,
             position REAL,
-            reason TEXT
+            reason TEXT,
+            fee REAL
         );
         """
     )
+    _ensure_columns(cur, "trade_logs", {"fee": "REAL"})
 
     # decision_logs 테이블
     cur.execute(
@@ -45,10 +120,19 @@ def init_db():
             rsi REAL,
             sentiment REAL,
             decision TEXT,
-            reason TEXT
+            reason TEXT,
+            end_timestamp TEXT,
+            hold_count INTEGER DEFAULT 1,
+            price_min REAL,
+            price_max REAL,
+            rsi_min REAL,
+            rsi_max REAL,
+            sentiment_min REAL,
+            sentiment_max REAL
         );
         """
     )
+    _ensure_columns(cur, "decision_logs", DECISION_RUN_COLUMNS)
 
     # meta_info 테이블
     cur.execute(
@@ -60,67 +144,168 @@ def init_db():
         );
         """
     )
+
+    # state_snapshot 테이블 (항상 1행만 유지)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS state_snapshot (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            updated_at TEXT,
+            balance REAL,
+            position REAL,
+            last_price REAL,
+            sentiment REAL,
+            candle_cursor INTEGER,
+            indicator_state TEXT,
+            extra_state TEXT
+        );
+        """
+    )
+
+    # sentiment_signal 테이블 (감성 워커가 덮어쓰는 1행, 트레이더는 PK로 1건만 읽음)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sentiment_signal (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            updated_at TEXT,
+            updated_ts REAL,
+            seq INTEGER,
+            sentiment REAL,
+            source_scores TEXT,
+            state TEXT
+        );
+        """
+    )
+
+    # WAL 모드: 틱마다 쓰는 스냅샷/로그가 대시보드 읽기와 서로 막지 않도록
+    cur.execute("PRAGMA journal_mode=WAL")
     
     conn.commit()
     conn.close()
 
 def write_trade_log_db(current_price, rsi, sentiment,
                        action, trade_amount, trade_price,
-                       balance, position, reason):
+                       balance, position, reason, fee=None):
     """
     매수/매도 체결 시 trade_logs 테이블에 기록.
+    fee: 해당 체결에서 지불한 수수료(원화)
     """
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO trade_logs
-        (timestamp, current_price, rsi, sentiment,
-         action, trade_amount, trade_price, balance,
-         position, reason)
-        VALUES (?,?,?,?,?,?,?,?,?,?)
-        """,
-        (
-            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            current_price,
-            rsi,
-            sentiment,
-            action,
-            trade_amount,
-            trade_price,
-            balance,
-            position,
-            reason
+    with write_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO trade_logs
+            (timestamp, current_price, rsi, sentiment,
+             action, trade_amount, trade_price, balance,
+             position, reason, fee)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?)
+            """,
+            (
+                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                current_price,
+                rsi,
+                sentiment,
+                action,
+                trade_amount,
+                trade_price,
+                balance,
+                position,
+                reason,
+                fee
+            )
         )
-    )
-    conn.commit()
-    conn.close()
+
+def _reason_key(reason):
+    """
+    reason 문자열에서 숫자만 지운 '유형' 키. (예: "diff_value=# < REBALANCE_THRESHOLD")
+    """
+    return re.sub(r"[-+]?\d[\d,.]*", "#", reason or "")
+
+def _seconds_since(timestamp: str, now: datetime) -> float:
+    """
+    'YYYY-MM-DD HH:MM:SS' 문자열부터 now까지 경과 초. 해석할 수 없으면 inf.
+    """
+    try:
+        return (now - datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")).total_seconds()
+    except (TypeError, ValueError):
+        return float("inf")
+
 
 def write_decision_log_db(current_price, rsi, sentiment,
-                          decision, reason):
+                          decision, reason, compact=False, max_gap=HOLD_MERGE_MAX_GAP):
     """
     모든 의사결정(buy/sell/hold) 시 decision_logs 테이블에 기록.
+    compact=True이면 직전 행과 같은 유형의 연속 hold를 새 행 대신 직전 행에 병합
+    (직전 행의 end_timestamp가 max_gap초 이내일 때만. 봇이 멈췄던 구간은 병합하지 않음):
+    - timestamp ~ end_timestamp : 구간 시작/끝
+    - hold_count                : 병합된 틱 수
+    - *_min / *_max             : 구간 내 가격/RSI/감성 범위
+    - current_price/rsi/sentiment/reason : 구간의 마지막 값
     """
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO decision_logs
-        (timestamp, current_price, rsi, sentiment,
-         decision, reason)
-        VALUES (?,?,?,?,?,?)
-        """,
-        (
-            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            current_price,
-            rsi,
-            sentiment,
-            decision,
-            reason
+    now_dt = datetime.now()
+    now = now_dt.strftime("%Y-%m-%d %H:%M:%S")
+    with write_connection() as conn:
+        cur = conn.cursor()
+
+        if compact and decision == "hold":
+            cur.execute("SELECT id, decision, reason, COALESCE(end_timestamp, timestamp) FROM decision_logs "
+                        "ORDER BY id DESC LIMIT 1")
+            last = cur.fetchone()
+            if (last is not None and last[1] == "hold" and _reason_key(last[2]) == _reason_key(reason)
+                    and _seconds_since(last[3], now_dt) <= max_gap):
+                cur.execute(
+                    """
+                    UPDATE decision_logs SET
+                        end_timestamp = :ts,
+                        hold_count = COALESCE(hold_count, 1) + 1,
+                        price_min = MIN(COALESCE(price_min, current_price, :price), COALESCE(:price, price_min, current_price)),
+                        price_max = MAX(COALESCE(price_max, current_price, :price), COALESCE(:price, price_max, current_price)),
+                        rsi_min = MIN(COALESCE(rsi_min, rsi, :rsi), COALESCE(:rsi, rsi_min, rsi)),
+                        rsi_max = MAX(COALESCE(rsi_max, rsi, :rsi), COALESCE(:rsi, rsi_max, rsi)),
+                        sentiment_min = MIN(COALESCE(sentiment_min, sentiment, :senti), COALESCE(:senti, sentiment_min, sentiment)),
+                        sentiment_max = MAX(COALESCE(sentiment_max, sentiment, :senti), COALESCE(:senti, sentiment_max, sentiment)),
+                        current_price = :price,
+                        rsi = :rsi,
+                        sentiment = :senti,
+                        reason = :reason
+                    WHERE id = :id
+                    """,
+                    {
+                        "ts": now,
+                        "price": current_price,
+                        "rsi": rsi,
+                        "senti": sentiment,
+                        "reason": reason,
+                        "id": last[0]
+                    }
+                )
+                return
+
+        cur.execute(
+            """
+            INSERT INTO decision_logs
+            (timestamp, current_price, rsi, sentiment,
+             decision, reason, end_timestamp, hold_count,
+             price_min, price_max, rsi_min, rsi_max,
+             sentiment_min, sentiment_max)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            """,
+            (
+                now,
+                current_price,
+                rsi,
+                sentiment,
+                decision,
+                reason,
+                now,
+                1,
+                current_price,
+                current_price,
+                rsi,
+                rsi,
+                sentiment,
+                sentiment
+            )
         )
-    )
-    conn.commit()
-    conn.close()
 
 def load_last_state():
     """
@@ -198,3 +383,145 @@ def load_meta_info(key: str):
         return None
     else:
         return row[0]
+
+
+# -------- 상태 스냅샷 (틱 단위 원자적 저장/복원) --------
+def save_state_snapshot(balance, position, last_price, sentiment,
+                        indicator_state=None, extra_state=None):
+    """
+    트레이더의 메모리 상태 전체를 state_snapshot 테이블에 덮어씀.
+    틱 트랜잭션(tick_transaction) 안에서 부르면 그 틱의 매매/판단 로그, 원장 이벤트와 함께 커밋.
+    - indicator_state : trading_utils.update_indicator_state() 상태 (cursor 포함)
+    - extra_state     : 그 밖의 JSON 직렬화 가능한 상태(dict). None이면 저장된 값을 유지
+                        (process/external 감성 모드에서 inline 파이프라인 상태를 지우지 않도록)
+    """
+    candle_cursor = indicator_state.get("cursor") if indicator_state else None
+    with write_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO state_snapshot
+            (id, updated_at, balance, position, last_price, sentiment,
+             candle_cursor, indicator_state, extra_state)
+            VALUES (1,?,?,?,?,?,?,?,?)
+            ON CONFLICT(id) DO UPDATE SET
+                updated_at = excluded.updated_at,
+                balance = excluded.balance,
+                position = excluded.position,
+                last_price = excluded.last_price,
+                sentiment = excluded.sentiment,
+                candle_cursor = excluded.candle_cursor,
+                indicator_state = excluded.indicator_state,
+                extra_state = COALESCE(excluded.extra_state, state_snapshot.extra_state)
+            """,
+            (
+                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                balance,
+                position,
+                last_price,
+                sentiment,
+                candle_cursor,
+                json.dumps(indicator_state) if indicator_state is not None else None,
+                json.dumps(extra_state) if extra_state is not None else None
+            )
+        )
+
+def load_state_snapshot():
+    """
+    state_snapshot 테이블에서 마지막 스냅샷을 한 번의 조회로 읽어 dict로 반환. 없으면 None.
+    """
+    if not os.path.exists(DB_FILE):
+        return None
+
+    conn = sqlite3.connect(DB_FILE)
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            """
+            SELECT updated_at, balance, position, last_price, sentiment,
+                   candle_cursor, indicator_state, extra_state
+            FROM state_snapshot WHERE id = 1
+            """
+        )
+        row = cur.fetchone()
+    except sqlite3.OperationalError:
+        row = None  # 스냅샷 테이블이 없는 예전 DB
+    conn.close()
+
+    if row is None:
+        return None
+
+    updated_at, balance, position, last_price, sentiment, candle_cursor, indicator_json, extra_json = row
+    return {
+        "updated_at": updated_at,
+        "balance": balance,
+        "position": position,
+        "last_price": last_price,
+        "sentiment": sentiment,
+        "candle_cursor": candle_cursor,
+        "indicator_state": json.loads(indicator_json) if indicator_json else None,
+        "extra_state": json.loads(extra_json) if extra_json else {}
+    }
+
+def publish_sentiment_signal(sentiment, source_scores=None, state=None):
+    """
+    감성 워커의 최신 결과를 sentiment_signal 1행에 덮어씀 (seq는 발행마다 1 증가).
+    - source_scores : 소스별 점수(dict), 대시보드/로그용
+    - state         : 워커 재시작 시 이어서 누적하기 위한 상태(dict)
+    """
+    now = datetime.now()
+    conn = sqlite3.connect(DB_FILE, timeout=10)
+    try:
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO sentiment_signal
+                (id, updated_at, updated_ts, seq, sentiment, source_scores, state)
+                VALUES (1,?,?,1,?,?,?)
+                ON CONFLICT(id) DO UPDATE SET
+                    updated_at = excluded.updated_at,
+                    updated_ts = excluded.updated_ts,
+                    seq = seq + 1,
+                    sentiment = excluded.sentiment,
+                    source_scores = excluded.source_scores,
+                    state = excluded.state
+                """,
+                (
+                    now.strftime("%Y-%m-%d %H:%M:%S"),
+                    now.timestamp(),
+                    sentiment,
+                    json.dumps(source_scores) if source_scores is not None else None,
+                    json.dumps(state) if state is not None else None
+                )
+            )
+    finally:
+        conn.close()
+
+def load_sentiment_signal(with_state=True):
+    """
+    sentiment_signal 1행을 dict로 반환. 없으면 None.
+    트레이더는 with_state=False로 호출해 큰 state JSON을 읽지 않음.
+    """
+    if not os.path.exists(DB_FILE):
+        return None
+
+    columns = "updated_at, updated_ts, seq, sentiment, source_scores" + (", state" if with_state else "")
+    conn = sqlite3.connect(DB_FILE, timeout=10)
+    try:
+        row = conn.execute(f"SELECT {columns} FROM sentiment_signal WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        row = None  # 테이블이 없는 예전 DB
+    finally:
+        conn.close()
+
+    if row is None:
+        return None
+    signal = {
+        "updated_at": row[0],
+        "updated_ts": row[1],
+        "seq": row[2],
+        "sentiment": row[3],
+        "source_scores": json.loads(row[4]) if row[4] else {}
+    }
+    if with_state:
+        signal["state"] = json.loads(row[5]) if row[5] else None
+    return signal
@@ -0,0 +1,269 @@
+# exchange_gateway.py
+"""
+거래소(ccxt) 호출 공용 관문.
+
+- 엔드포인트 그룹별 토큰 버킷 (업비트 Remaining-Req 그룹: candles / orderbook / ticker / market ...)
+  응답 헤더 "Remaining-Req: group=candles; min=1799; sec=9"의 남은 횟수로 버킷을 보정하고,
+  429(RateLimitExceeded)를 받으면 해당 그룹 속도를 절반으로 낮춘 뒤 성공할 때마다 조금씩 회복
+- 같은 요청(메서드 + 인자)이 이미 진행 중이면 새로 보내지 않고 그 결과를 함께 받음 (요청 병합)
+- RateLimitExceeded / DDoSProtection / NetworkError는 지수 백오프 + 지터로 재시도
+  (그 외 ExchangeError는 재시도해도 같은 결과라 바로 올림)
+
+버킷과 병합은 프로세스 단위 (트레이더 / 대시보드 / 캔들 백필은 각자 버킷을 가짐).
+프로세스 사이의 조율은 서버 쪽 신호뿐: Remaining-Req의 남은 횟수와 429는 IP 전체 사용량 기준이라
+다른 프로세스가 쓴 만큼 이 프로세스의 버킷도 줄어듦. 여러 프로세스를 동시에 오래 돌리면
+config.EXCHANGE_RATE_LIMITS를 프로세스 수만큼 나눠 잡을 것.
+ccxt 자체 rate limit(enableRateLimit)은 이 관문이 대신하므로 끔.
+ccxt 거래소 객체는 마지막 응답 헤더(last_response_headers)를 하나만 보관하므로,
+호출과 헤더 읽기는 한 잠금 안에서 수행 (요청은 프로세스 안에서 한 번에 하나씩 나감).
+"""
+import time
+import random
+import threading
+from concurrent.futures import Future
+
+import ccxt
+
+print("[LOG] exchange_gateway.py module is being imported...")
+
+import config.config as config
+
+# ccxt 메서드 -> 업비트 Remaining-Req 그룹 (헤더를 받기 전 첫 요청의 버킷 선택용)
+METHOD_GROUPS = {
+    "fetch_ohlcv": "candles",
+    "fetch_order_book": "orderbook",
+    "fetch_order_books": "orderbook",
+    "fetch_ticker": "ticker",
+    "fetch_tickers": "ticker",
+    "fetch_trades": "trades",
+    "load_markets": "market",
+    "fetch_markets": "market",
+    "create_order": "order",
+    "cancel_order": "order",
+}
+RETRYABLE_ERRORS = (ccxt.RateLimitExceeded, ccxt.DDoSProtection, ccxt.NetworkError)
+
+
+def parse_remaining_req(headers) -> dict:
+    """
+    업비트 Remaining-Req 헤더 파싱. 예) "group=candles; min=1799; sec=9"
+    반환: {"group": "candles", "min": 1799, "sec": 9} (헤더가 없으면 None)
+    """
+    if not headers:
+        return None
+    value = None
+    for key, item in headers.items():
+        if key.lower() == "remaining-req":
+            value = item
+            break
+    if not value:
+        return None
+    parsed = {}
+    for part in value.split(";"):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            k, v = k.strip(), v.strip()
+            parsed[k] = int(v) if v.isdigit() else v
+    return parsed if "group" in parsed else None
+
+
+class TokenBucket:
+    """
+    초당 rate개 토큰이 차고 최대 capacity개까지 쌓이는 버킷 (스레드 안전).
+    - observe_remaining(): 서버가 알려준 남은 횟수로 토큰 수를 낮춤 (0이면 1초 대기)
+    - penalize(): 429 수신 시 속도 절반 + retry_after 동안 대기
+    - reward(): 성공 시 원래 속도(max_rate)까지 조금씩 회복
+    """
+
+    def __init__(self, rate: float, capacity: float = None, min_rate: float = 0.5):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min(min_rate, self.max_rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """
+        토큰 1개 예약. 바로 쓸 수 있으면 0, 아니면 기다려야 할 시간(초).
+        토큰을 음수까지 미리 빌려 쓰므로 대기 순서가 도착 순서와 같음.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1.0
+            wait = max(0.0, self.blocked_until - now)
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+            return wait
+
+    def acquire(self) -> float:
+        """토큰을 얻을 때까지 대기. 반환: 기다린 시간(초)"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def observe_remaining(self, sec_remaining: int):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens = min(self.tokens, float(sec_remaining))
+            if sec_remaining <= 0:
+                self.blocked_until = max(self.blocked_until, now + 1.0)
+
+    def penalize(self, retry_after: float = 1.0):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * 0.5)
+            self.tokens = min(self.tokens, 0.0)
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def reward(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class ExchangeGateway:
+    """
+    ccxt 거래소 객체를 감싸 버킷 대기 -> 요청 병합 -> 재시도를 적용.
+    사용: gateway.call("fetch_ohlcv", symbol, timeframe="5m", limit=50) 또는 gateway.fetch_ohlcv(...)
+    """
+
+    def __init__(self, exchange, rates: dict = None, max_retries: int = 4,
+                 backoff_base: float = 0.5, backoff_max: float = 10.0):
+        self.exchange = exchange
+        self.rates = dict(rates or {"default": 8})
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        if hasattr(exchange, "enableRateLimit"):
+            exchange.enableRateLimit = False
+
+        self._buckets = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._call_lock = threading.Lock()  # 거래소 호출 + 응답 헤더 읽기
+        self.stats = {"requests": 0, "coalesced": 0, "retries": 0, "rate_limited": 0, "throttled_s": 0.0}
+
+    def bucket(self, group: str) -> TokenBucket:
+        with self._lock:
+            if group not in self._buckets:
+                rate = self.rates.get(group, self.rates.get("default", 8))
+                self._buckets[group] = TokenBucket(rate)
+            return self._buckets[group]
+
+    def _observe_headers(self):
+        remaining = parse_remaining_req(getattr(self.exchange, "last_response_headers", None))
+        if remaining is not None and isinstance(remaining.get("sec"), int):
+            self.bucket(remaining["group"]).observe_remaining(remaining["sec"])
+
+    def _invoke(self, fn, args, kwargs):
+        """
+        거래소 호출과 그 응답 헤더 반영을 한 잠금 안에서 수행.
+        잠금 밖에서 읽으면 다른 스레드가 보낸 요청의 헤더를 이 그룹 것으로 반영할 수 있음.
+        """
+        with self._call_lock:
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._observe_headers()
+
+    def _retry_after(self, attempt: int) -> float:
+        """전체 지터(full jitter) 지수 백오프: 0 ~ min(max, base * 2^attempt) 균등 분포"""
+        return random.uniform(0.0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _call_with_retry(self, method: str, args, kwargs):
+        bucket = self.bucket(METHOD_GROUPS.get(method, "default"))
+        fn = getattr(self.exchange, method)
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            with self._lock:
+                self.stats["requests"] += 1
+                self.stats["throttled_s"] += waited
+            try:
+                result = self._invoke(fn, args, kwargs)
+            except RETRYABLE_ERRORS as e:
+                delay = self._retry_after(attempt)
+                if isinstance(e, ccxt.RateLimitExceeded):
+                    bucket.penalize(retry_after=max(delay, 1.0))
+                    with self._lock:
+                        self.stats["rate_limited"] += 1
+                if attempt >= self.max_retries:
+                    print(f"[ERROR] {method} 재시도 {attempt}회 후 실패: {type(e).__name__}: {e}")
+                    raise
+                attempt += 1
+                with self._lock:
+                    self.stats["retries"] += 1
+                print(f"[WARN] {method} 실패 ({type(e).__name__}) -> {delay:.2f}초 후 재시도 ({attempt}/{self.max_retries})")
+                time.sleep(delay)
+                continue
+            bucket.reward()
+            return result
+
+    def call(self, method: str, *args, **kwargs):
+        """
+        거래소 메서드 호출. 같은 (메서드, 인자) 요청이 진행 중이면 그 결과를 공유.
+        """
+        key = repr((method, args, sorted(kwargs.items())))
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.stats["coalesced"] += 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._call_with_retry(method, args, kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None):
+        return self.call("fetch_ohlcv", symbol, timeframe=timeframe, since=since, limit=limit)
+
+    def fetch_order_book(self, symbol, limit=None):
+        return self.call("fetch_order_book", symbol, limit=limit)
+
+    def fetch_ticker(self, symbol):
+        return self.call("fetch_ticker", symbol)
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> ExchangeGateway:
+    """
+    config.EXCHANGE를 감싼 공용 관문 (프로세스당 1개).
+    """
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = ExchangeGateway(
+                config.EXCHANGE,
+                rates=config.EXCHANGE_RATE_LIMITS,
+                max_retries=config.EXCHANGE_MAX_RETRIES,
+                backoff_base=config.EXCHANGE_BACKOFF_BASE,
+                backoff_max=config.EXCHANGE_BACKOFF_MAX
+            )
+    return _gateway
@@ -0,0 +1,377 @@
+# execution_simulator.py
+import math
+import numpy as np
+
+print("[LOG] execution_simulator.py module is being imported...")
+
+import config.config as config
+
+
+############################
+# 호가창(Order Book) 구성  #
+############################
+def synthetic_books(mid_prices, levels=20, spread_bps=2.0, step_bps=1.0,
+                    level_qty=0.05, depth_growth=0.1):
+    """
+    mid_prices(n,) 기준으로 가상 호가창을 한 번에 생성.
+    반환: (bid_px, bid_qty, ask_px, ask_qty) 각각 (n, levels) 배열.
+    - spread_bps : 최우선 매수/매도 호가 간 스프레드 (bp)
+    - step_bps   : 호가 단계 간 가격 간격 (bp)
+    - level_qty  : 1단계 호가 잔량 (코인 수량), 깊어질수록 depth_growth 비율만큼 증가
+    """
+    mid = np.asarray(mid_prices, dtype=float).reshape(-1, 1)
+    steps = np.arange(levels, dtype=float)
+
+    offset = (spread_bps / 2.0 + steps * step_bps) / 10_000.0
+    ask_px = mid * (1.0 + offset)
+    bid_px = mid * (1.0 - offset)
+
+    qty = level_qty * (1.0 + depth_growth * steps)
+    qty = np.broadcast_to(qty, ask_px.shape).copy()
+    return bid_px, qty, ask_px, qty.copy()
+
+
+def synthetic_order_book(mid_price, **kwargs):
+    """
+    단일 시점의 가상 호가창을 ccxt와 같은 dict 형태({'bids', 'asks'})로 반환.
+    """
+    bid_px, bid_qty, ask_px, ask_qty = synthetic_books([mid_price], **kwargs)
+    return {
+        "bids": np.column_stack([bid_px[0], bid_qty[0]]),
+        "asks": np.column_stack([ask_px[0], ask_qty[0]])
+    }
+
+
+def book_from_ccxt(order_book, levels=None):
+    """
+    ccxt fetch_order_book() 결과(또는 기록된 스냅샷)를 numpy 배열 dict로 변환.
+    """
+    bids = np.asarray([row[:2] for row in order_book.get("bids", [])], dtype=float).reshape(-1, 2)
+    asks = np.asarray([row[:2] for row in order_book.get("asks", [])], dtype=float).reshape(-1, 2)
+    if levels is not None:
+        bids, asks = bids[:levels], asks[:levels]
+    return {"bids": bids, "asks": asks}
+
+
+def walk_book_batch(level_px, level_qty, amount, amount_in="quote"):
+    """
+    여러 주문을 각자의 호가창에 대해 한 번에 '호가 긁기(walk-the-book)' 체결.
+
+    - level_px, level_qty : (n, L) 또는 (L,) 배열 (최우선 호가부터 정렬)
+    - amount              : (n,) 주문 규모. amount_in='quote'면 원화, 'base'면 코인 수량
+    반환 dict:
+      filled_base, filled_quote, avg_price : (n,)
+      taken_base                           : (n, L) 단계별 소진 수량
+    """
+    level_px = np.atleast_2d(np.asarray(level_px, dtype=float))
+    level_qty = np.atleast_2d(np.asarray(level_qty, dtype=float))
+    amount = np.asarray(amount, dtype=float).reshape(-1, 1)
+
+    if amount_in == "quote":
+        capacity = level_px * level_qty
+    elif amount_in == "base":
+        capacity = level_qty
+    else:
+        raise ValueError("amount_in must be 'quote' or 'base'.")
+
+    cum = np.cumsum(capacity, axis=1)
+    taken = np.clip(amount - (cum - capacity), 0.0, capacity)
+
+    if amount_in == "quote":
+        taken_base = np.divide(taken, level_px, out=np.zeros_like(taken), where=level_px > 0)
+    else:
+        taken_base = taken
+
+    filled_base = taken_base.sum(axis=1)
+    filled_quote = (taken_base * level_px).sum(axis=1)
+    avg_price = np.divide(filled_quote, filled_base,
+                          out=np.full_like(filled_quote, np.nan), where=filled_base > 0)
+    return {
+        "filled_base": filled_base,
+        "filled_quote": filled_quote,
+        "avg_price": avg_price,
+        "taken_base": taken_base
+    }
+
+
+def _empty_fill(side, requested, liquidity):
+    return {
+        "side": side,
+        "requested": requested,
+        "filled_base": 0.0,
+        "filled_quote": 0.0,
+        "avg_price": float("nan"),
+        "fee": 0.0,
+        "liquidity": liquidity,
+        "partial": True,
+        "children": 0
+    }
+
+
+##########################
+# 체결 시뮬레이터 구현체 #
+##########################
+class FlatPriceSimulator:
+    """
+    기존 Paper Trading 방식: 전량을 현재가에 단일 수수료(CURRENT_FEE)로 체결.
+    - buy  : amount = 수수료 포함 원화 예산
+    - sell : amount = 매도할 코인 수량
+    """
+
+    def __init__(self, fee_rate=None):
+        self.fee_rate = config.CURRENT_FEE if fee_rate is None else fee_rate
+
+    def execute(self, side, amount, price):
+        if amount <= 0 or price <= 0:
+            return _empty_fill(side, amount, "flat")
+
+        if side == "buy":
+            fee = amount * self.fee_rate
+            filled_quote = amount - fee
+            filled_base = filled_quote / price
+        else:
+            filled_base = amount
+            filled_quote = amount * price
+            fee = filled_quote * self.fee_rate
+
+        return {
+            "side": side,
+            "requested": amount,
+            "filled_base": filled_base,
+            "filled_quote": filled_quote,
+            "avg_price": price,
+            "fee": fee,
+            "liquidity": "flat",
+            "partial": False,
+            "children": 1
+        }
+
+
+class OrderBookSimulator:
+    """
+    호가창 스냅샷(기록 or 가상)을 이용한 체결 시뮬레이터.
+    - liquidity='taker' : 호가를 긁어 즉시 체결 (TAKER_FEE)
+    - liquidity='maker' : 최우선 호가에 지정가로 걸어 maker_fill_ratio만큼만 부분 체결 (MAKER_FEE)
+    - liquidity='auto'  : maker로 먼저 체결 후 잔량은 taker로 체결
+    - max_child_value   : 원화 기준 주문 분할 단위 (None이면 분할 없음)
+    - book_recovery     : 분할 주문 사이 소진된 호가 잔량이 회복되는 비율 (0~1)
+    """
+
+    def __init__(self, book_source="synthetic", liquidity="taker",
+                 max_child_value=None, book_recovery=0.5, maker_fill_ratio=0.6,
+                 maker_fee=None, taker_fee=None, book_fetcher=None, book_params=None):
+        self.book_source = book_source
+        self.liquidity = liquidity
+        self.max_child_value = max_child_value
+        self.book_recovery = book_recovery
+        self.maker_fill_ratio = maker_fill_ratio
+        self.maker_fee = config.MAKER_FEE if maker_fee is None else maker_fee
+        self.taker_fee = config.TAKER_FEE if taker_fee is None else taker_fee
+        self.book_fetcher = book_fetcher
+        self.book_params = book_params or {}
+
+    def get_book(self, price):
+        """
+        체결에 사용할 호가창 스냅샷을 반환. 기록 호가창을 받지 못하면 가상 호가창 사용.
+        """
+        if self.book_source == "recorded" and self.book_fetcher is not None:
+            try:
+                book = book_from_ccxt(self.book_fetcher())
+                if len(book["bids"]) and len(book["asks"]):
+                    return book
+                print("[WARN] 호가창이 비어있음 -> 가상 호가창 사용")
+            except Exception as e:
+                print(f"[WARN] 호가창 조회 실패 -> 가상 호가창 사용: {e}")
+        return synthetic_order_book(price, **self.book_params)
+
+    def execute(self, side, amount, price, book=None):
+        """
+        - buy  : amount = 수수료 포함 원화 예산
+        - sell : amount = 매도할 코인 수량
+        반환 dict: filled_base, filled_quote, avg_price, fee, liquidity, partial, children
+        """
+        if amount <= 0 or price <= 0:
+            return _empty_fill(side, amount, self.liquidity)
+
+        if book is None:
+            book = self.get_book(price)
+
+        # buy는 매도호가(asks), sell은 매수호가(bids)를 소진
+        levels = book["asks"] if side == "buy" else book["bids"]
+        level_px = levels[:, 0]
+        depth = levels[:, 1].copy()
+
+        filled_base = 0.0
+        filled_quote = 0.0
+        fee = 0.0
+        children = 0
+        remaining = amount
+
+        # (1) maker 체결분: 최우선 호가에 걸어두고 일부만 체결되었다고 가정
+        if self.liquidity in ("maker", "auto") and len(level_px):
+            maker_px = float(book["bids"][0, 0] if side == "buy" else book["asks"][0, 0])
+            if side == "buy":
+                maker_quote = remaining * self.maker_fill_ratio / (1 + self.maker_fee)
+                maker_base = maker_quote / maker_px
+                remaining -= maker_quote * (1 + self.maker_fee)
+            else:
+                maker_base = remaining * self.maker_fill_ratio
+                maker_quote = maker_base * maker_px
+                remaining -= maker_base
+            filled_base += maker_base
+            filled_quote += maker_quote
+            fee += maker_quote * self.maker_fee
+            children += 1
+
+        # (2) taker 체결분: 분할 주문으로 호가를 긁어 체결
+        if self.liquidity in ("taker", "auto") and remaining > 0:
+            remaining_value = remaining if side == "buy" else remaining * price
+            if self.max_child_value:
+                n_children = max(1, math.ceil(remaining_value / self.max_child_value))
+            else:
+                n_children = 1
+            child_amount = remaining / n_children
+
+            for _ in range(n_children):
+                if side == "buy":
+                    fill = walk_book_batch(level_px, depth, child_amount / (1 + self.taker_fee), "quote")
+                else:
+                    fill = walk_book_batch(level_px, depth, child_amount, "base")
+                base = float(fill["filled_base"][0])
+                if base <= 0:
+                    break
+                quote = float(fill["filled_quote"][0])
+                filled_base += base
+                filled_quote += quote
+                fee += quote * self.taker_fee
+                children += 1
+
+                # 소진된 잔량 차감 후 다음 분할 주문 전 일부 회복
+                consumed = fill["taken_base"][0]
+                depth = depth - consumed * (1.0 - self.book_recovery)
+
+        if filled_base <= 0:
+            return _empty_fill(side, amount, self.liquidity)
+
+        if side == "buy":
+            partial = (filled_quote + fee) < amount * (1 - 1e-9)
+        else:
+            partial = filled_base < amount * (1 - 1e-9)
+
+        return {
+            "side": side,
+            "requested": amount,
+            "filled_base": filled_base,
+            "filled_quote": filled_quote,
+            "avg_price": filled_quote / filled_base,
+            "fee": fee,
+            "liquidity": self.liquidity,
+            "partial": partial,
+            "children": children
+        }
+
+
+def simulate_fills_vectorized(mid_prices, amounts, sides, liquidity="taker",
+                              maker_fill_ratio=0.6, maker_fee=None, taker_fee=None,
+                              **book_params):
+    """
+    섀도 포트폴리오(shadow_strategies.py)용: n개 주문을 각 시점의 가상 호가창에 대해 한 번에 체결.
+    (walk_forward.py 백테스트는 캔들 수익률 - 고정 수수료 모델이라 이 함수를 쓰지 않음)
+    - mid_prices : (n,) 시점별 가격
+    - amounts    : (n,) buy는 수수료 포함 원화 예산, sell은 코인 수량
+    - sides      : (n,) +1 = buy, -1 = sell (0은 주문 없음)
+    - liquidity  : OrderBookSimulator와 같은 의미 ('taker' / 'maker' / 'auto', 분할 주문 없음)
+    반환 dict: filled_base, filled_quote, avg_price, fee, slippage_bps (각 (n,))
+    """
+    if liquidity not in ("taker", "maker", "auto"):
+        raise ValueError("liquidity must be 'taker', 'maker' or 'auto'.")
+    maker_fee = config.MAKER_FEE if maker_fee is None else maker_fee
+    taker_fee = config.TAKER_FEE if taker_fee is None else taker_fee
+
+    mid = np.asarray(mid_prices, dtype=float)
+    amounts = np.asarray(amounts, dtype=float)
+    sides = np.asarray(sides)
+    is_buy = sides > 0
+    is_sell = sides < 0
+
+    bid_px, bid_qty, ask_px, ask_qty = synthetic_books(mid, **book_params)
+
+    filled_base = np.zeros_like(amounts)
+    filled_quote = np.zeros_like(amounts)
+    fee = np.zeros_like(amounts)
+    remaining = amounts
+
+    # (1) maker 체결분: 최우선 호가에 걸어 maker_fill_ratio만큼 체결
+    if liquidity in ("maker", "auto"):
+        px = np.where(is_buy, bid_px[:, 0], ask_px[:, 0])
+        buy_quote = amounts * maker_fill_ratio / (1 + maker_fee)
+        maker_base = np.where(is_buy, buy_quote / px, amounts * maker_fill_ratio)
+        maker_quote = maker_base * px
+        filled_base = filled_base + maker_base
+        filled_quote = filled_quote + maker_quote
+        fee = fee + maker_quote * maker_fee
+        remaining = amounts * (1 - maker_fill_ratio)
+
+    # (2) taker 체결분: 잔량으로 호가를 긁어 체결
+    if liquidity in ("taker", "auto"):
+        buy_fill = walk_book_batch(ask_px, ask_qty, np.where(is_buy, remaining, 0.0) / (1 + taker_fee), "quote")
+        sell_fill = walk_book_batch(bid_px, bid_qty, np.where(is_sell, remaining, 0.0), "base")
+        taker_quote = np.where(is_buy, buy_fill["filled_quote"], sell_fill["filled_quote"])
+        filled_base = filled_base + np.where(is_buy, buy_fill["filled_base"], sell_fill["filled_base"])
+        filled_quote = filled_quote + taker_quote
+        fee = fee + taker_quote * taker_fee
+
+    active = is_buy | is_sell
+    filled_base = np.where(active, filled_base, 0.0)
+    filled_quote = np.where(active, filled_quote, 0.0)
+    fee = np.where(active, fee, 0.0)
+
+    avg_price = np.divide(filled_quote, filled_base,
+                          out=np.full_like(filled_quote, np.nan), where=filled_base > 0)
+    # 불리한 방향 슬리피지를 양수로 표현
+    slippage_bps = np.where(is_buy, avg_price / mid - 1.0, 1.0 - avg_price / mid) * 10_000.0
+
+    return {
+        "filled_base": filled_base,
+        "filled_quote": filled_quote,
+        "avg_price": avg_price,
+        "fee": fee,
+        "slippage_bps": slippage_bps
+    }
+
+
+def get_execution_simulator():
+    """
+    config 설정(EXECUTION_SIMULATOR 등)에 맞는 체결 시뮬레이터를 생성.
+    """
+    if config.EXECUTION_SIMULATOR == "flat":
+        return FlatPriceSimulator()
+
+    book_fetcher = None
+    if config.ORDER_BOOK_SOURCE == "recorded":
+        from modules.trading_utils import fetch_order_book
+        book_fetcher = lambda: fetch_order_book(config.SYMBOL, limit=config.SIM_BOOK_LEVELS)
+
+    return OrderBookSimulator(
+        book_source=config.ORDER_BOOK_SOURCE,
+        liquidity=config.ORDER_LIQUIDITY,
+        max_child_value=config.MAX_CHILD_ORDER_VALUE,
+        book_recovery=config.BOOK_RECOVERY_RATIO,
+        maker_fill_ratio=config.MAKER_FILL_RATIO,
+        book_fetcher=book_fetcher,
+        book_params={
+            "levels": config.SIM_BOOK_LEVELS,
+            "spread_bps": config.SIM_SPREAD_BPS,
+            "step_bps": config.SIM_STEP_BPS,
+            "level_qty": config.SIM_LEVEL_QTY,
+            "depth_growth": config.SIM_DEPTH_GROWTH
+        }
+    )
+
+
+if __name__ == "__main__":
+    print("[START] execution_simulator.py main()")
+    sim = OrderBookSimulator(max_child_value=2_000_000)
+    print("[LOG] buy fill:", sim.execute("buy", 10_000_000, 100_000_000))
+    print("[LOG] sell fill:", sim.execute("sell", 0.3, 100_000_000))
+    print("[END] execution_simulator.py main()")
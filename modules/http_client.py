@@ -0,0 +1,132 @@
+# http_client.py
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import namedtuple
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+print("[LOG] http_client.py module is being imported...")
+
+HTTP_CACHE_FILE = "data/http_cache.db"
+DEFAULT_TTL = 300  # 초. 이 시간 안에는 서버에 다시 묻지 않고 캐시 사용
+USER_AGENT = "invest-data-collector/1.0"
+
+HTTP_CACHE_DIR = os.path.dirname(HTTP_CACHE_FILE)
+if not os.path.exists(HTTP_CACHE_DIR):
+    os.makedirs(HTTP_CACHE_DIR)
+
+# not_modified=True 이면 마지막으로 받은 뒤 내용이 바뀌지 않았음(304 또는 TTL 내 캐시)
+CachedResponse = namedtuple(
+    "CachedResponse",
+    ["status_code", "content", "not_modified", "from_cache", "headers"]
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    keep-alive 연결을 재사용하는 공용 requests.Session (프로세스당 1개).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                          allowed_methods=["GET"])
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT})
+            _session = session
+    return _session
+
+
+def _connect():
+    conn = sqlite3.connect(HTTP_CACHE_FILE)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS http_cache (
+            cache_key TEXT PRIMARY KEY,
+            url TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at REAL,
+            content_type TEXT,
+            body BLOB
+        );
+        """
+    )
+    return conn
+
+
+def _cache_key(url, params):
+    """
+    url + 정렬된 params의 해시 (API 토큰 등이 평문으로 캐시 키에 남지 않도록).
+    """
+    query = urlencode(sorted((params or {}).items()))
+    return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+
+def cached_get(url, params=None, ttl=DEFAULT_TTL, timeout=10) -> CachedResponse:
+    """
+    조건부 GET + 로컬 응답 캐시.
+    1) 캐시가 ttl 이내면 요청 없이 캐시 반환 (not_modified=True, from_cache=True)
+    2) ETag/Last-Modified가 있으면 If-None-Match/If-Modified-Since로 요청
+       -> 304면 캐시 본문 반환 (not_modified=True)
+    3) 200이면 캐시 갱신 후 새 본문 반환 (not_modified=False)
+    """
+    key = _cache_key(url, params)
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT etag, last_modified, fetched_at, content_type, body FROM http_cache WHERE cache_key=?",
+            (key,)
+        ).fetchone()
+
+        now = time.time()
+        if row is not None and ttl and now - row[2] < ttl:
+            return CachedResponse(200, row[4], True, True, {"Content-Type": row[3]})
+
+        headers = {}
+        if row is not None:
+            if row[0]:
+                headers["If-None-Match"] = row[0]
+            if row[1]:
+                headers["If-Modified-Since"] = row[1]
+
+        response = get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and row is not None:
+            with conn:
+                conn.execute("UPDATE http_cache SET fetched_at=? WHERE cache_key=?", (now, key))
+            return CachedResponse(304, row[4], True, True, response.headers)
+
+        if response.status_code == 200:
+            with conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO http_cache
+                    (cache_key, url, etag, last_modified, fetched_at, content_type, body)
+                    VALUES (?,?,?,?,?,?,?)
+                    """,
+                    (
+                        key,
+                        url,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        now,
+                        response.headers.get("Content-Type"),
+                        response.content
+                    )
+                )
+        return CachedResponse(response.status_code, response.content, False, False, response.headers)
+    finally:
+        conn.close()
@@ -0,0 +1,291 @@
+# indicators_batch.py
+"""
+여러 심볼 지표를 (심볼 수, 시간) 2차원 numpy 배열로 한 번에 계산.
+
+- 입력: 같은 시간축으로 정렬된 open/high/low/close/volume 행렬 (없는 구간은 nan)
+  상장이 늦어 앞부분이 비는 심볼도 그대로 넣으면 됨 (각 행의 첫 유효값부터 워밍업 시작)
+- 출력: 입력과 같은 모양. 워밍업이 끝나지 않았거나 입력이 nan인 칸은 nan
+- 단일 DataFrame 버전(trading_utils.calculate_*)과 같은 정의:
+  SMA(rolling mean), RSI(ewm com=period-1, min_periods=period), MACD(ewm span, adjust=False)
+- 롤링 지표는 sliding_window_view, ewm 계열은 시간축 루프 1회(심볼 축은 벡터 연산)
+
+실행 (업비트 KRW 마켓 전체 스캔):
+    python -m modules.indicators_batch --quote KRW --limit 200
+"""
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+print("[LOG] indicators_batch.py module is being imported...")
+
+# nan 전파 ufunc (창 안에 nan이 있으면 nan)
+_SHIFT_REDUCERS = {np.max: np.maximum, np.min: np.minimum}
+
+
+def _as_matrix(x) -> np.ndarray:
+    return np.atleast_2d(np.asarray(x, dtype=float))
+
+
+def _rolling(x: np.ndarray, window: int, func) -> np.ndarray:
+    """
+    시간축 rolling 집계. 창 안에 nan이 하나라도 있으면 nan (pandas rolling 기본 동작과 같음).
+    """
+    x = _as_matrix(x)
+    out = np.full(x.shape, np.nan)
+    n_out = x.shape[1] - window + 1
+    if n_out <= 0:
+        return out
+    if func in _SHIFT_REDUCERS:
+        # max/min은 창 길이만큼 어긋난 슬라이스를 겹쳐 비교하는 편이 창 뷰 집계보다 빠름
+        ufunc = _SHIFT_REDUCERS[func]
+        acc = x[:, :n_out].copy()
+        for k in range(1, window):
+            ufunc(acc, x[:, k:k + n_out], out=acc)
+        out[:, window - 1:] = acc
+    else:
+        out[:, window - 1:] = func(sliding_window_view(x, window, axis=1), axis=-1)
+    return out
+
+
+def _ewm(x: np.ndarray, alpha: float, adjust: bool = True, min_periods: int = 0) -> np.ndarray:
+    """
+    pandas ewm(...).mean()과 같은 지수이동평균 (심볼 축 벡터화).
+    nan 입력은 건너뛰고(상태 유지) 그 칸의 출력은 nan.
+    점화식 s_t = d_t * s_(t-1) + b_t 의 계수(d, b)를 미리 행렬로 만들어 루프에서는 곱/합만 수행.
+    """
+    x = _as_matrix(x)
+    valid = ~np.isnan(x)
+    count = np.cumsum(valid, axis=1)
+    values = np.where(valid, x, 0.0)
+    decay = np.where(valid, 1.0 - alpha, 1.0)
+    if adjust:
+        # 가중합(num)과 가중치 합(den)을 따로 누적
+        num_b, den_b = values, valid.astype(float)
+    else:
+        # 각 행의 첫 유효값은 그대로 시작값
+        first = valid & (count == 1)
+        decay = np.where(first, 0.0, decay)
+        num_b, den_b = np.where(first, values, alpha * values), None
+
+    decay_t, num_t = np.ascontiguousarray(decay.T), np.ascontiguousarray(num_b.T)
+    den_t = np.ascontiguousarray(den_b.T) if den_b is not None else None
+    num = np.empty_like(num_t)
+    den = np.empty_like(num_t) if den_t is not None else None
+    state = np.zeros(num_t.shape[1])
+    weight = np.zeros(num_t.shape[1])
+    for t in range(num_t.shape[0]):
+        state *= decay_t[t]
+        state += num_t[t]
+        num[t] = state
+        if den is not None:
+            weight *= decay_t[t]
+            weight += den_t[t]
+            den[t] = weight
+    result = num.T if den is None else num.T / np.where(den.T > 0, den.T, 1.0)
+    return np.where(valid & (count >= max(min_periods, 1)), result, np.nan)
+
+
+def _prev(x: np.ndarray) -> np.ndarray:
+    """한 칸 이전 값 (첫 칸은 nan)."""
+    out = np.full(x.shape, np.nan)
+    out[:, 1:] = x[:, :-1]
+    return out
+
+
+###############
+# 지표 함수   #
+###############
+def sma(close, window: int = 14) -> np.ndarray:
+    """단순 이동평균"""
+    return _rolling(close, window, np.mean)
+
+
+def ema(close, span: int = 20) -> np.ndarray:
+    """지수이동평균 (ewm span, adjust=False. calculate_macd의 EMA와 같은 식)"""
+    return _ewm(close, 2.0 / (span + 1), adjust=False)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """
+    RSI (calculate_rsi와 같은 식). 각 행 첫 유효값의 gain/loss는 0으로 취급.
+    """
+    close = _as_matrix(close)
+    delta = np.nan_to_num(close - _prev(close))
+    missing = np.isnan(close)
+    gain = np.where(missing, np.nan, np.maximum(delta, 0.0))
+    loss = np.where(missing, np.nan, np.maximum(-delta, 0.0))
+    avg_gain = _ewm(gain, 1.0 / period, min_periods=period)
+    avg_loss = _ewm(loss, 1.0 / period, min_periods=period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def macd(close, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> dict:
+    """
+    MACD (calculate_macd와 같은 식). 반환: {"macd", "signal", "hist"}
+    """
+    line = ema(close, fast_period) - ema(close, slow_period)
+    signal = ema(line, signal_period)
+    return {"macd": line, "signal": signal, "hist": line - signal}
+
+
+def bollinger(close, window: int = 20, num_std: float = 2.0) -> dict:
+    """
+    볼린저 밴드 (표준편차는 pandas rolling std와 같은 ddof=1). 반환: {"mid", "upper", "lower", "width"}
+    """
+    mid = sma(close, window)
+    std = _rolling(close, window, lambda w, axis: np.std(w, axis=axis, ddof=1))
+    upper = mid + num_std * std
+    lower = mid - num_std * std
+    with np.errstate(divide="ignore", invalid="ignore"):
+        width = (upper - lower) / mid
+    return {"mid": mid, "upper": upper, "lower": lower, "width": width}
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    ATR: True Range의 Wilder 평균 (RSI와 같은 ewm com=period-1). 각 행 첫 칸의 TR은 high-low.
+    """
+    high, low, close = _as_matrix(high), _as_matrix(low), _as_matrix(close)
+    prev_close = _prev(close)
+    prev_close = np.where(np.isnan(prev_close), close, prev_close)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return _ewm(tr, 1.0 / period, min_periods=period)
+
+
+def stochastic(high, low, close, k_period: int = 14, d_period: int = 3) -> dict:
+    """
+    스토캐스틱. %K = (종가 - 최저가) / (최고가 - 최저가) × 100, %D = %K의 SMA. 반환: {"k", "d"}
+    """
+    highest = _rolling(high, k_period, np.max)
+    lowest = _rolling(low, k_period, np.min)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = 100.0 * (_as_matrix(close) - lowest) / (highest - lowest)
+    return {"k": k, "d": sma(k, d_period)}
+
+
+def obv(close, volume) -> np.ndarray:
+    """
+    OBV: 종가 상승 캔들 거래량은 더하고 하락 캔들은 뺀 누적값 (각 행 첫 유효값 = 0).
+    """
+    close, volume = _as_matrix(close), _as_matrix(volume)
+    direction = np.nan_to_num(np.sign(close - _prev(close)))
+    flow = np.where(np.isnan(close) | np.isnan(volume), 0.0, direction * np.nan_to_num(volume))
+    out = np.cumsum(flow, axis=1)
+    return np.where(np.isnan(close), np.nan, out)
+
+
+def vwap(high, low, close, volume, window: int = None) -> np.ndarray:
+    """
+    VWAP: 대표가격((고+저+종)/3)의 거래량 가중 평균.
+    window=None이면 배열 시작부터 누적, 정수면 최근 window 캔들 롤링.
+    """
+    typical = (_as_matrix(high) + _as_matrix(low) + _as_matrix(close)) / 3.0
+    volume = _as_matrix(volume)
+    if window is None:
+        missing = np.isnan(typical) | np.isnan(volume)
+        pv = np.cumsum(np.where(missing, 0.0, typical * volume), axis=1)
+        vol = np.cumsum(np.where(missing, 0.0, volume), axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(missing, np.nan, pv / vol)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _rolling(typical * volume, window, np.sum) / _rolling(volume, window, np.sum)
+
+
+def compute_all(market: dict, sma_window: int = 20, rsi_period: int = 14, fast_period: int = 12,
+                slow_period: int = 26, signal_period: int = 9, bb_window: int = 20, bb_std: float = 2.0,
+                atr_period: int = 14, k_period: int = 14, d_period: int = 3, vwap_window: int = None) -> dict:
+    """
+    market(open/high/low/close/volume 행렬 dict)의 전체 지표를 한 번에 계산.
+    반환: {"sma", "rsi", "macd", "macd_signal", "macd_hist", "bb_mid", "bb_upper", "bb_lower",
+           "bb_width", "atr", "stoch_k", "stoch_d", "obv", "vwap"} (각 (심볼 수, 시간))
+    """
+    high, low, close, volume = market["high"], market["low"], market["close"], market["volume"]
+    out = {"sma": sma(close, sma_window), "rsi": rsi(close, rsi_period)}
+    m = macd(close, fast_period, slow_period, signal_period)
+    out.update({"macd": m["macd"], "macd_signal": m["signal"], "macd_hist": m["hist"]})
+    bb = bollinger(close, bb_window, bb_std)
+    out.update({"bb_mid": bb["mid"], "bb_upper": bb["upper"], "bb_lower": bb["lower"], "bb_width": bb["width"]})
+    out["atr"] = atr(high, low, close, atr_period)
+    st = stochastic(high, low, close, k_period, d_period)
+    out.update({"stoch_k": st["k"], "stoch_d": st["d"]})
+    out["obv"] = obv(close, volume)
+    out["vwap"] = vwap(high, low, close, volume, vwap_window)
+    return out
+
+
+def latest_snapshot(symbols, indicators: dict) -> pd.DataFrame:
+    """
+    지표 행렬들의 마지막 시점 값을 심볼별 DataFrame으로 (스캔 결과 정렬/필터용).
+    """
+    return pd.DataFrame({name: values[:, -1] for name, values in indicators.items()}, index=list(symbols))
+
+
+##########################
+# 마켓 행렬 불러오기     #
+##########################
+def fetch_market_matrix(symbols=None, quote: str = "KRW", timeframe: str = "5m", limit: int = 200,
+                        gateway=None, workers: int = 8) -> dict:
+    """
+    여러 심볼 OHLCV를 받아 공통 시간축으로 정렬한 행렬 dict로 반환.
+    symbols=None이면 거래소의 활성 {quote} 마켓 전체.
+    요청은 거래소 관문(exchange_gateway)의 candles 버킷 한도 안에서 workers개 스레드로 동시에 보냄.
+    반환: {"symbols", "timestamps"(datetime64), "open", "high", "low", "close", "volume"}
+    """
+    if gateway is None:
+        from modules.exchange_gateway import get_gateway
+        gateway = get_gateway()
+    if symbols is None:
+        markets = gateway.call("load_markets")
+        symbols = sorted(s for s, m in markets.items() if m.get("quote") == quote and m.get("active", True))
+
+    def _fetch(symbol):
+        try:
+            return symbol, gateway.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+        except Exception as e:
+            print(f"[WARN] {symbol} OHLCV 수신 실패: {e}")
+            return symbol, None
+
+    frames = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for symbol, ohlcv in pool.map(_fetch, symbols):
+            if ohlcv:
+                frames[symbol] = pd.DataFrame(
+                    ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]).set_index("timestamp")
+
+    if not frames:
+        return {"symbols": [], "timestamps": np.array([], dtype="datetime64[ms]"),
+                **{col: np.empty((0, 0)) for col in ("open", "high", "low", "close", "volume")}}
+    timestamps = np.unique(np.concatenate([f.index.to_numpy() for f in frames.values()]))
+    names = list(frames)
+    matrix = {"symbols": names, "timestamps": timestamps.astype("datetime64[ms]")}
+    for col in ("open", "high", "low", "close", "volume"):
+        matrix[col] = np.vstack([frames[s][col].reindex(timestamps).to_numpy(dtype=float) for s in names])
+    return matrix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="batched indicator scan")
+    parser.add_argument("--quote", default="KRW")
+    parser.add_argument("--timeframe", default="5m")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--sort", default="rsi", help="정렬 기준 지표")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    print("[START] indicators_batch.py main()")
+    started = time.perf_counter()
+    market = fetch_market_matrix(quote=args.quote, timeframe=args.timeframe, limit=args.limit)
+    fetched = time.perf_counter()
+    indicators = compute_all(market)
+    computed = time.perf_counter()
+    print(f"[INFO] {len(market['symbols'])}개 심볼 x {len(market['timestamps'])}캔들: "
+          f"수신 {fetched - started:.2f}s, 지표 계산 {(computed - fetched) * 1000:.1f}ms")
+    snapshot = latest_snapshot(market["symbols"], indicators).sort_values(args.sort)
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(snapshot.head(args.top))
+    print("[END] indicators_batch.py main()")
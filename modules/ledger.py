@@ -0,0 +1,349 @@
+# ledger.py
+"""
+Paper Trading 원장: 추가만 가능한(append-only) 타입별 이벤트 + 주기적 스냅샷.
+
+잔고/포지션/손익의 기준 데이터. trade_logs / decision_logs는 화면 표시용 기록으로 유지하고,
+상태 복원과 구간 재생(replay)은 이 원장으로 함.
+
+- ledger_events    : seq(INTEGER PRIMARY KEY) 순서로만 추가. UPDATE/DELETE는 트리거로 막음
+    type     : deposit(입금, 현금 또는 코인) | fill(체결) | fee(수수료) | decision(매매 판단)
+    qty      : 코인 수량 변화 (매수 +, 매도 -)
+    quote    : 현금 변화 (매수 체결 -, 매도 체결 +, 수수료 -, 입금 +)
+    price    : 체결가 / 판단 시점 가격 (코인 입금은 평가 기준가)
+- ledger_snapshots : snapshot_every 이벤트마다 그 seq까지 반영한 상태 1행
+- 특정 시점 상태 = 그 이전 마지막 스냅샷 + 그 뒤 이벤트만 재생 (기본키 구간 조회)
+"""
+import time
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+print("[LOG] ledger.py module is being imported...")
+
+import modules.db_utils as db_utils
+
+EVENT_TYPES = {"deposit": 1, "fill": 2, "fee": 3, "decision": 4}
+EVENT_NAMES = {code: name for name, code in EVENT_TYPES.items()}
+SNAPSHOT_FIELDS = ("cash", "position", "cost_basis", "realized_pnl", "fees", "deposits", "fills", "decisions")
+
+
+class LedgerState:
+    """
+    이벤트를 하나씩 반영해 만드는 원장 상태 (평균단가 기준 실현 손익).
+    - cost_basis   : 보유 코인의 취득 원가 합 (수수료 제외)
+    - realized_pnl : 매도 시 (체결 금액 - 평균단가 x 수량) 누적 (수수료 제외)
+    - fees         : 수수료 누적. 순손익 = realized_pnl + unrealized_pnl(price) - fees
+    """
+
+    def __init__(self, seq: int = 0, ts: float = None, **fields):
+        self.seq = seq
+        self.ts = ts
+        for name in SNAPSHOT_FIELDS:
+            setattr(self, name, fields.get(name, 0))
+        self.last_price = fields.get("last_price")
+        self.last_decision = fields.get("last_decision")
+
+    def apply(self, seq: int, ts: float, type_code: int, qty: float, quote: float, price: float, note: str = None):
+        if type_code == EVENT_TYPES["deposit"]:
+            self.cash += quote
+            self.deposits += quote
+            if qty:
+                self.position += qty
+                self.cost_basis += qty * (price or 0.0)  # 기준가를 모르면 원가 0으로 기록
+                self.deposits += qty * (price or 0.0)
+        elif type_code == EVENT_TYPES["fill"]:
+            if qty > 0:
+                self.cost_basis += -quote
+            elif self.position > 0:
+                avg_cost = self.cost_basis / self.position
+                sold = min(-qty, self.position)
+                self.realized_pnl += quote - avg_cost * sold
+                self.cost_basis -= avg_cost * sold
+            self.position += qty
+            self.cash += quote
+            self.fills += 1
+            if abs(self.position) < 1e-12:
+                self.position, self.cost_basis = 0.0, 0.0
+        elif type_code == EVENT_TYPES["fee"]:
+            self.cash += quote
+            self.fees += -quote
+        elif type_code == EVENT_TYPES["decision"]:
+            self.decisions += 1
+            self.last_decision = note
+        if price:
+            self.last_price = price
+        self.seq, self.ts = seq, ts
+
+    def unrealized_pnl(self, price: float = None) -> float:
+        price = self.last_price if price is None else price
+        return (self.position * price - self.cost_basis) if price else 0.0
+
+    def equity(self, price: float = None) -> float:
+        price = self.last_price if price is None else price
+        return self.cash + self.position * (price or 0.0)
+
+    def summary(self, price: float = None) -> dict:
+        out = {name: getattr(self, name) for name in SNAPSHOT_FIELDS}
+        unrealized = self.unrealized_pnl(price)
+        out.update({
+            "seq": self.seq,
+            "ts": self.ts,
+            "price": self.last_price if price is None else price,
+            "unrealized_pnl": unrealized,
+            "net_pnl": self.realized_pnl + unrealized - self.fees,
+            "equity": self.equity(price),
+        })
+        return out
+
+    def copy(self):
+        return LedgerState(self.seq, self.ts, last_price=self.last_price, last_decision=self.last_decision,
+                           **{name: getattr(self, name) for name in SNAPSHOT_FIELDS})
+
+
+def init_ledger_tables(conn):
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ledger_events (
+            seq INTEGER PRIMARY KEY,
+            ts REAL NOT NULL,
+            type INTEGER NOT NULL,
+            qty REAL NOT NULL DEFAULT 0,
+            quote REAL NOT NULL DEFAULT 0,
+            price REAL,
+            note TEXT
+        );
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ledger_events_ts ON ledger_events(ts)")
+    conn.executescript(
+        """
+        CREATE TRIGGER IF NOT EXISTS ledger_events_no_update BEFORE UPDATE ON ledger_events BEGIN
+            SELECT RAISE(ABORT, 'ledger_events is append-only');
+        END;
+        CREATE TRIGGER IF NOT EXISTS ledger_events_no_delete BEFORE DELETE ON ledger_events BEGIN
+            SELECT RAISE(ABORT, 'ledger_events is append-only');
+        END;
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ledger_snapshots (
+            seq INTEGER PRIMARY KEY,
+            ts REAL,
+            cash REAL,
+            position REAL,
+            cost_basis REAL,
+            realized_pnl REAL,
+            fees REAL,
+            deposits REAL,
+            fills INTEGER,
+            decisions INTEGER,
+            last_price REAL,
+            last_decision TEXT
+        );
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ledger_snapshots_ts ON ledger_snapshots(ts)")
+
+
+class Ledger:
+    """
+    원장 작성/조회. 생성 시 마지막 스냅샷 + 이후 이벤트로 현재 상태(state)를 만들고,
+    append할 때마다 state를 증분 갱신. snapshot_every 이벤트마다 스냅샷 저장.
+    """
+
+    def __init__(self, db_file: str = None, snapshot_every: int = 500):
+        self.db_file = db_file or db_utils.DB_FILE
+        self.snapshot_every = snapshot_every
+        self.conn = sqlite3.connect(self.db_file)
+        with self.conn:
+            init_ledger_tables(self.conn)
+        self.state = self.state_at()
+        self._last_snapshot_seq = self._snapshot_before(None)[0].seq
+
+    # ---- 쓰기 ----
+    def _write(self, fn):
+        """
+        main.run_tick()의 틱 트랜잭션 안이면 그 연결에서 실행(틱 로그/스냅샷과 함께 커밋),
+        밖이면 원장 연결로 바로 커밋.
+        """
+        conn = db_utils.active_tick_connection() if self.db_file == db_utils.DB_FILE else None
+        if conn is not None:
+            return fn(conn)
+        with self.conn:
+            return fn(self.conn)
+
+    def append_many(self, events: list) -> int:
+        """
+        events: [(type, qty, quote, price, note)] 를 한 트랜잭션으로 추가. 반환: 마지막 seq
+        """
+        now = time.time()
+        rows = [(now, EVENT_TYPES[t], float(qty), float(quote), price, note) for t, qty, quote, price, note in events]
+
+        def _insert(conn):
+            first = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM ledger_events").fetchone()[0] + 1
+            conn.executemany(
+                "INSERT INTO ledger_events (seq, ts, type, qty, quote, price, note) VALUES (?,?,?,?,?,?,?)",
+                [(first + i, *row) for i, row in enumerate(rows)]
+            )
+            return first
+
+        first = self._write(_insert)
+        for i, row in enumerate(rows):
+            self.state.apply(first + i, *row)
+        if self.state.seq - self._last_snapshot_seq >= self.snapshot_every:
+            self.save_snapshot()
+        return self.state.seq
+
+    def record_deposit(self, cash: float = 0.0, qty: float = 0.0, price: float = None, note: str = None) -> int:
+        return self.append_many([("deposit", qty, cash, price, note)])
+
+    def record_fill(self, side: str, base_qty: float, quote_amount: float, price: float, fee: float,
+                    note: str = None) -> int:
+        """
+        체결 1건 = fill + fee 이벤트. quote_amount는 수수료 제외 체결 금액(양수).
+        """
+        sign = 1.0 if side == "buy" else -1.0
+        events = [("fill", sign * base_qty, -sign * quote_amount, price, note)]
+        if fee:
+            events.append(("fee", 0.0, -fee, None, side))
+        return self.append_many(events)
+
+    def record_decision(self, decision: str, price: float, note: str = None) -> int:
+        return self.append_many([("decision", 0.0, 0.0, price, decision if note is None else f"{decision}: {note}")])
+
+    def save_snapshot(self):
+        s = self.state
+        self._write(lambda conn: conn.execute(
+            """
+            INSERT OR REPLACE INTO ledger_snapshots
+            (seq, ts, cash, position, cost_basis, realized_pnl, fees, deposits, fills, decisions,
+             last_price, last_decision)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
+            """,
+            (s.seq, s.ts, *(getattr(s, name) for name in SNAPSHOT_FIELDS), s.last_price, s.last_decision)
+        ))
+        self._last_snapshot_seq = s.seq
+
+    def reload(self):
+        """
+        DB에 커밋된 내용으로 메모리 상태를 다시 만듦 (틱 트랜잭션이 롤백됐을 때).
+        """
+        self.state = self.state_at()
+        self._last_snapshot_seq = self._snapshot_before(None)[0].seq
+
+    # ---- 읽기 ----
+    def _seq_at(self, ts: float) -> int:
+        """ts 이하 마지막 이벤트 seq (ts 인덱스 1회 조회)"""
+        row = self.conn.execute("SELECT MAX(seq) FROM ledger_events WHERE ts <= ?", (ts,)).fetchone()
+        return row[0] or 0
+
+    def _snapshot_before(self, seq: int = None):
+        """seq 이하 마지막 스냅샷 (없으면 빈 상태)"""
+        query = "SELECT seq, ts, " + ", ".join(SNAPSHOT_FIELDS) + ", last_price, last_decision FROM ledger_snapshots"
+        if seq is None:
+            row = self.conn.execute(query + " ORDER BY seq DESC LIMIT 1").fetchone()
+        else:
+            row = self.conn.execute(query + " WHERE seq <= ? ORDER BY seq DESC LIMIT 1", (seq,)).fetchone()
+        if row is None:
+            return LedgerState(), None
+        fields = dict(zip(SNAPSHOT_FIELDS, row[2:2 + len(SNAPSHOT_FIELDS)]))
+        return LedgerState(row[0], row[1], last_price=row[-2], last_decision=row[-1], **fields), row[0]
+
+    def _events(self, after_seq: int, until_seq: int = None):
+        query = "SELECT seq, ts, type, qty, quote, price, note FROM ledger_events WHERE seq > ?"
+        params = [after_seq]
+        if until_seq is not None:
+            query += " AND seq <= ?"
+            params.append(until_seq)
+        return self.conn.execute(query + " ORDER BY seq", params)
+
+    def state_at(self, seq: int = None, ts: float = None) -> LedgerState:
+        """
+        seq(또는 ts) 시점 상태 = 그 이전 마지막 스냅샷 + 사이 이벤트 재생. 둘 다 None이면 최신.
+        """
+        if ts is not None:
+            seq = self._seq_at(ts)
+        state, _ = self._snapshot_before(seq)
+        for event in self._events(state.seq, seq):
+            state.apply(*event)
+        return state
+
+    def replay(self, start_ts: float = None, end_ts: float = None, price_events_only: bool = False) -> pd.DataFrame:
+        """
+        [start_ts, end_ts] 구간 이벤트를 시작 시점 상태(스냅샷 고정)에서부터 재생해
+        이벤트별 상태 변화 DataFrame 반환 (seq, ts, type, cash, position, realized_pnl, fees, net_pnl, equity).
+        """
+        start_seq = self._seq_at(start_ts) if start_ts is not None else 0
+        end_seq = self._seq_at(end_ts) if end_ts is not None else None
+        state = self.state_at(seq=start_seq)
+        rows = []
+        for event in self._events(start_seq, end_seq):
+            state.apply(*event)
+            if price_events_only and not event[5]:
+                continue
+            summary = state.summary()
+            rows.append({
+                "seq": state.seq,
+                "timestamp": datetime.fromtimestamp(state.ts),
+                "type": EVENT_NAMES[event[2]],
+                "note": event[6],
+                **{k: summary[k] for k in ("cash", "position", "realized_pnl", "fees", "net_pnl", "equity")}
+            })
+        return pd.DataFrame(rows)
+
+    def is_empty(self) -> bool:
+        return self.state.seq == 0 and self.conn.execute("SELECT 1 FROM ledger_events LIMIT 1").fetchone() is None
+
+    def close(self):
+        self.conn.close()
+
+
+def local_timestamp(text: str) -> float:
+    """
+    'YYYY-MM-DD HH:MM:SS'(시간대 없음)를 로컬 시간으로 해석한 epoch 초 (ledger_events.ts와 같은 기준).
+    """
+    value = pd.Timestamp(text)
+    if value.tzinfo is not None:
+        return value.timestamp()
+    return value.to_pydatetime().timestamp()
+
+
+_ledger = None
+
+
+def get_ledger(snapshot_every: int = 500) -> Ledger:
+    """트레이더 공용 원장 (db_utils.DB_FILE, 프로세스당 1개)."""
+    global _ledger
+    if _ledger is None or _ledger.db_file != db_utils.DB_FILE:
+        _ledger = Ledger(db_utils.DB_FILE, snapshot_every=snapshot_every)
+    return _ledger
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="paper trading ledger")
+    parser.add_argument("--at", default=None, help="이 시각 상태 (YYYY-MM-DD HH:MM:SS, 로컬 시간)")
+    parser.add_argument("--replay", nargs=2, metavar=("START", "END"), default=None, help="구간 재생 (로컬 시간)")
+    parser.add_argument("--output", default=None, help="replay 결과 CSV 경로")
+    args = parser.parse_args()
+
+    print("[START] ledger.py main()")
+    ledger = Ledger()
+    if args.at:
+        state = ledger.state_at(ts=local_timestamp(args.at))
+    else:
+        state = ledger.state
+    print("[INFO] 원장 상태:", state.summary())
+    if args.replay:
+        started = time.perf_counter()
+        df = ledger.replay(local_timestamp(args.replay[0]), local_timestamp(args.replay[1]))
+        print(f"[INFO] replay {len(df)}개 이벤트 ({time.perf_counter() - started:.3f}s)")
+        print(df.tail(20))
+        if args.output:
+            df.to_csv(args.output, index=False)
+    ledger.close()
+    print("[END] ledger.py main()")
@@ -0,0 +1,40 @@
+# llm_client.py
+import os
+import threading
+from openai import OpenAI
+
+print("[LOG] llm_client.py module is being imported...")
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> OpenAI:
+    """
+    OpenAI 호환 클라이언트를 처음 사용할 때 생성 (import 시점에 만들지 않음).
+    - OPENAI_BASE_URL : 지정 시 해당 서버 사용 (예: 로컬 stand-in 서버 http://127.0.0.1:8089/v1)
+    - OPENAI_TIMEOUT  : 요청 타임아웃(초), OPENAI_MAX_RETRIES : SDK 재시도 횟수
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            base_url = os.environ.get("OPENAI_BASE_URL") or None
+            api_key = os.environ.get("OPENAI_API_KEY")
+            if not api_key and base_url:
+                api_key = "local-stub"  # 로컬 서버는 키를 검사하지 않음
+            _client = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=float(os.environ.get("OPENAI_TIMEOUT", "60")),
+                max_retries=int(os.environ.get("OPENAI_MAX_RETRIES", "2"))
+            )
+    return _client
+
+
+def reset_client():
+    """
+    환경변수(OPENAI_BASE_URL 등)를 바꾼 뒤 클라이언트를 다시 만들 때 사용.
+    """
+    global _client
+    with _client_lock:
+        _client = None
@@ -0,0 +1,224 @@
+# llm_stub_server.py
+"""
+OpenAI 호환 로컬 stand-in 서버 (벤치마크/부하 테스트용, 네트워크/비용 없음).
+
+실행:
+    python -m modules.llm_stub_server --port 8089 --latency-ms 800 --jitter-ms 300 \
+        --error-rate 0.02 --rate-limit-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 python main.py
+
+- POST /v1/chat/completions : 스키마에 맞는 응답 반환
+    * 프롬프트에 "sentiment_score"가 있으면 감성분석 JSON(sentiment_analysis 스키마)
+    * 그 외에는 요약 텍스트
+- GET  /v1/models           : 모델 목록
+- GET  /stats               : 요청 수/오류 수/최대 동시 처리 수 등 (벤치마크 측정용)
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+print("[LOG] llm_stub_server.py module is being imported...")
+
+DEFAULT_PORT = 8089
+
+
+class StubState:
+    """
+    서버 설정과 통계를 요청 스레드 간에 공유.
+    """
+
+    def __init__(self, latency_ms=500, jitter_ms=0, error_rate=0.0, rate_limit_rate=0.0,
+                 retry_after=1, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "ok": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0
+        }
+
+    def draw(self):
+        """
+        (지연 시간(초), 결과 유형) 추첨: "ok" | "error" | "rate_limited"
+        """
+        with self.lock:
+            latency = max(0.0, self.random.gauss(self.latency_ms, self.jitter_ms)) / 1000.0
+            r = self.random.random()
+            score = self.random.uniform(-1.0, 1.0)
+            confidence = self.random.randint(30, 95)
+        if r < self.rate_limit_rate:
+            return latency, "rate_limited", score, confidence
+        if r < self.rate_limit_rate + self.error_rate:
+            return latency, "error", score, confidence
+        return latency, "ok", score, confidence
+
+    def add(self, **deltas):
+        with self.lock:
+            for key, value in deltas.items():
+                self.stats[key] += value
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+def _estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def build_completion(body, score, confidence):
+    """
+    요청 메시지에 맞는 chat.completion 응답(dict) 생성.
+    """
+    messages = body.get("messages", [])
+    prompt = "\n".join(str(m.get("content", "")) for m in messages)
+
+    if "sentiment_score" in prompt:
+        recommendation = "buy" if score > 0.3 else ("sell" if score < -0.3 else "hold")
+        content = json.dumps({
+            "sentiment_score": round(score, 4),
+            "confidence": confidence,
+            "analysis_summary": "Stub analysis of the provided summary.",
+            "recommendation": recommendation
+        })
+    else:
+        content = ("Stub summary: crypto markets saw mixed news across the provided "
+                   "articles and posts, with discussion of price moves, regulation and adoption.")
+
+    prompt_tokens = _estimate_tokens(prompt)
+    completion_tokens = _estimate_tokens(content)
+    return {
+        "id": f"chatcmpl-stub-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub-model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
+
+
+def make_handler(state):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass  # 요청마다 로그를 찍지 않음 (부하 측정 왜곡 방지)
+
+        def _send_json(self, status, payload, headers=None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                self._send_json(200, state.snapshot())
+            elif self.path.rstrip("/").endswith("/models"):
+                self._send_json(200, {"object": "list", "data": [
+                    {"id": "gpt-3.5-turbo", "object": "model", "owned_by": "stub"},
+                    {"id": "gpt-4o-2024-08-06", "object": "model", "owned_by": "stub"}
+                ]})
+            else:
+                self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._send_json(400, {"error": {"message": "invalid JSON body", "type": "invalid_request_error"}})
+                return
+
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+                return
+
+            state.add(requests=1, in_flight=1)
+            try:
+                latency, outcome, score, confidence = state.draw()
+                time.sleep(latency)
+
+                if outcome == "rate_limited":
+                    state.add(rate_limited=1)
+                    self._send_json(
+                        429,
+                        {"error": {"message": "Rate limit reached (stub)", "type": "rate_limit_error",
+                                   "code": "rate_limit_exceeded"}},
+                        headers={"Retry-After": str(state.retry_after)}
+                    )
+                elif outcome == "error":
+                    state.add(errors=1)
+                    self._send_json(500, {"error": {"message": "Internal error (stub)", "type": "server_error"}})
+                else:
+                    completion = build_completion(body, score, confidence)
+                    state.add(ok=1,
+                              prompt_tokens=completion["usage"]["prompt_tokens"],
+                              completion_tokens=completion["usage"]["completion_tokens"])
+                    self._send_json(200, completion)
+            finally:
+                state.add(in_flight=-1)
+
+    return StubHandler
+
+
+def start_server(host="127.0.0.1", port=DEFAULT_PORT, **options):
+    """
+    백그라운드 스레드로 서버를 띄우고 (server, state)를 반환 (벤치마크 코드에서 사용).
+    port=0이면 빈 포트를 자동 할당 (server.server_address로 확인).
+    """
+    state = StubState(**options)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI-compatible local stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    state = StubState(args.latency_ms, args.jitter_ms, args.error_rate,
+                      args.rate_limit_rate, args.retry_after, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"[START] llm_stub_server listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("[END] llm_stub_server stats:", state.snapshot())
@@ -0,0 +1,138 @@
+# local_sentiment.py
+import re
+import json
+import numpy as np
+from typing import Dict, List, Tuple
+
+print("[LOG] local_sentiment.py module is being imported...")
+
+# 암호화폐 뉴스/커뮤니티용 감성 사전 (-3 ~ +3)
+CRYPTO_LEXICON = {
+    # 긍정
+    "bullish": 2.5, "bull": 1.5, "rally": 2.0, "rallies": 2.0, "surge": 2.0, "surges": 2.0,
+    "soar": 2.5, "soars": 2.5, "jump": 1.5, "jumps": 1.5, "gain": 1.5, "gains": 1.5,
+    "rise": 1.0, "rises": 1.0, "rising": 1.0, "climb": 1.0, "climbs": 1.0, "record": 1.0,
+    "ath": 2.5, "breakout": 2.0, "moon": 2.0, "mooning": 2.5, "pump": 1.0, "green": 1.0,
+    "adoption": 1.5, "approval": 2.0, "approved": 2.0, "approve": 1.5, "inflow": 1.5,
+    "inflows": 1.5, "accumulate": 1.5, "accumulation": 1.5, "buy": 1.0, "buying": 1.0,
+    "upgrade": 1.0, "partnership": 1.5, "launch": 0.5, "recovery": 1.5, "recover": 1.5,
+    "rebound": 1.5, "optimism": 2.0, "optimistic": 2.0, "strong": 1.0, "support": 0.5,
+    "hodl": 1.0, "institutional": 1.0, "halving": 1.0, "profit": 1.5, "profits": 1.5,
+    # 부정
+    "bearish": -2.5, "bear": -1.5, "crash": -3.0, "crashes": -3.0, "plunge": -2.5,
+    "plunges": -2.5, "dump": -2.0, "dumps": -2.0, "drop": -1.5, "drops": -1.5, "fall": -1.5,
+    "falls": -1.5, "falling": -1.5, "decline": -1.5, "declines": -1.5, "slump": -2.0,
+    "selloff": -2.5, "sell": -1.0, "selling": -1.0, "red": -1.0, "loss": -1.5, "losses": -1.5,
+    "hack": -3.0, "hacked": -3.0, "exploit": -2.5, "scam": -3.0, "fraud": -3.0, "rug": -2.5,
+    "lawsuit": -2.0, "sue": -2.0, "sues": -2.0, "ban": -2.5, "bans": -2.5, "banned": -2.5,
+    "crackdown": -2.5, "liquidation": -2.0, "liquidations": -2.0, "liquidated": -2.0,
+    "outflow": -1.5, "outflows": -1.5, "fear": -2.0, "panic": -2.5, "fud": -1.5,
+    "bankrupt": -3.0, "bankruptcy": -3.0, "insolvent": -3.0, "collapse": -3.0,
+    "warning": -1.0, "risk": -0.5, "risky": -1.0, "volatile": -0.5, "weak": -1.0,
+    "investigation": -1.5, "delay": -1.0, "delayed": -1.0, "reject": -2.0, "rejected": -2.0,
+}
+
+NEGATORS = {"not", "no", "never", "without", "isn't", "wasn't", "aren't", "don't",
+            "doesn't", "didn't", "won't", "can't", "cannot", "nor"}
+NEGATION_WINDOW = 3  # 부정어 뒤 몇 단어까지 극성을 뒤집을지
+NORMALIZATION_ALPHA = 15.0  # VADER 방식 정규화 상수: s / sqrt(s^2 + alpha)
+
+_TOKEN_PATTERN = re.compile(r"[a-z][a-z']*")
+
+
+def load_lexicon(path: str = None) -> Dict[str, float]:
+    """
+    기본 사전에 JSON 파일({단어: 가중치})의 항목을 덮어써서 반환.
+    """
+    lexicon = dict(CRYPTO_LEXICON)
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            lexicon.update({k.lower(): float(v) for k, v in json.load(f).items()})
+    return lexicon
+
+
+def score_texts(texts: List[str], lexicon: Dict[str, float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    여러 텍스트를 한 번에 채점 (토큰을 평탄화한 뒤 numpy로 item별 합산).
+    반환: (sentiment_score[-1~1], hit_count) 각 (n,) 배열
+    """
+    lexicon = CRYPTO_LEXICON if lexicon is None else lexicon
+    n = len(texts)
+    if n == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    tokens_per_item = [_TOKEN_PATTERN.findall((t or "").lower()) for t in texts]
+    lengths = np.fromiter((len(t) for t in tokens_per_item), dtype=np.int64, count=n)
+    flat = [tok for toks in tokens_per_item for tok in toks]
+    if not flat:
+        return np.zeros(n), np.zeros(n, dtype=np.int64)
+
+    item_idx = np.repeat(np.arange(n), lengths)
+    weights = np.fromiter((lexicon.get(tok, 0.0) for tok in flat), dtype=float, count=len(flat))
+    is_negator = np.fromiter((tok in NEGATORS for tok in flat), dtype=bool, count=len(flat))
+
+    # 같은 item 안에서 부정어 뒤 NEGATION_WINDOW 단어 이내면 극성 반전
+    flip = np.zeros(len(flat), dtype=bool)
+    for k in range(1, NEGATION_WINDOW + 1):
+        if k >= len(flat):
+            break
+        flip[k:] |= is_negator[:-k] & (item_idx[k:] == item_idx[:-k])
+    weights = np.where(flip, -0.75 * weights, weights)
+
+    raw = np.bincount(item_idx, weights=weights, minlength=n)
+    hits = np.bincount(item_idx, weights=(weights != 0), minlength=n).astype(np.int64)
+    scores = raw / np.sqrt(raw * raw + NORMALIZATION_ALPHA)
+    return scores, hits
+
+
+def score_items(items: List[Dict], lexicon: Dict[str, float] = None) -> List[Dict]:
+    """
+    수집된 item(title + text)별 로컬 감성 점수.
+    반환 형식은 sentiment_analysis 결과와 맞춤 (sentiment_score, confidence).
+    """
+    texts = [f"{item.get('title', '')} {item.get('text', '')}" for item in items]
+    scores, hits = score_texts(texts, lexicon)
+    return [
+        {
+            "sentiment_score": float(score),
+            "confidence": int(min(100, 20 * hit)),
+            "source": "local"
+        }
+        for score, hit in zip(scores, hits)
+    ]
+
+
+def score_collected(collected_data: dict, lexicon: Dict[str, float] = None) -> Tuple[float, float, int]:
+    """
+    data_collector.main() 결과 전체에 대한 로컬 감성 점수.
+    감성 단어가 포함된 item만 대상으로, 적중 수(hit)로 가중 평균.
+    반환: (평균 감성, 평균 확신도, 채점된 item 수). 대상이 없으면 (None, 0.0, 0)
+    """
+    items = []
+    for key in ("rss", "cryptopanic", "reddit"):
+        items.extend(collected_data.get(key, []))
+    if not items:
+        return None, 0.0, 0
+
+    texts = [f"{item.get('title', '')} {item.get('text', '')}" for item in items]
+    scores, hits = score_texts(texts, lexicon)
+    mask = hits > 0
+    if not mask.any():
+        return None, 0.0, 0
+
+    average = float(np.average(scores[mask], weights=hits[mask]))
+    confidence = float(np.minimum(100, 20 * hits[mask]).mean())
+    return average, confidence, int(mask.sum())
+
+
+if __name__ == "__main__":
+    print("[START] local_sentiment.py main()")
+    samples = [
+        "Bitcoin surges to record high as ETF inflows rise",
+        "Exchange hacked, users panic as prices crash",
+        "Analysts say BTC is not bearish despite the drop"
+    ]
+    scores, hits = score_texts(samples)
+    for text, score, hit in zip(samples, scores, hits):
+        print(f"[LOG] {score:+.3f} (hits={hit}) {text}")
+    print("[END] local_sentiment.py main()")
@@ -0,0 +1,319 @@
+# log_export.py
+import os
+import json
+import sqlite3
+import time
+import argparse
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 미설치 시 Parquet 경로 비활성화 (SQLite 경로만 사용)
+    pa = None
+
+from modules.db_utils import DB_FILE
+
+EXPORT_DIR = "data/export"
+WATERMARK_FILE = "_watermark.json"
+
+# 내보낼 테이블 목록 (metrics는 trade_logs에서 파생)
+EXPORT_TABLES = ["trade_logs", "decision_logs"]
+METRICS_TABLE = "metrics"
+
+_SQLITE_TO_ARROW = {
+    "INTEGER": "int64",
+    "REAL": "float64",
+    "TEXT": "string"
+}
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet export/read requires pyarrow (pip install pyarrow).")
+
+
+def _load_watermarks(export_dir):
+    path = os.path.join(export_dir, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_watermarks(export_dir, watermarks):
+    """
+    watermark 파일을 임시 파일 + os.replace로 원자적으로 교체.
+    """
+    path = os.path.join(export_dir, WATERMARK_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(watermarks, f)
+    os.replace(tmp_path, path)
+
+
+def load_watermark(table, export_dir=EXPORT_DIR) -> int:
+    """
+    해당 테이블에서 Parquet로 내보낸 마지막 id. 없으면 0.
+    """
+    return int(_load_watermarks(export_dir).get(table, 0))
+
+
+def _table_schema(conn, table):
+    """
+    SQLite 선언 타입을 기준으로 Arrow 스키마 생성.
+    """
+    cur = conn.execute(f"PRAGMA table_info({table})")
+    fields = []
+    for _, name, col_type, *_ in cur.fetchall():
+        base_type = (col_type or "TEXT").split()[0].upper()
+        fields.append(pa.field(name, _SQLITE_TO_ARROW.get(base_type, "string")))
+    return pa.schema(fields)
+
+
+def _metrics_schema():
+    return pa.schema([
+        pa.field("id", "int64"),
+        pa.field("timestamp", "string"),
+        pa.field("current_price", "float64"),
+        pa.field("equity", "float64"),
+        pa.field("coin_ratio", "float64"),
+        pa.field("fee", "float64")
+    ])
+
+
+def _with_date(table):
+    """
+    timestamp 앞 10자리(YYYY-MM-DD)를 date 파티션 컬럼으로 추가.
+    """
+    dates = pc.utf8_slice_codeunits(table["timestamp"], 0, 10)
+    return table.append_column("date", dates)
+
+
+def _build_metrics(batch):
+    """
+    trade_logs 배치에서 체결 시점별 자산 지표(metrics)를 계산.
+    """
+    price = batch["current_price"]
+    coin_value = pc.multiply(batch["position"], price)
+    equity = pc.add(batch["balance"], coin_value)
+    coin_ratio = pc.divide(coin_value, equity)
+    fee = batch["fee"] if "fee" in batch.column_names else pa.nulls(batch.num_rows, "float64")
+    return pa.table(
+        [batch["id"], batch["timestamp"], price, equity, coin_ratio, fee],
+        schema=_metrics_schema()
+    )
+
+
+def _write_partitioned(table, root, first_id, last_id):
+    pq.write_to_dataset(
+        _with_date(table),
+        root_path=root,
+        partition_cols=["date"],
+        basename_template=f"part-{first_id:012d}-{last_id:012d}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore"
+    )
+
+
+def export_table(table, export_dir=EXPORT_DIR, batch_size=100_000) -> int:
+    """
+    table의 id > watermark 인 행을 batch_size 단위로 읽어 날짜 파티션 Parquet로 추가.
+    trade_logs는 metrics 데이터셋도 함께 생성. 반환값: 내보낸 행 수.
+    decision_logs의 마지막 행은 hold 압축으로 아직 갱신될 수 있으므로 제외.
+    """
+    _require_pyarrow()
+    os.makedirs(export_dir, exist_ok=True)
+
+    watermarks = _load_watermarks(export_dir)
+    watermark = int(watermarks.get(table, 0))
+
+    conn = sqlite3.connect(f"file:{DB_FILE}?mode=ro", uri=True)
+    schema = _table_schema(conn, table)
+    columns = ", ".join(schema.names)
+
+    upper = None
+    if table == "decision_logs":
+        upper = conn.execute("SELECT MAX(id) FROM decision_logs").fetchone()[0]
+
+    exported = 0
+    while True:
+        query = f"SELECT {columns} FROM {table} WHERE id > ?"
+        params = [watermark]
+        if upper is not None:
+            query += " AND id < ?"
+            params.append(upper)
+        query += " ORDER BY id LIMIT ?"
+        params.append(batch_size)
+
+        rows = conn.execute(query, params).fetchall()
+        if not rows:
+            break
+
+        batch = pa.table(
+            {name: [row[i] for row in rows] for i, name in enumerate(schema.names)},
+            schema=schema
+        )
+        first_id, last_id = rows[0][0], rows[-1][0]
+        _write_partitioned(batch, os.path.join(export_dir, table), first_id, last_id)
+        if table == "trade_logs":
+            _write_partitioned(_build_metrics(batch), os.path.join(export_dir, METRICS_TABLE),
+                               first_id, last_id)
+
+        # 배치마다 watermark 갱신 -> 중간에 중단되어도 다음 실행에서 이어서 내보냄
+        watermark = last_id
+        watermarks[table] = watermark
+        if table == "trade_logs":
+            watermarks[METRICS_TABLE] = watermark
+        _save_watermarks(export_dir, watermarks)
+        exported += len(rows)
+
+    conn.close()
+    print(f"[LOG] export_table() -> {table}: {exported} rows exported (watermark={watermark})")
+    return exported
+
+
+def export_all(export_dir=EXPORT_DIR, batch_size=100_000) -> dict:
+    """
+    EXPORT_TABLES 전체를 증분 내보내기.
+    """
+    return {table: export_table(table, export_dir, batch_size) for table in EXPORT_TABLES}
+
+
+def open_dataset(root):
+    """
+    파티션 디렉터리를 하나의 데이터셋으로 연다.
+    나중에 컬럼이 추가된 경우를 위해 파일별 스키마를 합쳐 사용 (없는 컬럼은 null).
+    """
+    if not os.path.isdir(root):
+        return None
+    partitioning = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+    dataset = ds.dataset(root, format="parquet", partitioning=partitioning)
+    schema = pa.unify_schemas([pq.read_schema(f) for f in dataset.files] + [partitioning.schema])
+    return ds.dataset(root, schema=schema, format="parquet", partitioning=partitioning)
+
+
+def has_export(table, export_dir=EXPORT_DIR) -> bool:
+    return pa is not None and os.path.isdir(os.path.join(export_dir, table))
+
+
+def read_logs(table, columns=None, start=None, end=None, export_dir=EXPORT_DIR):
+    """
+    Parquet 데이터셋에서 필요한 컬럼만 읽어 DataFrame으로 반환 (live DB 미접근).
+    start/end("YYYY-MM-DD ..." 문자열)는 date 파티션 단위로 먼저 걸러냄.
+    """
+    _require_pyarrow()
+    dataset = open_dataset(os.path.join(export_dir, table))
+    if dataset is None:
+        return None
+
+    expr = None
+    if start is not None:
+        expr = ds.field("date") >= str(start)[:10]
+        expr = expr & (ds.field("timestamp") >= str(start))
+    if end is not None:
+        end_expr = (ds.field("date") <= str(end)[:10]) & (ds.field("timestamp") <= str(end))
+        expr = end_expr if expr is None else expr & end_expr
+
+    if columns is not None:
+        columns = [c for c in columns if c in dataset.schema.names]
+    return dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+
+def read_recent_logs(table, columns=None, limit=1000, export_dir=EXPORT_DIR):
+    """
+    최신 date 파티션부터 거꾸로 읽어 limit 건이 모이면 중단 (전체 스캔 없음).
+    """
+    _require_pyarrow()
+    root = os.path.join(export_dir, table)
+    if limit <= 0 or not os.path.isdir(root):
+        return None
+
+    partitions = sorted(
+        (d for d in os.listdir(root) if d.startswith("date=")),
+        reverse=True
+    )
+    frames = []
+    total = 0
+    for part in partitions:
+        part_ds = open_dataset(os.path.join(root, part))
+        cols = None if columns is None else [c for c in columns if c in part_ds.schema.names]
+        df = part_ds.to_table(columns=cols).to_pandas()
+        frames.append(df)
+        total += len(df)
+        if total >= limit:
+            break
+
+    if not frames:
+        return None
+
+    import pandas as pd
+    df = pd.concat(frames[::-1], ignore_index=True)
+    if "id" in df.columns:
+        df = df.sort_values("id")
+    return df.tail(limit).reset_index(drop=True)
+
+
+def _query_sqlite_recent(table, columns, limit, min_id=0, db_file=None):
+    import pandas as pd
+    conn = sqlite3.connect(db_file or DB_FILE)
+    try:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        cols = [c for c in columns if c in existing] if columns else ["*"]
+        query = f"""
+            SELECT {", ".join(cols)} FROM {table}
+            WHERE id > ?
+            ORDER BY id DESC
+            LIMIT {int(limit)}
+        """
+        return pd.read_sql_query(query, conn, params=(min_id,))
+    finally:
+        conn.close()
+
+
+def load_recent_logs(table, limit=1000, columns=None, db_file=None, export_dir=EXPORT_DIR):
+    """
+    대시보드용: 최근 limit 건을 DataFrame으로 반환 (streamlit 캐시 없이 호출 가능한 함수).
+    Parquet export가 있으면 필요한 컬럼만 Parquet에서 읽고,
+    export 이후 새로 쌓인 행(id > watermark)만 SQLite에서 읽어 합침.
+    """
+    import pandas as pd
+    if has_export(table, export_dir):
+        watermark = load_watermark(table, export_dir)
+        df_live = _query_sqlite_recent(table, columns, limit, min_id=watermark, db_file=db_file)
+        df_hist = read_recent_logs(table, columns, limit=max(limit - len(df_live), 0), export_dir=export_dir)
+        frames = [f for f in (df_hist, df_live) if f is not None and not f.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else df_live
+        df = df.sort_values("id").tail(limit)
+    else:
+        df = _query_sqlite_recent(table, columns, limit, db_file=db_file)
+
+    if "timestamp" in df.columns:
+        df["timestamp"] = pd.to_datetime(df["timestamp"])
+    if "end_timestamp" in df.columns:
+        df["end_timestamp"] = pd.to_datetime(df["end_timestamp"]).fillna(df["timestamp"])
+    if "hold_count" in df.columns:
+        df["hold_count"] = df["hold_count"].fillna(1).astype(int)
+    return df.sort_values("timestamp").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="trade/decision logs -> partitioned Parquet export")
+    parser.add_argument("--export-dir", default=EXPORT_DIR)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--interval", type=int, default=0,
+                        help="0이면 1회 실행, 양수면 해당 초 간격으로 반복 실행")
+    args = parser.parse_args()
+
+    print("[START] log_export.py main()")
+    while True:
+        result = export_all(args.export_dir, args.batch_size)
+        print("[LOG] exported:", result)
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+    print("[END] log_export.py main()")
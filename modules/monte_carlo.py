@@ -0,0 +1,226 @@
+# monte_carlo.py
+"""
+리밸런싱 전략(main.py adjust_target_ratio_with_signals + paper_trade_rebalance)의 몬테카를로 강건성 테스트.
+
+1) 과거 캔들 수익률을 블록 부트스트랩으로 재표본해 (경로 수, 길이) 2차원 가격 경로 생성
+   (블록 단위로 뽑아 변동성 군집/자기상관을 어느 정도 유지)
+2) 경로마다 수수료 / 슬리피지 / 신호 지연(캔들 수)을 무작위로 흔듦
+3) 시간 축만 루프를 돌고 모든 경로는 한 번에 벡터 연산 (RSI 갱신 -> 목표 비중 -> 리밸런싱)
+4) 최종 수익률 / 최대 낙폭 분포(분위수, 손실 확률, CVaR)를 과거 실제 경로 결과와 함께 반환
+
+실행:
+    python -m modules.monte_carlo --limit 2000 --paths 2000
+    python -m modules.monte_carlo --synthetic 3000 --base-ratio 0.6 --sentiment 0.0
+"""
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+print("[LOG] monte_carlo.py module is being imported...")
+
+import config.config as config
+from modules.shadow_strategies import DEFAULT_PARAMS
+
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def block_bootstrap(returns: np.ndarray, n_paths: int, length: int, block_size: int,
+                    rng: np.random.Generator) -> np.ndarray:
+    """
+    원형(circular) 블록 부트스트랩. 반환: (n_paths, length) 재표본 수익률.
+    블록 시작점만 난수로 뽑고 블록 내부 인덱스는 브로드캐스팅으로 만듦.
+    """
+    returns = np.asarray(returns, dtype=float)
+    n = len(returns)
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-length // block_size)
+    starts = rng.integers(0, n, size=(n_paths, n_blocks, 1))
+    idx = (starts + np.arange(block_size)) % n
+    return returns[idx.reshape(n_paths, -1)[:, :length]]
+
+
+def simulate_rebalancing(prices: np.ndarray, fee=None, slippage=0.0, lag=0, sentiment=0.0,
+                         base_ratio: float = None, rebalance_threshold: float = None,
+                         initial_balance: float = None, rsi_period: int = 14, params: dict = None) -> dict:
+    """
+    (경로 수, T) 가격 경로에 리밸런싱 전략을 동시에 실행.
+    fee / slippage / lag / sentiment는 스칼라 또는 경로별 (경로 수,) 배열.
+    - RSI: trading_utils.calculate_rsi와 같은 ewm(com=period-1, adjust=True)을 점화식으로 갱신
+    - lag: t 시점에 t-lag 시점의 목표 비중을 사용 (신호 지연)
+    - 비용: 거래 금액 × (fee + slippage)
+
+    반환 dict (각 (경로 수,)): final_return, max_drawdown, trades, fees_paid
+    """
+    prices = np.atleast_2d(np.asarray(prices, dtype=float))
+    n_paths, n_steps = prices.shape
+    p = dict(DEFAULT_PARAMS, **(params or {}))
+    base_ratio = config.TARGET_BTC_RATIO if base_ratio is None else base_ratio
+    threshold = config.REBALANCE_THRESHOLD if rebalance_threshold is None else rebalance_threshold
+    initial_balance = config.balance if initial_balance is None else initial_balance
+    fee = config.CURRENT_FEE if fee is None else fee
+    cost_rate = np.broadcast_to(np.asarray(fee, dtype=float) + slippage, (n_paths,))
+    lag = np.broadcast_to(np.asarray(lag, dtype=int), (n_paths,))
+    sentiment = np.broadcast_to(np.asarray(sentiment, dtype=float), (n_paths,))
+    rows = np.arange(n_paths)
+
+    # 감성은 경로 내 상수라 비중 가감분을 미리 계산
+    sentiment_adj = np.where(sentiment > p["sentiment_high"], p["sentiment_step"], 0.0) \
+        - np.where(sentiment < p["sentiment_low"], p["sentiment_step"], 0.0)
+
+    # 목표 비중 이력 (지연 적용용 원형 버퍼). RSI 워밍업 전에는 base_ratio 그대로
+    history = int(lag.max()) + 1
+    targets = np.full((history, n_paths), np.clip(base_ratio + sentiment_adj, 0.0, 1.0))
+
+    decay = 1.0 - 1.0 / rsi_period
+    gain_num = np.zeros(n_paths)
+    loss_num = np.zeros(n_paths)
+
+    cash = np.full(n_paths, float(initial_balance))
+    base = np.zeros(n_paths)
+    peak = cash.copy()
+    max_dd = np.zeros(n_paths)
+    trades = np.zeros(n_paths, dtype=int)
+    fees_paid = np.zeros(n_paths)
+
+    for t in range(n_steps):
+        price = prices[:, t]
+        if t > 0:
+            delta = price - prices[:, t - 1]
+            gain_num = np.maximum(delta, 0.0) + decay * gain_num
+            loss_num = np.maximum(-delta, 0.0) + decay * loss_num
+            if t >= rsi_period - 1:
+                # ewm 평균의 분모(가중치 합)는 gain/loss 공통이라 비율에서 약분됨
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    rsi = 100.0 - 100.0 / (1.0 + gain_num / loss_num)
+                ratio = base_ratio + sentiment_adj \
+                    + np.where(rsi < p["rsi_low"], p["rsi_step"], 0.0) \
+                    - np.where(rsi > p["rsi_high"], p["rsi_step"], 0.0)
+                targets[t % history] = np.clip(ratio, 0.0, 1.0)
+        target = targets[(t - lag) % history, rows] if history > 1 else targets[t % history]
+
+        value = cash + base * price
+        diff = target * value - base * price
+        trade = np.abs(diff) >= threshold
+        # 매수는 비용 포함 현금 한도 내로 제한
+        diff = np.where(diff > 0, np.minimum(diff, cash / (1.0 + cost_rate)), diff)
+        cost = np.where(trade, np.abs(diff) * cost_rate, 0.0)
+        diff = np.where(trade, diff, 0.0)
+        base += diff / price
+        cash -= diff + cost
+        fees_paid += cost
+        trades += trade
+
+        value = cash + base * price
+        np.maximum(peak, value, out=peak)
+        np.minimum(max_dd, value / peak - 1.0, out=max_dd)
+
+    return {
+        "final_return": (cash + base * prices[:, -1]) / initial_balance - 1.0,
+        "max_drawdown": max_dd,
+        "trades": trades,
+        "fees_paid": fees_paid
+    }
+
+
+def run_monte_carlo(close, n_paths: int = 2000, length: int = None, block_size: int = 48,
+                    fee_jitter: float = 0.2, slippage_bps=(0.0, 5.0), max_lag: int = 2,
+                    sentiment=0.0, seed: int = None, **strategy_kwargs) -> dict:
+    """
+    과거 종가(close)로 몬테카를로 실행. 반환 dict:
+    - historical : 과거 실제 경로 1개 결과 (흔들지 않음)
+    - paths      : 경로별 결과 DataFrame (fee, slippage, lag, final_return, max_drawdown, trades, fees_paid)
+    - summary    : 분위수 / 손실 확률 / CVaR 5% 등
+    sentiment는 스칼라이거나 (low, high) 범위(경로별 균등 분포).
+    """
+    started = time.perf_counter()
+    close = np.asarray(close, dtype=float)
+    returns = close[1:] / close[:-1] - 1.0
+    length = length or len(returns)
+    rng = np.random.default_rng(seed)
+
+    sampled = block_bootstrap(returns, n_paths, length, block_size, rng)
+    prices = close[0] * np.cumprod(np.concatenate([np.ones((n_paths, 1)), 1.0 + sampled], axis=1), axis=1)
+
+    base_fee = strategy_kwargs.pop("fee", None)
+    base_fee = config.CURRENT_FEE if base_fee is None else base_fee
+    fee = base_fee * rng.uniform(1.0 - fee_jitter, 1.0 + fee_jitter, n_paths)
+    slippage = rng.uniform(slippage_bps[0], slippage_bps[1], n_paths) / 10_000.0
+    lag = rng.integers(0, max_lag + 1, n_paths)
+    if isinstance(sentiment, (tuple, list)):
+        sentiment = rng.uniform(sentiment[0], sentiment[1], n_paths)
+
+    simulated = simulate_rebalancing(prices, fee=fee, slippage=slippage, lag=lag, sentiment=sentiment,
+                                     **strategy_kwargs)
+    historical = simulate_rebalancing(close, fee=base_fee, sentiment=float(np.mean(sentiment)),
+                                      **strategy_kwargs)
+
+    paths = pd.DataFrame({"fee": fee, "slippage": slippage, "lag": lag, **simulated})
+    final = paths["final_return"].to_numpy()
+    tail = np.sort(final)[:max(1, int(n_paths * 0.05))]
+    summary = {
+        "paths": n_paths,
+        "length": length,
+        "block_size": block_size,
+        "historical_return": float(historical["final_return"][0]),
+        "historical_max_drawdown": float(historical["max_drawdown"][0]),
+        "return_quantiles": {q: float(v) for q, v in zip(QUANTILES, np.quantile(final, QUANTILES))},
+        "drawdown_quantiles": {q: float(v) for q, v in
+                               zip(QUANTILES, np.quantile(paths["max_drawdown"], QUANTILES))},
+        "prob_loss": float((final < 0).mean()),
+        "cvar_5": float(tail.mean()),
+        "mean_trades": float(paths["trades"].mean()),
+        "elapsed_s": round(time.perf_counter() - started, 3)
+    }
+    return {"historical": historical, "paths": paths, "summary": summary}
+
+
+def _print_summary(summary: dict):
+    print(f"[INFO] paths={summary['paths']} length={summary['length']} block={summary['block_size']} "
+          f"({summary['elapsed_s']}s)")
+    print(f"[INFO] 과거 경로: 수익률={summary['historical_return']:.2%}, "
+          f"최대낙폭={summary['historical_max_drawdown']:.2%}")
+    print(f"{'quantile':>9} {'return':>10} {'max_dd':>10}")
+    for q in QUANTILES:
+        print(f"{q:>9.2f} {summary['return_quantiles'][q]:>10.2%} {summary['drawdown_quantiles'][q]:>10.2%}")
+    print(f"[INFO] 손실 확률={summary['prob_loss']:.2%}, CVaR 5%={summary['cvar_5']:.2%}, "
+          f"평균 거래 수={summary['mean_trades']:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo robustness test for the rebalancing strategy")
+    parser.add_argument("--symbol", default=config.SYMBOL)
+    parser.add_argument("--timeframe", default=config.TIMEFRAME)
+    parser.add_argument("--limit", type=int, default=2000)
+    parser.add_argument("--synthetic", type=int, default=0, help="거래소 대신 합성 가격 n개 사용")
+    parser.add_argument("--paths", type=int, default=config.MC_PATHS)
+    parser.add_argument("--length", type=int, default=None, help="경로 길이 (기본: 과거 데이터 길이)")
+    parser.add_argument("--block-size", type=int, default=config.MC_BLOCK_SIZE)
+    parser.add_argument("--fee-jitter", type=float, default=config.MC_FEE_JITTER)
+    parser.add_argument("--max-slippage-bps", type=float, default=config.MC_MAX_SLIPPAGE_BPS)
+    parser.add_argument("--max-lag", type=int, default=config.MC_MAX_SIGNAL_LAG)
+    parser.add_argument("--base-ratio", type=float, default=None)
+    parser.add_argument("--sentiment", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="경로별 결과 CSV 경로")
+    args = parser.parse_args()
+
+    print("[START] monte_carlo.py main()")
+    if args.synthetic:
+        rng = np.random.default_rng(args.seed)
+        close = 1e8 * np.exp(np.cumsum(rng.normal(0, 0.003, args.synthetic)))
+    else:
+        from modules.trading_utils import fetch_ohlc_data
+        close = fetch_ohlc_data(args.symbol, timeframe=args.timeframe, limit=args.limit)["close"].to_numpy()
+
+    result = run_monte_carlo(
+        close, n_paths=args.paths, length=args.length, block_size=args.block_size,
+        fee_jitter=args.fee_jitter, slippage_bps=(0.0, args.max_slippage_bps), max_lag=args.max_lag,
+        sentiment=args.sentiment, seed=args.seed, base_ratio=args.base_ratio
+    )
+    _print_summary(result["summary"])
+    if args.output:
+        result["paths"].to_csv(args.output, index=False)
+        print(f"[LOG] paths saved: {args.output}")
+    print("[END] monte_carlo.py main()")
@@ -0,0 +1,249 @@
+# news_sources.py
+import os
+import time
+import asyncio
+from abc import ABC, abstractmethod
+
+print("[LOG] news_sources.py module is being imported...")
+
+import config.config as config
+from modules.data_collector import get_rss_feed, get_cryptopanic_news, collect_reddit_data
+from modules.news_store import init_news_db, load_source_states, save_source_state, normalize_published
+
+
+class RateLimiter:
+    """
+    분당 최대 요청 수(rate_per_minute)를 넘지 않도록 요청 간 최소 간격을 유지.
+    """
+
+    def __init__(self, rate_per_minute=None):
+        self.min_interval = 60.0 / rate_per_minute if rate_per_minute else 0.0
+        self._next_allowed = 0.0
+
+    def _reserve(self) -> float:
+        now = time.monotonic()
+        wait = max(0.0, self._next_allowed - now)
+        self._next_allowed = max(now, self._next_allowed) + self.min_interval
+        return wait
+
+    def wait(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def async_wait(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+###########################
+# 소스 플러그인 레지스트리 #
+###########################
+SOURCE_TYPES = {}
+
+
+def register_source(type_name):
+    """
+    뉴스 소스 플러그인 등록 데코레이터. config.NEWS_SOURCES의 "type" 값으로 찾음.
+    """
+    def decorator(cls):
+        SOURCE_TYPES[type_name] = cls
+        return cls
+    return decorator
+
+
+class NewsSource(ABC):
+    """
+    뉴스 소스 플러그인 기본 클래스 (추상 클래스: 구현이 빠진 소스는 생성 시점에 TypeError).
+    - bucket     : 결과를 담을 키 ("rss" / "cryptopanic" / "reddit")
+    - interval   : 수집 주기 (초)
+    - rate_limit : 분당 최대 요청 수
+    - cursor     : 마지막으로 본 item 위치 (소스별 형식, JSON 직렬화 가능)
+    하위 클래스는 fetch(cursor) -> (items, new_cursor) 를 구현.
+    비동기 소스는 AsyncNewsSource를 상속해 async_fetch(cursor)를 구현.
+    """
+    bucket = None
+    is_async = False
+
+    def __init__(self, name, interval=300, rate_limit=None, **options):
+        self.name = name
+        self.interval = interval
+        self.limiter = RateLimiter(rate_limit)
+        self.options = options
+        self.last_polled = None
+        self.cursor = None
+
+    def is_due(self, now) -> bool:
+        return self.last_polled is None or now - self.last_polled >= self.interval
+
+    @abstractmethod
+    def fetch(self, cursor):
+        ...
+
+
+class AsyncNewsSource(NewsSource):
+    """
+    비동기 뉴스 소스 기본 클래스. poll_sources()가 다른 비동기 소스와 함께 gather로 실행.
+    fetch()는 단독 호출용 동기 래퍼.
+    """
+    is_async = True
+
+    @abstractmethod
+    async def async_fetch(self, cursor):
+        ...
+
+    def fetch(self, cursor):
+        return asyncio.run(self.async_fetch(cursor))
+
+
+def _filter_after(items, cursor, time_key):
+    """
+    time_key 시각이 cursor 이후인 item만 남기고, 새 cursor(가장 최근 시각)를 반환.
+    시각을 해석할 수 없는 item은 content_hash 중복 제거에 맡기고 그대로 통과.
+    """
+    fresh = []
+    latest = cursor
+    for item in items:
+        published = normalize_published(item.get(time_key))
+        if published is not None:
+            if cursor is not None and published <= cursor:
+                continue
+            if latest is None or published > latest:
+                latest = published
+        fresh.append(item)
+    return fresh, latest
+
+
+@register_source("rss")
+class RSSSource(NewsSource):
+    bucket = "rss"
+
+    def fetch(self, cursor):
+        self.limiter.wait()
+        # 수집 주기는 스케줄러가 관리하므로 HTTP 캐시 TTL 없이 조건부 GET만 사용
+        items = get_rss_feed(self.options["url"], ttl=0)
+        return _filter_after(items, cursor, "timestamp")
+
+
+@register_source("cryptopanic")
+class CryptoPanicSource(NewsSource):
+    bucket = "cryptopanic"
+
+    def fetch(self, cursor):
+        api_key = os.getenv("CRYPTOPANIC_API_KEY", "")
+        if not api_key:
+            print("[INFO] CryptoPanic API Key가 설정되지 않았습니다. (데이터 수집 스킵)")
+            return [], cursor
+        self.limiter.wait()
+        items = get_cryptopanic_news(
+            api_key,
+            self.options.get("kind", "news"),
+            self.options.get("currencies", "BTC,ETH"),
+            ttl=0
+        )
+        return _filter_after(items, cursor, "timestamp")
+
+
+@register_source("reddit")
+class RedditSource(AsyncNewsSource):
+    bucket = "reddit"
+
+    async def async_fetch(self, cursor):
+        # cursor: {서브레딧: 마지막 created_utc}
+        cursor = dict(cursor or {})
+        items = await collect_reddit_data(
+            subreddits=self.options.get("subreddits"),
+            limit=self.options.get("limit", 25),
+            listing=self.options.get("listing", "new"),
+            cursors=cursor,
+            rate_limiter=self.limiter
+        )
+        for item in items:
+            sub = item["subreddit"]
+            cursor[sub] = max(cursor.get(sub, 0), item["created_utc"])
+        return items, cursor
+
+
+def build_sources(specs=None) -> list:
+    """
+    설정(dict 목록)으로부터 소스 객체 생성 후 저장된 커서/마지막 수집 시각을 복원.
+    """
+    specs = config.NEWS_SOURCES if specs is None else specs
+    states = load_source_states()
+
+    sources = []
+    for spec in specs:
+        spec = dict(spec)
+        type_name = spec.pop("type")
+        if type_name not in SOURCE_TYPES:
+            print(f"[WARN] 알 수 없는 소스 타입: {type_name} (skip)")
+            continue
+        source = SOURCE_TYPES[type_name](**spec)
+        state = states.get(source.name)
+        if state is not None:
+            source.last_polled = state["last_polled"]
+            source.cursor = state["cursor"]
+        sources.append(source)
+    return sources
+
+
+def poll_sources(sources, force=False, now=None):
+    """
+    수집 주기가 된 소스만 호출해 새 item을 bucket별로 모아 반환.
+    반환: (collected, updates). updates = [(source, new_cursor)]
+    커서/수집 시각은 여기서 저장하지 않음: 호출하는 쪽이 item을 저장(news_store)한 뒤
+    commit_source_states(updates, now)로 반영해야, 그 사이 실패해도 item을 잃지 않음.
+    """
+    now = time.time() if now is None else now
+    collected = {"rss": [], "cryptopanic": [], "reddit": []}
+    updates = []
+
+    due = [s for s in sources if force or s.is_due(now)]
+    if not due:
+        print("[INFO] 수집 주기가 된 소스 없음")
+        return collected, updates
+
+    def _done(source, items, cursor):
+        updates.append((source, cursor))
+        collected.setdefault(source.bucket, []).extend(items)
+        print(f"[INFO] source={source.name}: 신규 후보 {len(items)}건")
+
+    for source in due:
+        if source.is_async:
+            continue
+        try:
+            items, cursor = source.fetch(source.cursor)
+            _done(source, items, cursor)
+        except Exception as e:
+            print(f"[ERROR] source={source.name} 수집 중 오류: {e}")
+
+    async_sources = [s for s in due if s.is_async]
+    if async_sources:
+        async def _run_async():
+            return await asyncio.gather(
+                *(s.async_fetch(s.cursor) for s in async_sources),
+                return_exceptions=True
+            )
+
+        for source, result in zip(async_sources, asyncio.run(_run_async())):
+            if isinstance(result, Exception):
+                print(f"[ERROR] source={source.name} 수집 중 오류: {result}")
+                continue
+            _done(source, *result)
+
+    return collected, updates
+
+
+def commit_source_states(updates, now=None):
+    """
+    poll_sources()의 커서/수집 시각을 소스 객체와 news_store.source_state에 반영.
+    """
+    now = time.time() if now is None else now
+    if not updates:
+        return
+    init_news_db()
+    for source, cursor in updates:
+        source.cursor = cursor
+        source.last_polled = now
+        save_source_state(source.name, now, cursor)
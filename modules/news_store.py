@@ -0,0 +1,374 @@
+# news_store.py
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+NEWS_DB_FILE = "data/news_store.db"
+
+NEWS_DB_DIR = os.path.dirname(NEWS_DB_FILE)
+if not os.path.exists(NEWS_DB_DIR):
+    os.makedirs(NEWS_DB_DIR)
+
+
+def _connect():
+    conn = sqlite3.connect(NEWS_DB_FILE)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def init_news_db():
+    """
+    news_items 테이블과 FTS5 전문 검색 인덱스(news_fts), 동기화 트리거 생성.
+    """
+    conn = _connect()
+    cur = conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS news_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_hash TEXT UNIQUE,
+            source TEXT,
+            title TEXT,
+            url TEXT,
+            published_at TEXT,
+            text TEXT,
+            first_seen TEXT,
+            last_seen TEXT,
+            seen_count INTEGER DEFAULT 1
+        );
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_news_items_published ON news_items(published_at)")
+
+    # 소스별 마지막 수집 시각 / 증분 커서
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS source_state (
+            name TEXT PRIMARY KEY,
+            last_polled REAL,
+            cursor TEXT
+        );
+        """
+    )
+
+    # LLM 감성 갱신 대기열 (버킷=소스 키별, 갱신에 사용된 item만 삭제)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS llm_pending (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_key TEXT UNIQUE,
+            bucket TEXT,
+            added_ts REAL,
+            item TEXT
+        );
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_llm_pending_bucket ON llm_pending(bucket, id)")
+
+    # 외부 콘텐츠(content=) 방식: 본문은 news_items에만 저장하고 인덱스만 유지
+    cur.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+            title, text,
+            content='news_items', content_rowid='id',
+            tokenize='unicode61'
+        );
+        """
+    )
+    cur.executescript(
+        """
+        CREATE TRIGGER IF NOT EXISTS news_items_ai AFTER INSERT ON news_items BEGIN
+            INSERT INTO news_fts(rowid, title, text) VALUES (new.id, new.title, new.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS news_items_ad AFTER DELETE ON news_items BEGIN
+            INSERT INTO news_fts(news_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS news_items_au AFTER UPDATE OF title, text ON news_items BEGIN
+            INSERT INTO news_fts(news_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+            INSERT INTO news_fts(rowid, title, text) VALUES (new.id, new.title, new.text);
+        END;
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+def content_hash(title: str, text: str) -> str:
+    """
+    정제된 제목+본문 기준 콘텐츠 해시 (대소문자/공백 차이 무시).
+    """
+    normalized = " ".join(f"{title}\n{text}".lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def normalize_published(value) -> str:
+    """
+    RSS(RFC 822) / CryptoPanic(ISO 8601) / Reddit(epoch) 시각을 UTC 'YYYY-MM-DD HH:MM:SS'로 통일.
+    해석할 수 없으면 None.
+    """
+    if value in (None, ""):
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            dt = datetime.fromtimestamp(value, tz=timezone.utc)
+        else:
+            try:
+                dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+            except ValueError:
+                dt = parsedate_to_datetime(str(value))
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def to_record(item: dict) -> dict:
+    """
+    data_collector의 소스별 item(dict)을 news_items 레코드 형태로 변환.
+    """
+    source = item.get("source")
+    if not source and "subreddit" in item:
+        source = f"reddit/{item['subreddit']}"
+    title = item.get("title", "")
+    text = item.get("text") or item.get("summary") or title
+    return {
+        "content_hash": item.get("content_hash") or content_hash(title, text),
+        "source": source or "unknown",
+        "title": title,
+        "url": item.get("link") or item.get("url"),
+        "published_at": normalize_published(item.get("timestamp") or item.get("created_utc")),
+        "text": text
+    }
+
+
+def upsert_items(items: list) -> list:
+    """
+    수집된 item들을 content_hash 기준으로 upsert하고, 처음 본 item만 반환.
+    (이미 저장된 item은 last_seen / seen_count만 갱신)
+    반환되는 item에는 content_hash 키가 추가됨.
+    """
+    if not items:
+        return []
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    records = []
+    for item in items:
+        record = to_record(item)
+        item["content_hash"] = record["content_hash"]
+        records.append(record)
+
+    conn = _connect()
+    try:
+        with conn:
+            hashes = list({r["content_hash"] for r in records})
+            existing = set()
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for i in range(0, len(hashes), 500):
+                part = hashes[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT content_hash FROM news_items WHERE content_hash IN ({','.join('?' * len(part))})",
+                    part
+                ).fetchall()
+                existing.update(row[0] for row in rows)
+
+            conn.executemany(
+                """
+                INSERT INTO news_items
+                (content_hash, source, title, url, published_at, text, first_seen, last_seen, seen_count)
+                VALUES (:content_hash, :source, :title, :url, :published_at, :text, :now, :now, 1)
+                ON CONFLICT(content_hash) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    seen_count = seen_count + 1
+                """,
+                [dict(r, now=now) for r in records]
+            )
+    finally:
+        conn.close()
+
+    new_items = []
+    seen = set(existing)
+    for item, record in zip(items, records):
+        if record["content_hash"] not in seen:
+            seen.add(record["content_hash"])
+            new_items.append(item)
+    return new_items
+
+
+def load_source_states() -> dict:
+    """
+    source_state 전체를 {name: {"last_polled": float, "cursor": 객체}} 형태로 반환.
+    """
+    if not os.path.exists(NEWS_DB_FILE):
+        return {}
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT name, last_polled, cursor FROM source_state").fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    conn.close()
+    return {
+        row["name"]: {
+            "last_polled": row["last_polled"],
+            "cursor": json.loads(row["cursor"]) if row["cursor"] else None
+        }
+        for row in rows
+    }
+
+
+def save_source_state(name: str, last_polled: float, cursor):
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO source_state (name, last_polled, cursor) VALUES (?,?,?)",
+                (name, last_polled, json.dumps(cursor) if cursor is not None else None)
+            )
+    finally:
+        conn.close()
+
+
+def enqueue_pending(items_by_bucket: dict, max_per_bucket: int = None, now: float = None) -> int:
+    """
+    LLM 갱신 대기열에 item 추가 ({버킷: [item]}). 같은 item(content_hash)은 한 번만 들어감.
+    max_per_bucket이 있으면 버킷별로 오래된 것부터 버림. 반환: 새로 추가된 item 수
+    """
+    now = time.time() if now is None else now
+    rows = []
+    for bucket, items in items_by_bucket.items():
+        for item in items or []:
+            item = {k: v for k, v in item.items() if k != "pending_id"}
+            key = item.get("content_hash") or content_hash(item.get("title", ""), item.get("text", ""))
+            rows.append((key, bucket, now, json.dumps(item, ensure_ascii=False, default=str)))
+    if not rows:
+        return 0
+
+    conn = _connect()
+    try:
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO llm_pending (item_key, bucket, added_ts, item) VALUES (?,?,?,?)",
+                rows
+            )
+            added = conn.total_changes - before
+            if max_per_bucket is not None:
+                for bucket in items_by_bucket:
+                    conn.execute(
+                        """
+                        DELETE FROM llm_pending WHERE bucket = ? AND id NOT IN (
+                            SELECT id FROM llm_pending WHERE bucket = ? ORDER BY id DESC LIMIT ?
+                        )
+                        """,
+                        (bucket, bucket, max_per_bucket)
+                    )
+    finally:
+        conn.close()
+    return added
+
+
+def load_pending() -> dict:
+    """
+    LLM 갱신 대기열 전체를 {버킷: [item]} (추가된 순서)로 반환. 각 item에는 pending_id 키가 붙음.
+    """
+    if not os.path.exists(NEWS_DB_FILE):
+        return {}
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT id, bucket, item FROM llm_pending ORDER BY id").fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    conn.close()
+    pending = {}
+    for row in rows:
+        pending.setdefault(row["bucket"], []).append(dict(json.loads(row["item"]), pending_id=row["id"]))
+    return pending
+
+
+def dequeue_pending(ids) -> int:
+    """
+    LLM 갱신에 사용된 item들을 대기열에서 삭제 (pending_id 기준). 반환: 삭제된 item 수
+    """
+    ids = [i for i in ids if i is not None]
+    if not ids:
+        return 0
+    conn = _connect()
+    try:
+        with conn:
+            before = conn.total_changes
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                conn.execute(f"DELETE FROM llm_pending WHERE id IN ({','.join('?' * len(part))})", part)
+            removed = conn.total_changes - before
+    finally:
+        conn.close()
+    return removed
+
+
+def _fts_query(keyword: str) -> str:
+    """
+    사용자 입력을 FTS5 MATCH 구문으로 변환 (각 단어를 구문 문자열로 감싸 문법 오류 방지).
+    """
+    terms = [t.replace('"', '""') for t in keyword.split()]
+    return " ".join(f'"{t}"' for t in terms)
+
+
+def search_news(keyword: str = "", start=None, end=None, source=None, limit: int = 100) -> list:
+    """
+    키워드(FTS5) + 기간(published_at, 없으면 first_seen) + 소스로 뉴스 검색.
+    키워드가 있으면 관련도(bm25) 순, 없으면 최신순으로 반환.
+    """
+    if not os.path.exists(NEWS_DB_FILE):
+        return []
+
+    params = []
+    where = []
+    if keyword and keyword.strip():
+        base = "FROM news_fts JOIN news_items n ON n.id = news_fts.rowid"
+        where.append("news_fts MATCH ?")
+        params.append(_fts_query(keyword))
+        order = "bm25(news_fts)"
+    else:
+        base = "FROM news_items n"
+        order = "COALESCE(n.published_at, n.first_seen) DESC"
+
+    if start is not None:
+        where.append("COALESCE(n.published_at, n.first_seen) >= ?")
+        params.append(str(start))
+    if end is not None:
+        where.append("COALESCE(n.published_at, n.first_seen) <= ?")
+        params.append(str(end))
+    if source:
+        where.append("n.source LIKE ?")
+        params.append(f"{source}%")
+
+    query = f"""
+        SELECT n.id, n.source, n.title, n.url, n.published_at, n.first_seen, n.seen_count, n.text
+        {base}
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY {order}
+        LIMIT ?
+    """
+    params.append(limit)
+
+    conn = _connect()
+    try:
+        rows = conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+if __name__ == "__main__":
+    print("[START] news_store.py main()")
+    init_news_db()
+    new = upsert_items([{"source": "RSS", "title": "Bitcoin ETF inflows", "text": "Bitcoin ETF inflows rise"}])
+    print("[LOG] new items:", len(new))
+    print("[LOG] search:", search_news("bitcoin"))
+    print("[END] news_store.py main()")
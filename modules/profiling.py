@@ -0,0 +1,260 @@
+# profiling.py
+"""
+실행 중인 트레이더의 틱 프로파일링 (재시작 없이 켜고 끔).
+
+켜는 방법
+- 시그널  : kill -USR1 <pid>                       -> 기본 설정으로 다음 N틱 프로파일링
+- 제어 파일: echo "ticks=5 mode=cprofile,tracemalloc" > data/profile.control
+            (읽은 뒤 삭제됨. mode: cprofile | sample | tracemalloc 를 쉼표로 조합)
+- 느린 틱 : 틱이 slow_tick_seconds를 넘으면 다음 N틱 자동 프로파일링
+            (slow_tick_cooldown초에 최대 1번. 계속 느린 상황에서 덤프가 끝없이 쌓이지 않도록)
+
+결과 (data/profiles/<시각>_tick<번호>.*)
+- .prof          : cProfile 원본 (python -m pstats / snakeviz로 열기)
+- .txt           : 누적 시간 상위 함수 요약
+- .sample.txt    : 샘플링 결과 (collapsed stack 형식, flamegraph.pl / speedscope로 열기)
+- .mem.txt       : tracemalloc 증가량 (틱 내부 + 이전 프로파일 틱 대비)
+
+꺼져 있을 때는 틱마다 제어 파일 stat 1회만 수행.
+"""
+import os
+import io
+import sys
+import time
+import signal
+import pstats
+import cProfile
+import threading
+import tracemalloc
+import contextlib
+from collections import Counter
+from datetime import datetime
+
+print("[LOG] profiling.py module is being imported...")
+
+PROFILE_DIR = "data/profiles"
+CONTROL_FILE = "data/profile.control"
+MODES = ("cprofile", "sample", "tracemalloc")
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+
+
+class StackSampler:
+    """
+    대상 스레드의 스택을 interval마다 읽어 collapsed stack 횟수를 셈 (cProfile보다 오버헤드가 낮음).
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.01):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class TickProfiler:
+    """
+    틱 단위 프로파일러. main 루프에서 `with profiler.tick(): run_tick(runtime)` 형태로 사용.
+    """
+
+    def __init__(self, profile_dir: str = PROFILE_DIR, control_file: str = CONTROL_FILE,
+                 default_ticks: int = 3, default_modes=("cprofile",), sample_interval: float = 0.01,
+                 slow_tick_seconds: float = None, slow_tick_cooldown: float = 3600):
+        self.profile_dir = profile_dir
+        self.control_file = control_file
+        self.default_ticks = default_ticks
+        self.default_modes = tuple(default_modes)
+        self.sample_interval = sample_interval
+        self.slow_tick_seconds = slow_tick_seconds
+        self.slow_tick_cooldown = slow_tick_cooldown
+
+        self.remaining = 0
+        self.modes = ()
+        self.tick_count = 0
+        self._signal_pending = False
+        self._last_snapshot = None
+        self._started_tracemalloc = False
+        self._last_auto_request = None
+
+    # ---- 켜기 ----
+    def request(self, ticks: int = None, modes=None):
+        ticks = self.default_ticks if ticks is None else int(ticks)
+        modes = tuple(m for m in (modes or self.default_modes) if m in MODES)
+        if ticks <= 0 or not modes:
+            return
+        self.remaining = ticks
+        self.modes = modes
+        print(f"[INFO] 프로파일링 시작: 다음 {ticks}틱, mode={','.join(modes)}")
+
+    def install_signal_handler(self, signum=None):
+        """
+        SIGUSR1(기본) 수신 시 다음 틱부터 프로파일링. 핸들러는 플래그만 세움.
+        SIGUSR1이 없는 플랫폼(Windows)에서는 제어 파일만 사용.
+        """
+        signum = signum if signum is not None else getattr(signal, "SIGUSR1", None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+
+        def _handler(received, frame):
+            self._signal_pending = True
+
+        signal.signal(signum, _handler)
+        return True
+
+    def _poll_control_file(self):
+        """
+        제어 파일이 있으면 "ticks=5 mode=cprofile,tracemalloc" 형식을 읽고 삭제.
+        """
+        try:
+            with open(self.control_file, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.remove(self.control_file)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"[WARN] 프로파일 제어 파일 읽기 실패: {e}")
+            return
+
+        options = dict(part.split("=", 1) for part in text.split() if "=" in part)
+        if options.get("mode") == "off":
+            self.remaining = 0
+            print("[INFO] 프로파일링 중지 (제어 파일)")
+            self._finish()
+            return
+        try:
+            ticks = int(options["ticks"]) if "ticks" in options else None
+        except ValueError:
+            ticks = None
+        modes = options["mode"].split(",") if "mode" in options else None
+        self.request(ticks, modes)
+
+    # ---- 틱 실행 ----
+    @contextlib.contextmanager
+    def tick(self):
+        self.tick_count += 1
+        if self._signal_pending:
+            self._signal_pending = False
+            self.request()
+        if os.path.exists(self.control_file):
+            self._poll_control_file()
+
+        if self.remaining <= 0:
+            # 꺼져 있을 때: 시간 측정만 (느린 틱 자동 감지용)
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                elapsed = time.perf_counter() - started
+                if self.slow_tick_seconds and elapsed > self.slow_tick_seconds:
+                    now = time.monotonic()
+                    if self._last_auto_request is None or now - self._last_auto_request >= self.slow_tick_cooldown:
+                        self._last_auto_request = now
+                        print(f"[WARN] 느린 틱 감지 ({elapsed:.1f}s) -> 다음 틱부터 프로파일링")
+                        self.request()
+                    else:
+                        print(f"[WARN] 느린 틱 감지 ({elapsed:.1f}s) (자동 프로파일링 대기 중)")
+            return
+
+        with self._profiled():
+            yield
+
+    @contextlib.contextmanager
+    def _profiled(self):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        prefix = os.path.join(
+            self.profile_dir, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_tick{self.tick_count}")
+
+        profiler = cProfile.Profile() if "cprofile" in self.modes else None
+        sampler = StackSampler(threading.get_ident(), self.sample_interval) if "sample" in self.modes else None
+        if "tracemalloc" in self.modes:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                self._started_tracemalloc = True
+            before = tracemalloc.take_snapshot()
+        else:
+            before = None
+
+        if sampler is not None:
+            sampler.start()
+        if profiler is not None:
+            profiler.enable()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+            if sampler is not None:
+                sampler.stop()
+
+            files = []
+            if profiler is not None:
+                profiler.dump_stats(prefix + ".prof")
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+                with open(prefix + ".txt", "w", encoding="utf-8") as f:
+                    f.write(f"tick {self.tick_count}: {elapsed:.3f}s\n\n")
+                    f.write(stream.getvalue())
+                files += [prefix + ".prof", prefix + ".txt"]
+            if sampler is not None:
+                sampler.dump(prefix + ".sample.txt")
+                files.append(prefix + ".sample.txt")
+            if before is not None:
+                after = tracemalloc.take_snapshot()
+                self._dump_memory(prefix + ".mem.txt", before, after, elapsed)
+                self._last_snapshot = after
+                files.append(prefix + ".mem.txt")
+
+            self.remaining -= 1
+            print(f"[INFO] 프로파일 저장 ({elapsed:.2f}s): {', '.join(files)}")
+            if self.remaining <= 0:
+                self._finish()
+
+    def _dump_memory(self, path, before, after, elapsed):
+        current, peak = tracemalloc.get_traced_memory()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"tick {self.tick_count}: {elapsed:.3f}s, traced current={current / 1e6:.2f}MB, "
+                    f"peak={peak / 1e6:.2f}MB\n\n")
+            f.write("== 틱 내부 증가 (tick start -> end) ==\n")
+            for stat in after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+            if self._last_snapshot is not None:
+                f.write("\n== 이전 프로파일 틱 대비 증가 (누수 후보) ==\n")
+                for stat in after.compare_to(self._last_snapshot, "traceback")[:TOP_ALLOCATIONS]:
+                    f.write(f"{stat}\n")
+                    for line in stat.traceback.format()[-6:]:
+                        f.write(f"    {line}\n")
+
+    def _finish(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self._last_snapshot = None
+        self.modes = ()
+        print("[INFO] 프로파일링 종료")
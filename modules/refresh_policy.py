@@ -0,0 +1,169 @@
+# refresh_policy.py
+import math
+import time
+import numpy as np
+from typing import Dict, List, Tuple
+
+from modules.summarize_content import chunk_by_tokens
+
+print("[LOG] refresh_policy.py module is being imported...")
+
+# LLM 요약 1청크당 추가로 드는 토큰 (요약 출력 + 감성분석 호출 입출력) 추정치
+TOKENS_PER_CHUNK_OVERHEAD = 1200
+USAGE_WINDOW = 3600  # 초. 토큰 예산을 계산하는 구간 (최근 1시간)
+
+
+def realized_volatility(closes, window: int) -> float:
+    """
+    최근 window개 로그수익률의 표준편차 (캔들 1개 기준, 연율화하지 않음).
+    데이터가 부족하면 nan.
+    """
+    closes = np.asarray(closes, dtype=float)
+    if len(closes) < window + 1 or window < 2:
+        return float("nan")
+    returns = np.diff(np.log(closes[-(window + 1):]))
+    return float(returns.std(ddof=1))
+
+
+def estimate_refresh_tokens(items: List[Dict]) -> int:
+    """
+    pending item들을 요약 + 감성분석할 때 드는 토큰 수 추정 (LLM 호출 없이 chunk_by_tokens로 계산).
+    """
+    if not items:
+        return 0
+    _, stats = chunk_by_tokens(items)
+    return stats["estimated_prompt_tokens"] + stats["chunks"] * TOKENS_PER_CHUNK_OVERHEAD
+
+
+class RefreshPolicy:
+    """
+    LLM 감성 갱신 시점 결정.
+    urgency = 변동성 항 + 뉴스 도착 항 + 감성 나이 항
+      - 변동성 : max(0, 최근 vol / 기준 vol - 1) × vol_weight
+      - 뉴스   : 대기 중인 새 item 수 / news_target
+      - 나이   : 마지막 LLM 갱신 후 경과 시간 / max_age
+    urgency >= 1 이고 최소 간격(min_interval)이 지났으며,
+    최근 1시간 토큰 사용량 + 이번 추정치가 token_budget_per_hour 이내일 때만 갱신.
+    최소 간격은 실패한 시도에도 적용하고, 연속 실패 시 min_interval x 2^(실패 수 - 1)
+    (최대 max_backoff)만큼 기다린 뒤 다시 시도 (LLM 장애 중 매 틱 호출 방지).
+    """
+
+    def __init__(self, vol_window: int = 12, vol_baseline: int = 48, vol_weight: float = 1.0,
+                 news_target: int = 20, max_age: float = 3600, min_interval: float = 300,
+                 token_budget_per_hour: int = 40000, max_backoff: float = 3600):
+        self.vol_window = vol_window
+        self.vol_baseline = vol_baseline
+        self.vol_weight = vol_weight
+        self.news_target = news_target
+        self.max_age = max_age
+        self.min_interval = min_interval
+        self.token_budget_per_hour = token_budget_per_hour
+        self.max_backoff = max_backoff
+        self.last_refresh = None
+        self.last_attempt = None
+        self.failures = 0  # 마지막 성공 이후 연속 실패 수
+        self.usage = []  # [(시각, 토큰 수)]
+
+    def tokens_used(self, now: float = None) -> int:
+        now = time.time() if now is None else now
+        self.usage = [(t, n) for t, n in self.usage if now - t < USAGE_WINDOW]
+        return sum(n for _, n in self.usage)
+
+    def decide(self, closes, pending_count: int, estimated_tokens: int,
+               now: float = None) -> Tuple[bool, Dict]:
+        """
+        갱신 여부와 판단 근거(dict) 반환.
+        """
+        now = time.time() if now is None else now
+
+        recent_vol = realized_volatility(closes, self.vol_window)
+        baseline_vol = realized_volatility(closes, self.vol_baseline)
+        if math.isnan(recent_vol) or math.isnan(baseline_vol) or baseline_vol <= 0:
+            vol_ratio = 1.0
+        else:
+            vol_ratio = recent_vol / baseline_vol
+        vol_term = max(0.0, vol_ratio - 1.0) * self.vol_weight
+        news_term = pending_count / self.news_target if self.news_target else 0.0
+        age = now - self.last_refresh if self.last_refresh is not None else float("inf")
+        age_term = age / self.max_age if self.max_age else 0.0
+        urgency = vol_term + news_term + age_term
+
+        since_attempt = now - self.last_attempt if self.last_attempt is not None else float("inf")
+        wait = self.retry_wait()
+
+        used = self.tokens_used(now)
+        info = {
+            "urgency": round(min(urgency, 1e6), 4),
+            "vol_ratio": round(vol_ratio, 4),
+            "pending": pending_count,
+            "age": None if self.last_refresh is None else round(age, 1),
+            "tokens_used": used,
+            "tokens_estimated": estimated_tokens
+        }
+
+        if pending_count == 0:
+            info["reason"] = "no pending items"
+            return False, info
+        if age < self.min_interval or since_attempt < self.min_interval:
+            info["reason"] = "min_interval"
+            return False, info
+        if since_attempt < wait:
+            info["reason"] = f"backoff ({self.failures} failures)"
+            return False, info
+        if urgency < 1.0:
+            info["reason"] = "low urgency"
+            return False, info
+        if self.token_budget_per_hour and used + estimated_tokens > self.token_budget_per_hour:
+            info["reason"] = "token budget"
+            return False, info
+        info["reason"] = "refresh"
+        return True, info
+
+    def retry_wait(self) -> float:
+        """연속 실패 후 다음 시도까지 기다릴 시간(초). 실패가 없으면 0"""
+        if self.failures == 0:
+            return 0.0
+        return min(self.max_backoff, self.min_interval * 2 ** (self.failures - 1))
+
+    def record_refresh(self, tokens: int, now: float = None):
+        now = time.time() if now is None else now
+        self.last_refresh = now
+        self.last_attempt = now
+        self.failures = 0
+        self.usage.append((now, int(tokens)))
+
+    def record_failure(self, now: float = None):
+        now = time.time() if now is None else now
+        self.last_attempt = now
+        self.failures += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "last_refresh": self.last_refresh,
+            "last_attempt": self.last_attempt,
+            "failures": self.failures,
+            "usage": [list(u) for u in self.usage]
+        }
+
+    def load(self, data: Dict):
+        """
+        to_dict() 결과(스냅샷)에서 갱신/시도 시각, 연속 실패 수, 토큰 사용 기록 복원.
+        """
+        data = data or {}
+        self.last_refresh = data.get("last_refresh")
+        self.last_attempt = data.get("last_attempt")
+        self.failures = data.get("failures", 0)
+        self.usage = [tuple(u) for u in data.get("usage", [])]
+        return self
+
+
+if __name__ == "__main__":
+    print("[START] refresh_policy.py main()")
+    rng = np.random.default_rng(0)
+    calm = 1e8 * np.exp(np.cumsum(rng.normal(0, 0.001, 50)))
+    stormy = np.concatenate([calm[:40], calm[39] * np.exp(np.cumsum(rng.normal(0, 0.004, 10)))])
+    policy = RefreshPolicy()
+    policy.record_refresh(5000, now=0)
+    for name, closes in (("calm", calm), ("stormy", stormy)):
+        print(f"[LOG] {name}:", policy.decide(closes, pending_count=3, estimated_tokens=3000, now=900))
+    print("[END] refresh_policy.py main()")
@@ -1,15 +1,10 @@
 # sentiment_analysis.py
-import os
 import json
-from openai import OpenAI
+from modules.llm_client import get_client
 from typing import Dict, List
 
 print("[LOG] sentiment_analysis.py module is being imported...")
 
-client = OpenAI(
-    api_key=os.environ.get("OPENAI_API_KEY")
-)
-
 def analyze_summary(summary_text: str) -> Dict:
     """
     Perform sentiment analysis based on the provided summary_text,
@@ -45,7 +40,7 @@ Important rules:
 
     for attempt in range(max_retries):
         try:
-            response = client.chat.completions.create(
+            response = get_client().chat.completions.create(
                 model="gpt-4o-2024-08-06",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -56,6 +51,11 @@ Important rules:
             )
 
             content = response.choices[0].message.content.strip()
+            usage = getattr(response, "usage", None)
+            usage = {
+                "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+                "completion_tokens": getattr(usage, "completion_tokens", 0) or 0
+            }
             data = json.loads(content)  # JSON 파싱 시도
 
             sentiment_score = data.get("sentiment_score", 0.0)
@@ -77,7 +77,8 @@ Important rules:
                 "sentiment_score": sentiment_score,
                 "confidence": confidence,
                 "analysis_summary": analysis_summary,
-                "recommendation": recommendation
+                "recommendation": recommendation,
+                "usage": usage
             }
 
         except (json.JSONDecodeError, ValueError) as e:
@@ -91,7 +92,8 @@ Important rules:
         "sentiment_score": 0.0,
         "confidence": 50,
         "analysis_summary": "Failed to parse JSON",
-        "recommendation": "hold"
+        "recommendation": "hold",
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0}
     }
 
 def main(summaries: List[Dict]) -> List[Dict]:
@@ -107,10 +109,13 @@ def main(summaries: List[Dict]) -> List[Dict]:
         analysis = analyze_summary(summary_text)
         results.append({
             "chunk_index": item.get("chunk_index", i),
+            "source": item.get("source"),
+            "item_count": item.get("item_count"),
             "analysis_summary": analysis["analysis_summary"],
             "sentiment_score": analysis["sentiment_score"],
             "confidence": analysis["confidence"],
             "recommendation": analysis["recommendation"],
+            "usage": analysis["usage"]
         })
 
     print(f"[INFO] Sentiment analysis complete. total results: {len(results)}")
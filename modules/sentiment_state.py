@@ -0,0 +1,169 @@
+# sentiment_state.py
+import math
+import time
+import calendar
+from typing import Dict, List
+
+from modules.news_store import normalize_published
+
+print("[LOG] sentiment_state.py module is being imported...")
+
+DEFAULT_HALF_LIFE = 6 * 3600   # 초. 이 시간이 지나면 관측치 가중치가 절반
+DEFAULT_PRIOR_WEIGHT = 0.0     # 중립(0.0) 사전 가중치. 0이면 확신도 가중 평균 그대로 (main.py의 ±0.5 임계값 기준)
+MIN_WEIGHT = 1e-6              # 이보다 작아진 소스 누적치는 정리
+
+
+def observed_at(item: Dict, now: float = None) -> float:
+    """
+    item의 발행 시각(epoch 초). 해석할 수 없거나 미래 시각이면 now.
+    """
+    now = time.time() if now is None else now
+    published = normalize_published(item.get("timestamp") or item.get("created_utc"))
+    if published is None:
+        return now
+    epoch = calendar.timegm(time.strptime(published, "%Y-%m-%d %H:%M:%S"))
+    return min(float(epoch), now)
+
+
+class SentimentState:
+    """
+    소스별 지수 시간감쇠 + 확신도 가중 감성 누적기.
+    소스마다 (Σ w·s, Σ w, 마지막 갱신 시각)만 유지하고, 새 관측치가 올 때마다
+    기존 누적치를 exp(-ln2·Δt/half_life)로 감쇠한 뒤 더함 (전체 재계산 없음).
+    - w = confidence/100 × source_weight × exp(-ln2·(갱신 시각 - 관측 시각)/half_life)
+    - score(now) = Σ_src(decayed Σ w·s) / (Σ_src(decayed Σ w) + prior_weight)
+    prior_weight > 0이면 근거가 적거나 오래될수록 점수가 0쪽으로 줄어듦. 이 경우 같은 관측치라도 점수가
+    작아지므로(예: prior 1.0, 확신도 80인 0.9 한 건 -> 0.72/1.8 = 0.40) 감성 임계값도 함께 낮춰야 함.
+    """
+
+    def __init__(self, half_life: float = DEFAULT_HALF_LIFE, prior_weight: float = DEFAULT_PRIOR_WEIGHT,
+                 source_weights: Dict[str, float] = None):
+        self.half_life = float(half_life)
+        self.prior_weight = float(prior_weight)
+        self.source_weights = dict(source_weights or {})
+        self.sources = {}  # {source: {"num": float, "den": float, "updated": float, "count": int}}
+
+    def _decay(self, dt: float) -> float:
+        if dt <= 0:
+            return 1.0
+        return math.exp(-math.log(2) * dt / self.half_life)
+
+    def update(self, source: str, score: float, confidence: float = 100.0,
+               timestamp: float = None, now: float = None):
+        """
+        관측치 1건 반영. timestamp(관측 시각)가 now보다 과거면 그만큼 감쇠된 가중치로 더함.
+        """
+        now = time.time() if now is None else now
+        timestamp = now if timestamp is None else min(timestamp, now)
+        weight = (max(0.0, min(float(confidence), 100.0)) / 100.0
+                  * self.source_weights.get(source, 1.0)
+                  * self._decay(now - timestamp))
+
+        acc = self.sources.get(source)
+        if acc is None:
+            acc = self.sources[source] = {"num": 0.0, "den": 0.0, "updated": now, "count": 0}
+        factor = self._decay(now - acc["updated"])
+        acc["num"] = acc["num"] * factor + weight * max(-1.0, min(float(score), 1.0))
+        acc["den"] = acc["den"] * factor + weight
+        acc["updated"] = max(acc["updated"], now)
+        acc["count"] += 1
+
+    def update_many(self, source: str, results: List[Dict], timestamps: List[float] = None,
+                    confidence_scale: float = 1.0, now: float = None) -> int:
+        """
+        sentiment_analysis / local_sentiment 결과(dict 목록)를 순서대로 반영.
+        results의 "source" 키가 있으면 source 인자보다 우선. 반영한 건수 반환.
+        """
+        now = time.time() if now is None else now
+        count = 0
+        for i, result in enumerate(results):
+            if result.get("sentiment_score") is None:
+                continue
+            self.update(
+                result.get("source") or source,
+                result["sentiment_score"],
+                confidence=result.get("confidence", 50) * confidence_scale,
+                timestamp=timestamps[i] if timestamps else None,
+                now=now
+            )
+            count += 1
+        return count
+
+    def source_scores(self, now: float = None) -> Dict[str, Dict]:
+        """
+        소스별 현재 점수와 (감쇠된) 누적 가중치.
+        """
+        now = time.time() if now is None else now
+        out = {}
+        for source, acc in self.sources.items():
+            factor = self._decay(now - acc["updated"])
+            den = acc["den"] * factor
+            out[source] = {
+                "score": acc["num"] / acc["den"] if acc["den"] > 0 else 0.0,
+                "weight": den,
+                "count": acc["count"]
+            }
+        return out
+
+    def score(self, now: float = None) -> float:
+        """
+        전체 소스를 합친 현재 감성 점수(-1 ~ 1). 관측치가 없으면 0.0.
+        """
+        now = time.time() if now is None else now
+        num = 0.0
+        den = self.prior_weight
+        for acc in self.sources.values():
+            factor = self._decay(now - acc["updated"])
+            num += acc["num"] * factor
+            den += acc["den"] * factor
+        return num / den if den > 0 else 0.0
+
+    def total_weight(self, now: float = None) -> float:
+        now = time.time() if now is None else now
+        return sum(acc["den"] * self._decay(now - acc["updated"]) for acc in self.sources.values())
+
+    def prune(self, now: float = None):
+        """
+        감쇠로 가중치가 MIN_WEIGHT 아래로 떨어진 소스 제거.
+        """
+        now = time.time() if now is None else now
+        self.sources = {
+            source: acc for source, acc in self.sources.items()
+            if acc["den"] * self._decay(now - acc["updated"]) >= MIN_WEIGHT
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "half_life": self.half_life,
+            "prior_weight": self.prior_weight,
+            "sources": {source: dict(acc) for source, acc in self.sources.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, half_life: float = None, prior_weight: float = None,
+                  source_weights: Dict[str, float] = None) -> "SentimentState":
+        """
+        to_dict() 결과에서 복원. 인자로 준 설정값이 저장된 값보다 우선.
+        """
+        data = data or {}
+        state = cls(
+            half_life=half_life if half_life is not None else data.get("half_life", DEFAULT_HALF_LIFE),
+            prior_weight=prior_weight if prior_weight is not None else data.get("prior_weight", DEFAULT_PRIOR_WEIGHT),
+            source_weights=source_weights
+        )
+        state.sources = {source: dict(acc) for source, acc in (data.get("sources") or {}).items()}
+        return state
+
+
+if __name__ == "__main__":
+    print("[START] sentiment_state.py main()")
+    state = SentimentState(half_life=3600)
+    t0 = 1_700_000_000
+    state.update("rss", 0.8, confidence=90, now=t0)
+    state.update("reddit", -0.4, confidence=40, now=t0)
+    print(f"[LOG] t0      score={state.score(t0):+.4f}")
+    state.update("local", -0.6, confidence=20, now=t0 + 1800)
+    print(f"[LOG] t0+30m  score={state.score(t0 + 1800):+.4f}")
+    print(f"[LOG] t0+6h   score={state.score(t0 + 6 * 3600):+.4f}")
+    print("[LOG] sources:", state.source_scores(t0 + 1800))
+    print("[END] sentiment_state.py main()")
@@ -0,0 +1,216 @@
+# sentiment_worker.py
+"""
+뉴스 수집 -> 로컬 감성 -> (갱신 정책에 따라) LLM 요약/감성분석 파이프라인.
+
+- inline   : main.py가 SentimentPipeline.step()을 틱마다 직접 호출
+- process  : main.py가 이 모듈을 별도 프로세스로 띄우고 sentiment_signal 테이블만 읽음
+- external : 사용자가 따로 실행 (python -m modules.sentiment_worker --loop)
+
+별도 프로세스 모드에서는 결과를 db_utils.publish_sentiment_signal()로 1행 테이블에 덮어쓰고,
+트레이더는 load_sentiment_signal()로 PK 1건만 읽음 (O(1)).
+"""
+import time
+import argparse
+
+print("[LOG] sentiment_worker.py module is being imported...")
+
+import config.config as config
+from modules.data_collector import main as data_collector_main
+from modules.summarize_content import main as summarize_content_main
+from modules.sentiment_analysis import main as sentiment_analysis_main
+from modules.local_sentiment import score_items
+from modules.sentiment_state import SentimentState, observed_at
+from modules.refresh_policy import RefreshPolicy, estimate_refresh_tokens
+from modules.db_utils import init_db, publish_sentiment_signal, load_sentiment_signal
+from modules.news_store import init_news_db, enqueue_pending, load_pending, dequeue_pending
+
+SOURCE_KEYS = ("rss", "cryptopanic", "reddit")
+
+
+def build_sentiment_state(data: dict = None) -> SentimentState:
+    """
+    config 설정으로 감성 누적기 생성 (data가 있으면 스냅샷에서 복원).
+    """
+    return SentimentState.from_dict(
+        data,
+        half_life=config.SENTIMENT_HALF_LIFE,
+        prior_weight=config.SENTIMENT_PRIOR_WEIGHT,
+        source_weights=config.SENTIMENT_SOURCE_WEIGHTS
+    )
+
+
+def build_refresh_policy(data: dict = None) -> RefreshPolicy:
+    """
+    config 설정으로 감성 갱신 정책 생성 (data가 있으면 마지막 갱신 시각/토큰 사용 기록 복원).
+    """
+    policy = RefreshPolicy(
+        vol_window=config.REFRESH_VOL_WINDOW,
+        vol_baseline=config.REFRESH_VOL_BASELINE,
+        vol_weight=config.REFRESH_VOL_WEIGHT,
+        news_target=config.REFRESH_NEWS_TARGET,
+        max_age=config.REFRESH_MAX_AGE,
+        min_interval=config.REFRESH_MIN_INTERVAL,
+        token_budget_per_hour=config.LLM_TOKEN_BUDGET_PER_HOUR,
+        max_backoff=config.REFRESH_MAX_BACKOFF
+    )
+    return policy.load(data)
+
+
+class SentimentPipeline:
+    """
+    감성 누적 상태 + 갱신 정책 + LLM 대기열을 묶은 파이프라인.
+    to_dict()/from_dict()는 state_snapshot.extra_state와 같은 키를 사용.
+    news_store는 수집 시점에 이미 '본 item'으로 기록하므로, LLM 대기열은 news_store.llm_pending 테이블에 둠
+    (재시작/워커 종료 후에도 유지되고, 틱마다 스냅샷에 대기열 전체를 다시 쓰지 않음).
+    """
+
+    def __init__(self, sentiment_state: SentimentState = None, refresh_policy: RefreshPolicy = None,
+                 pending: dict = None):
+        self.sentiment_state = sentiment_state or build_sentiment_state()
+        self.refresh_policy = refresh_policy or build_refresh_policy()
+        init_news_db()
+        if pending:
+            # 예전 스냅샷(extra_state["pending"])에 남아 있던 대기열은 테이블로 옮김
+            enqueue_pending(pending, config.MAX_PENDING_ITEMS)
+        self.pending = load_pending()  # llm_pending 테이블의 메모리 사본 {소스: [item]}
+
+    def step(self, closes, now: float = None):
+        """
+        1회 실행: 저비용 수집 -> 로컬 감성 누적 -> 갱신 정책 판단 -> (필요 시) LLM 감성 누적.
+        반환: 현재 누적 감성 점수. 관측치가 하나도 없으면 None
+        """
+        sentiment_state = self.sentiment_state
+
+        # 저비용 수집 (소스별 주기에 맞춰, 중복 제거된 새 item만)
+        collected_data = data_collector_main()
+        now = time.time() if now is None else now
+        new_items = [item for key in SOURCE_KEYS for item in collected_data.get(key, [])]
+
+        # 로컬 감성 점수 (수 ms): item별 발행 시각으로 낮은 확신도로 누적
+        if new_items and config.SENTIMENT_MODE != "llm":
+            local_results = score_items(new_items)
+            scored = [(r, observed_at(item, now)) for r, item in zip(local_results, new_items) if r["confidence"] > 0]
+            if scored:
+                sentiment_state.update_many(
+                    "local", [r for r, _ in scored], timestamps=[t for _, t in scored],
+                    confidence_scale=config.LOCAL_SENTIMENT_CONFIDENCE_SCALE, now=now
+                )
+                print(f"[INFO] 로컬 감성 누적: {len(scored)}건")
+
+        if config.SENTIMENT_MODE != "local" and new_items:
+            enqueue_pending({key: collected_data.get(key, []) for key in SOURCE_KEYS}, config.MAX_PENDING_ITEMS)
+            self.pending = load_pending()
+        pending_list = [item for key in SOURCE_KEYS for item in self.pending.get(key, [])]
+
+        # LLM 감성 갱신 여부: 변동성 + 뉴스 도착 + 감성 나이, 시간당 토큰 예산 내에서
+        do_refresh, info = self.refresh_policy.decide(
+            closes,
+            pending_count=len(pending_list),
+            estimated_tokens=estimate_refresh_tokens(pending_list),
+            now=now
+        )
+        print(f"[INFO] 감성 갱신 판단: {info}")
+
+        if do_refresh:
+            print("[INFO] LLM 감성 분석 수행...")
+            analysis_results = []
+            try:
+                all_summaries = summarize_content_main(self.pending)
+                analysis_results = sentiment_analysis_main(all_summaries)
+                used_tokens = sum(
+                    r["usage"]["prompt_tokens"] + r["usage"]["completion_tokens"]
+                    for r in all_summaries + analysis_results
+                )
+                self.refresh_policy.record_refresh(used_tokens, now=now)
+                # 요약 청크에 실제로 들어간 item만 대기열에서 제거 (예산 초과로 빠진 item은 다음 갱신 때 다시 후보)
+                dequeue_pending([item.get("pending_id") for s in all_summaries for item in s.get("items", [])])
+                self.pending = load_pending()
+            except Exception as e:
+                # 대기열은 유지하고, 실패한 시도도 최소 간격 + 백오프에 반영
+                self.refresh_policy.record_failure(now=now)
+                print(f"[WARN] LLM 감성 분석 실패 -> 로컬 감성 점수만 사용 "
+                      f"(다음 시도까지 {self.refresh_policy.retry_wait():.0f}초 이상): {e}")
+
+            if analysis_results:
+                sentiment_state.update_many("llm", analysis_results, now=now)
+                print(f"[INFO] LLM 감성 누적: {len(analysis_results)}건")
+
+        return self.score(time.time())
+
+    def score(self, now: float = None):
+        """
+        누적 감성 상태 -> 현재 감성 (시간감쇠 반영). 관측치가 없으면 None.
+        """
+        now = time.time() if now is None else now
+        self.sentiment_state.prune(now)
+        if not self.sentiment_state.sources:
+            return None
+        return self.sentiment_state.score(now)
+
+    def source_scores(self, now: float = None) -> dict:
+        now = time.time() if now is None else now
+        return {k: round(v["score"], 4) for k, v in self.sentiment_state.source_scores(now).items()}
+
+    def to_dict(self) -> dict:
+        return {
+            "sentiment_state": self.sentiment_state.to_dict(),
+            "refresh_policy": self.refresh_policy.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict = None) -> "SentimentPipeline":
+        data = data or {}
+        return cls(
+            build_sentiment_state(data.get("sentiment_state")),
+            build_refresh_policy(data.get("refresh_policy")),
+            data.get("pending")
+        )
+
+
+def _fetch_closes():
+    """
+    변동성 계산용 종가. 거래소 조회 실패 시 빈 배열(변동성 항 없이 판단).
+    """
+    try:
+        from modules.trading_utils import fetch_ohlc_data
+        df = fetch_ohlc_data(config.SYMBOL, config.TIMEFRAME, limit=config.MAX_CANDLE)
+        return df["close"].to_numpy()
+    except Exception as e:
+        print(f"[WARN] 캔들 조회 실패 -> 변동성 제외하고 판단: {e}")
+        return []
+
+
+def run_worker(interval: float = None, once: bool = False):
+    """
+    워커 루프: 파이프라인 1회 실행 후 sentiment_signal에 결과(점수 + 복원용 상태) 발행.
+    재시작 시 마지막으로 발행한 상태에서 이어서 누적.
+    """
+    interval = config.SENTIMENT_WORKER_INTERVAL if interval is None else interval
+    init_db()
+    signal = load_sentiment_signal()
+    pipeline = SentimentPipeline.from_dict(signal["state"] if signal else None)
+    print(f"[START] sentiment_worker (interval={interval}s)")
+
+    while True:
+        started = time.time()
+        try:
+            score = pipeline.step(_fetch_closes())
+            publish_sentiment_signal(
+                sentiment=score,
+                source_scores=pipeline.source_scores(),
+                state=pipeline.to_dict()
+            )
+            print(f"[INFO] 감성 신호 발행: {score}")
+        except Exception as e:
+            print(f"[ERROR] sentiment_worker: {e}")
+        if once:
+            break
+        time.sleep(max(0.0, interval - (time.time() - started)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="sentiment worker")
+    parser.add_argument("--loop", action="store_true", help="주기적으로 계속 실행 (없으면 1회)")
+    parser.add_argument("--interval", type=float, default=None)
+    args = parser.parse_args()
+    run_worker(interval=args.interval, once=not args.loop)
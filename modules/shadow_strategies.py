@@ -0,0 +1,315 @@
+# shadow_strategies.py
+"""
+섀도 전략: 같은 캔들/지표/감성 데이터로 여러 전략 설정을 동시에 페이퍼 트레이딩.
+
+설정과 상태는 struct-of-arrays(설정 항목별 numpy 배열)로 보관하고,
+틱마다 모든 포트폴리오의 목표 비중 -> 주문 -> 체결(simulate_fills_vectorized)을 벡터 연산으로 처리.
+결과는 trade_logs.db의 별도 테이블에 executemany로 기록.
+- shadow_portfolios : 설정 + 현재 잔고/포지션 (포트폴리오당 1행, 재시작 시 복원)
+- shadow_trades     : 체결 내역
+- shadow_equity     : 주기적 자산 평가 (equity_log_interval 틱마다)
+"""
+import json
+import sqlite3
+import itertools
+from datetime import datetime
+
+import numpy as np
+
+print("[LOG] shadow_strategies.py module is being imported...")
+
+import config.config as config
+import modules.db_utils as db_utils
+from modules.execution_simulator import simulate_fills_vectorized
+
+# struct-of-arrays 설정 항목 (adjust_target_ratio_with_signals의 상수들)
+PARAM_FIELDS = (
+    "base_ratio", "rsi_low", "rsi_high", "rsi_step",
+    "sentiment_low", "sentiment_high", "sentiment_step", "rebalance_threshold"
+)
+DEFAULT_PARAMS = {
+    "rsi_low": 30.0, "rsi_high": 70.0, "rsi_step": 0.1,
+    "sentiment_low": -0.5, "sentiment_high": 0.5, "sentiment_step": 0.1
+}
+
+
+def build_grid(grid: dict) -> list:
+    """
+    {"base_ratio": [...], "rsi_band": [(low, high), ...], "sentiment_band": [...], ...}
+    조합(cartesian product)으로 설정 dict 목록 생성. 빠진 항목은 main.py 기본값 사용.
+    name은 PARAM_FIELDS 전부로 만듦 (shadow_portfolios 행의 키이므로 설정이 다르면 이름도 달라야 함).
+    """
+    keys = list(grid)
+    configs = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        params = dict(DEFAULT_PARAMS, base_ratio=config.TARGET_BTC_RATIO,
+                      rebalance_threshold=config.REBALANCE_THRESHOLD)
+        for key, value in zip(keys, values):
+            if key == "rsi_band":
+                params["rsi_low"], params["rsi_high"] = value
+            elif key == "sentiment_band":
+                params["sentiment_low"], params["sentiment_high"] = value
+            else:
+                params[key] = value
+        params["name"] = (
+            f"r{params['base_ratio']:g}"
+            f"_rsi{params['rsi_low']:g}-{params['rsi_high']:g}x{params['rsi_step']:g}"
+            f"_s{params['sentiment_low']:g}~{params['sentiment_high']:g}x{params['sentiment_step']:g}"
+            f"_th{params['rebalance_threshold']:g}"
+        )
+        configs.append(params)
+    return configs
+
+
+class ShadowPortfolios:
+    """
+    n개 섀도 포트폴리오. 설정(params[필드]) / 상태(balance, position, ...) 모두 (n,) 배열.
+    """
+
+    def __init__(self, configs: list, initial_balance: float, fee: float = None,
+                 liquidity: str = None, equity_log_interval: int = 5):
+        self.names = [c["name"] for c in configs]
+        self.params = {f: np.array([float(c[f]) for c in configs]) for f in PARAM_FIELDS}
+        n = len(configs)
+        self.balance = np.full(n, float(initial_balance))
+        self.position = np.zeros(n)
+        self.trade_count = np.zeros(n, dtype=np.int64)
+        self.fees_paid = np.zeros(n)
+        self.fee = config.CURRENT_FEE if fee is None else fee
+        self.liquidity = config.ORDER_LIQUIDITY if liquidity is None else liquidity
+        self.equity_log_interval = equity_log_interval
+        self.tick_count = 0
+        self.ids = None  # shadow_portfolios.id (init_tables 후 설정)
+
+    def __len__(self):
+        return len(self.names)
+
+    def target_ratios(self, rsi: float, sentiment: float) -> np.ndarray:
+        """
+        adjust_target_ratio_with_signals를 모든 설정에 대해 한 번에 계산.
+        """
+        p = self.params
+        ratio = p["base_ratio"].copy()
+        ratio += np.where(rsi < p["rsi_low"], p["rsi_step"], 0.0)
+        ratio -= np.where(rsi > p["rsi_high"], p["rsi_step"], 0.0)
+        ratio += np.where(sentiment > p["sentiment_high"], p["sentiment_step"], 0.0)
+        ratio -= np.where(sentiment < p["sentiment_low"], p["sentiment_step"], 0.0)
+        return np.clip(ratio, 0.0, 1.0)
+
+    def step(self, price: float, rsi: float, sentiment: float, **book_params) -> dict:
+        """
+        1틱 리밸런싱 (paper_trade_rebalance와 같은 규칙). 반환: 이번 틱 결과 배열 dict.
+        """
+        self.tick_count += 1
+        n = len(self)
+        price = float(price)
+        target = self.target_ratios(rsi, sentiment)
+
+        current_value = self.position * price
+        total_value = self.balance + current_value
+        diff = total_value * target - current_value
+        active = np.abs(diff) >= self.params["rebalance_threshold"]
+
+        # 매수: 수수료 포함 예산, 최소 주문 금액 미만 제외, 잔고 한도
+        buy_cost = np.minimum(diff * (1 + self.fee), self.balance)
+        is_buy = active & (diff > 0) & (diff * (1 + self.fee) >= config.MIN_ORDER_AMOUNT)
+        # 매도: 보유 수량 한도
+        sell_qty = np.minimum(np.minimum(-diff, current_value) / price, self.position)
+        is_sell = active & (diff < 0) & (sell_qty > 0)
+
+        sides = np.where(is_buy, 1, np.where(is_sell, -1, 0))
+        amounts = np.where(is_buy, buy_cost, np.where(is_sell, sell_qty, 0.0))
+
+        fills = simulate_fills_vectorized(
+            np.full(n, price), amounts, sides, liquidity=self.liquidity,
+            maker_fill_ratio=config.MAKER_FILL_RATIO, **book_params
+        )
+        base, quote, fee = fills["filled_base"], fills["filled_quote"], fills["fee"]
+        filled = base > 0
+        buy_done = is_buy & filled
+        sell_done = is_sell & filled
+
+        self.balance += np.where(buy_done, -(quote + fee), 0.0) + np.where(sell_done, quote - fee, 0.0)
+        self.position += np.where(buy_done, base, 0.0) - np.where(sell_done, base, 0.0)
+        self.trade_count += filled
+        self.fees_paid += np.where(filled, fee, 0.0)
+
+        return {
+            "target_ratio": target,
+            "side": np.where(buy_done, 1, np.where(sell_done, -1, 0)),
+            "filled_base": base,
+            "avg_price": fills["avg_price"],
+            "fee": fee,
+            "equity": self.balance + self.position * price
+        }
+
+    def summary(self, price: float, top: int = 5) -> list:
+        """
+        자산 상위 top개 포트폴리오 [(이름, 자산)].
+        """
+        equity = self.balance + self.position * float(price)
+        order = np.argsort(-equity)[:top]
+        return [(self.names[i], float(equity[i])) for i in order]
+
+
+###################
+# DB 기록/복원    #
+###################
+def init_shadow_tables():
+    conn = sqlite3.connect(db_utils.DB_FILE)
+    with conn:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS shadow_portfolios (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE,
+                params TEXT,
+                balance REAL,
+                position REAL,
+                trade_count INTEGER,
+                fees_paid REAL,
+                updated_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS shadow_trades (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT,
+                portfolio_id INTEGER,
+                action TEXT,
+                current_price REAL,
+                rsi REAL,
+                sentiment REAL,
+                target_ratio REAL,
+                trade_amount REAL,
+                trade_price REAL,
+                fee REAL,
+                balance REAL,
+                position REAL
+            );
+            CREATE TABLE IF NOT EXISTS shadow_equity (
+                timestamp TEXT,
+                portfolio_id INTEGER,
+                equity REAL,
+                PRIMARY KEY (timestamp, portfolio_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_shadow_trades_portfolio ON shadow_trades(portfolio_id, id);
+            """
+        )
+    conn.close()
+
+
+def load_or_create(configs: list, initial_balance: float, **kwargs) -> ShadowPortfolios:
+    """
+    설정 목록으로 포트폴리오 생성 후, 같은 이름이 shadow_portfolios에 있으면 잔고/포지션 복원.
+    새 설정은 행을 추가하고 초기 잔고로 시작.
+    """
+    init_shadow_tables()
+    book = ShadowPortfolios(configs, initial_balance, **kwargs)
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    conn = sqlite3.connect(db_utils.DB_FILE)
+    try:
+        with conn:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO shadow_portfolios
+                (name, params, balance, position, trade_count, fees_paid, updated_at)
+                VALUES (?,?,?,?,0,0,?)
+                """,
+                [
+                    (name, json.dumps({f: float(book.params[f][i]) for f in PARAM_FIELDS}),
+                     float(initial_balance), 0.0, now)
+                    for i, name in enumerate(book.names)
+                ]
+            )
+        rows = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT name, id, balance, position, trade_count, fees_paid FROM shadow_portfolios"
+            )
+        }
+    finally:
+        conn.close()
+
+    book.ids = np.array([rows[name][0] for name in book.names], dtype=np.int64)
+    book.balance = np.array([rows[name][1] for name in book.names], dtype=float)
+    book.position = np.array([rows[name][2] for name in book.names], dtype=float)
+    book.trade_count = np.array([rows[name][3] for name in book.names], dtype=np.int64)
+    book.fees_paid = np.array([rows[name][4] for name in book.names], dtype=float)
+    return book
+
+
+def log_step(book: ShadowPortfolios, result: dict, price: float, rsi: float, sentiment: float):
+    """
+    한 틱 결과를 기록: 체결(있는 것만), 포트폴리오 상태, 주기적 자산 평가.
+    main.run_tick()의 틱 트랜잭션 안에서는 그 틱의 다른 기록과 함께 커밋.
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    traded = np.flatnonzero(result["side"] != 0)
+    ids = book.ids.tolist()
+
+    with db_utils.write_connection() as conn:
+        if len(traded):
+            conn.executemany(
+                """
+                INSERT INTO shadow_trades
+                (timestamp, portfolio_id, action, current_price, rsi, sentiment, target_ratio,
+                 trade_amount, trade_price, fee, balance, position)
+                VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
+                """,
+                [
+                    (now, ids[i], "buy" if result["side"][i] > 0 else "sell", float(price),
+                     float(rsi), float(sentiment), float(result["target_ratio"][i]),
+                     float(result["filled_base"][i]), float(result["avg_price"][i]),
+                     float(result["fee"][i]), float(book.balance[i]), float(book.position[i]))
+                    for i in traded
+                ]
+            )
+        conn.executemany(
+            """
+            UPDATE shadow_portfolios
+            SET balance=?, position=?, trade_count=?, fees_paid=?, updated_at=?
+            WHERE id=?
+            """,
+            zip(book.balance.tolist(), book.position.tolist(), book.trade_count.tolist(),
+                book.fees_paid.tolist(), itertools.repeat(now), ids)
+        )
+        if book.equity_log_interval and book.tick_count % book.equity_log_interval == 0:
+            conn.executemany(
+                "INSERT OR REPLACE INTO shadow_equity (timestamp, portfolio_id, equity) VALUES (?,?,?)",
+                zip(itertools.repeat(now), ids, result["equity"].tolist())
+            )
+
+
+def build_shadow_portfolios():
+    """
+    config.SHADOW_STRATEGY_GRID로 섀도 포트폴리오 생성/복원. 비활성화면 None.
+    """
+    if not config.SHADOW_STRATEGIES_ENABLED:
+        return None
+    configs = build_grid(config.SHADOW_STRATEGY_GRID)
+    book = load_or_create(
+        configs,
+        initial_balance=config.SHADOW_INITIAL_BALANCE,
+        equity_log_interval=config.SHADOW_EQUITY_LOG_INTERVAL
+    )
+    print(f"[INFO] 섀도 전략 {len(book)}개 로드")
+    return book
+
+
+def run_shadow_step(book: ShadowPortfolios, price: float, rsi: float, sentiment: float):
+    """
+    main.run_tick에서 호출: 벡터 리밸런싱 + 기록.
+    """
+    result = book.step(
+        price, rsi, sentiment,
+        levels=config.SIM_BOOK_LEVELS,
+        spread_bps=config.SIM_SPREAD_BPS,
+        step_bps=config.SIM_STEP_BPS,
+        level_qty=config.SIM_LEVEL_QTY,
+        depth_growth=config.SIM_DEPTH_GROWTH
+    )
+    log_step(book, result, price, rsi, sentiment)
+    traded = int(np.count_nonzero(result["side"]))
+    best = book.summary(price, top=1)
+    print(f"[INFO] 섀도 전략 {len(book)}개 갱신: 체결 {traded}건, 최고 자산 {best[0][0]}={best[0][1]:.2f}")
+    return result
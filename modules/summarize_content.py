@@ -1,34 +1,70 @@
 # summarize_content.py
-from openai import OpenAI
-import os
-from typing import List, Dict
+from modules.llm_client import get_client
+import math
+from typing import List, Dict, Tuple
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except ImportError:  # tiktoken 미설치 시 글자 수 기반 추정
+    _ENCODING = None
 
 print("[LOG] summarize_content.py module is being imported...")
 
-client = OpenAI(
-    api_key=os.environ.get("OPENAI_API_KEY")
+# 청크(=LLM 호출 1회) 당 입력 토큰 예산, item 1개 최대 토큰, 1회 갱신 전체 토큰 예산
+CONTEXT_TOKEN_BUDGET = 3000
+MAX_ITEM_TOKENS = 400
+REFRESH_TOKEN_BUDGET = 12000
+
+# score가 없는 뉴스(RSS/CryptoPanic)의 기본 가치 (log1p(score) 기준, score≈150 수준)
+DEFAULT_ITEM_VALUE = 5.0
+
+SYSTEM_PROMPT = "You are a helpful assistant that summarizes crypto news/posts in English."
+PROMPT_HEADER = "The following are articles or posts related to cryptocurrency:\n\n"
+PROMPT_FOOTER = (
+    "Please provide a single concise English summary of the entire content above, "
+    "keeping it under 300 words."
 )
 
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정. tiktoken이 있으면 정확히, 없으면 4글자≈1토큰으로 근사.
+    """
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def format_item(index: int, item: Dict) -> str:
+    title = item.get("title", "(no title)")
+    text = item.get("text", "(no text)")
+    return f"({index}) Title: {title}\nContent: {text}\n\n"
+
+
 def summarize_chunk(chunk: List[Dict]) -> str:
     """
     Summarize a chunk of data (e.g. 5 articles/posts) at once using GPT.
     """
-    system_prompt = "You are a helpful assistant that summarizes crypto news/posts in English."
-    user_prompt = "The following are articles or posts related to cryptocurrency:\n\n"
-    for i, item in enumerate(chunk, start=1):
-        title = item.get("title", "(no title)")
-        text = item.get("text", "(no text)")
-        user_prompt += f"({i}) Title: {title}\nContent: {text}\n\n"
+    summary_text, _ = summarize_chunk_with_usage(chunk)
+    return summary_text
 
-    user_prompt += (
-        "Please provide a single concise English summary of the entire content above, "
-        "keeping it under 300 words."
-    )
 
-    response = client.chat.completions.create(
+def summarize_chunk_with_usage(chunk: List[Dict]) -> Tuple[str, Dict]:
+    """
+    summarize_chunk와 같으나 API가 보고한 토큰 사용량(usage)도 함께 반환.
+    """
+    user_prompt = PROMPT_HEADER
+    for i, item in enumerate(chunk, start=1):
+        user_prompt += format_item(i, item)
+    user_prompt += PROMPT_FOOTER
+
+    response = get_client().chat.completions.create(
         model="gpt-3.5-turbo",
         messages=[
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt}
         ],
         max_tokens=500,
@@ -36,7 +72,12 @@ def summarize_chunk(chunk: List[Dict]) -> str:
     )
 
     summary_text = response.choices[0].message.content
-    return summary_text.strip()
+    usage = getattr(response, "usage", None)
+    usage = {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0
+    }
+    return summary_text.strip(), usage
 
 def chunkify(data_list: List[Dict], chunk_size: int = 5) -> List[List[Dict]]:
     """
@@ -47,30 +88,145 @@ def chunkify(data_list: List[Dict], chunk_size: int = 5) -> List[List[Dict]]:
         chunks.append(data_list[i:i+chunk_size])
     return chunks
 
-def main(collected_data: dict, chunk_size: int = 5) -> List[Dict]:
+
+def item_value(item: Dict) -> float:
+    """
+    item 우선순위. Reddit은 score(log 스케일), score가 없는 뉴스는 DEFAULT_ITEM_VALUE.
+    """
+    if "score" in item and item["score"] is not None:
+        return math.log1p(max(item["score"], 0))
+    return DEFAULT_ITEM_VALUE
+
+
+def _truncate_item(item: Dict, max_tokens: int) -> Tuple[Dict, int, bool]:
+    """
+    프롬프트에 들어갈 item 토큰 수가 max_tokens를 넘으면 text를 비율대로 잘라냄.
+    """
+    tokens = estimate_tokens(format_item(1, item))
+    if tokens <= max_tokens:
+        return item, tokens, False
+
+    text = item.get("text", "")
+    overhead = tokens - estimate_tokens(text)
+    keep_chars = max(0, int(len(text) * (max_tokens - overhead) / max(estimate_tokens(text), 1)))
+    truncated = dict(item, text=text[:keep_chars] + " ...(truncated)")
+    return truncated, estimate_tokens(format_item(1, truncated)), True
+
+
+def chunk_by_tokens(data_list: List[Dict],
+                    token_budget: int = CONTEXT_TOKEN_BUDGET,
+                    max_item_tokens: int = MAX_ITEM_TOKENS,
+                    max_total_tokens: int = REFRESH_TOKEN_BUDGET,
+                    groups: List[str] = None) -> Tuple[List[List[Dict]], Dict]:
+    """
+    item들을 추정 토큰 수 기준으로 청크에 채워 넣음 (LLM 호출 수 최소화).
+    1) item별 토큰이 max_item_tokens를 넘으면 본문을 잘라냄
+    2) 전체가 max_total_tokens를 넘으면 가치(item_value)가 낮은 item부터 제외
+    3) 남은 item을 큰 것부터 token_budget에 맞춰 first-fit으로 채움
+    groups(data_list와 같은 길이)를 주면 같은 그룹끼리만 한 청크에 묶고,
+    청크별 그룹을 stats["chunk_groups"]에 담음.
+    반환: (chunks, 통계 dict)
+    """
+    fixed_tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(PROMPT_HEADER) + estimate_tokens(PROMPT_FOOTER)
+    item_budget = max(token_budget - fixed_tokens, 1)
+    max_item_tokens = min(max_item_tokens, item_budget)
+
+    prepared = []
+    truncated_count = 0
+    for order, item in enumerate(data_list):
+        item, tokens, truncated = _truncate_item(item, max_item_tokens)
+        truncated_count += truncated
+        prepared.append((order, item, tokens))
+
+    # 가치 높은 순으로 전체 예산 안에서 선택
+    kept = []
+    used = 0
+    dropped = 0
+    for order, item, tokens in sorted(prepared, key=lambda p: item_value(p[1]), reverse=True):
+        if max_total_tokens and used + tokens > max_total_tokens:
+            dropped += 1
+            continue
+        kept.append((order, item, tokens))
+        used += tokens
+
+    # first-fit decreasing 패킹
+    bins = []  # [남은 토큰, [(order, item)], 그룹]
+    for order, item, tokens in sorted(kept, key=lambda p: p[2], reverse=True):
+        group = groups[order] if groups else None
+        for b in bins:
+            if b[2] == group and b[0] >= tokens:
+                b[0] -= tokens
+                b[1].append((order, item))
+                break
+        else:
+            bins.append([item_budget - tokens, [(order, item)], group])
+
+    # 청크 안에서는 원래 수집 순서 유지
+    chunks = [[item for _, item in sorted(b[1], key=lambda p: p[0])] for b in bins]
+    stats = {
+        "items_in": len(data_list),
+        "items_kept": len(kept),
+        "items_dropped": dropped,
+        "items_truncated": truncated_count,
+        "chunks": len(chunks),
+        "estimated_prompt_tokens": used + fixed_tokens * len(chunks)
+    }
+    if groups:
+        stats["chunk_groups"] = [b[2] for b in bins]
+    return chunks, stats
+
+def main(collected_data: dict, chunk_size: int = None,
+         token_budget: int = CONTEXT_TOKEN_BUDGET,
+         max_total_tokens: int = REFRESH_TOKEN_BUDGET) -> List[Dict]:
     """
     data_collector.py 에서 수집된 데이터를 입력받아 요약을 수행하고,
     (파일에 저장하지 않고) 메모리 상에서 결과를 반환.
+    chunk_size를 주면 기존처럼 개수 기준으로 나누고,
+    없으면 토큰 예산(token_budget / max_total_tokens) 기준으로 묶음.
+    청크는 소스(rss / cryptopanic / reddit)별로 나뉘며, 요약 결과에 "source"로 표시.
+    토큰 예산 때문에 빠진 item이 있을 수 있으므로, 실제로 요약에 들어간 item은 요약 결과의 "items"에 담음.
     """
     print("[START] summarize_content.py main()")
 
-    # 1) RSS 데이터, 2) CryptoPanic 데이터, 3) Reddit 데이터를 전부 합쳐서 요약
+    # 1) RSS 데이터, 2) CryptoPanic 데이터, 3) Reddit 데이터를 소스 표시와 함께 합침
     combined_data = []
-    combined_data.extend(collected_data.get("rss", []))
-    combined_data.extend(collected_data.get("cryptopanic", []))
-    combined_data.extend(collected_data.get("reddit", []))
+    groups = []
+    for source in ("rss", "cryptopanic", "reddit"):
+        items = collected_data.get(source, [])
+        combined_data.extend(items)
+        groups.extend([source] * len(items))
 
     # chunk 단위로 나눈 후 GPT 요약
+    if chunk_size:
+        chunked_lists = []
+        chunk_groups = []
+        for source in ("rss", "cryptopanic", "reddit"):
+            source_chunks = chunkify(collected_data.get(source, []), chunk_size=chunk_size)
+            chunked_lists.extend(source_chunks)
+            chunk_groups.extend([source] * len(source_chunks))
+    else:
+        chunked_lists, stats = chunk_by_tokens(combined_data, token_budget,
+                                               max_total_tokens=max_total_tokens, groups=groups)
+        chunk_groups = stats.pop("chunk_groups", [None] * len(chunked_lists))
+        print(f"[INFO] Token chunking: {stats}")
+
     all_summaries = []
-    chunked_lists = chunkify(combined_data, chunk_size=chunk_size)
-    for idx, chunk in enumerate(chunked_lists, start=1):
-        summary_result = summarize_chunk(chunk)
+    total_usage = {"prompt_tokens": 0, "completion_tokens": 0}
+    for idx, (chunk, source) in enumerate(zip(chunked_lists, chunk_groups), start=1):
+        summary_result, usage = summarize_chunk_with_usage(chunk)
+        total_usage["prompt_tokens"] += usage["prompt_tokens"]
+        total_usage["completion_tokens"] += usage["completion_tokens"]
         all_summaries.append({
             "chunk_index": idx,
-            "summary_text": summary_result
+            "source": source,
+            "item_count": len(chunk),
+            "items": chunk,
+            "summary_text": summary_result,
+            "usage": usage
         })
-        print(f"[INFO] Summarized chunk {idx} with {len(chunk)} items.")
+        print(f"[INFO] Summarized chunk {idx} ({source}) with {len(chunk)} items. usage={usage}")
 
+    print(f"[INFO] Total LLM calls: {len(chunked_lists)}, token usage: {total_usage}")
     print("[END] summarize_content.py main()")
     return all_summaries
 
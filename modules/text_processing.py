@@ -0,0 +1,69 @@
+# text_processing.py
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# HTML 태그와 URL을 한 번의 정규식 탐색으로 찾아 공백으로 치환.
+# URL은 닫히는 태그의 시작('<...>') 전에서 끊어, 태그 제거 후 URL 제거(http\S+)한 기존 결과와 같게 함.
+# (단어 "http"만 있는 경우는 URL이 아니므로 남김, 닫히지 않는 '<'는 URL의 일부로 봄)
+_MARKUP_PATTERN = re.compile(r"<[^>\n]*>|http(?:[^\s<]|<(?![^>\n]*>))+")
+
+TRUNCATE_SUFFIX = " ...(truncated)"
+
+
+def normalize_text(raw_text: str) -> str:
+    """
+    태그/URL 제거 + 공백(개행 포함) 정리. 길이 제한은 하지 않음.
+    공백 정리는 str.split()/join 한 번으로 처리 (토큰화).
+    """
+    if not raw_text:
+        return ""
+    return " ".join(_MARKUP_PATTERN.sub(" ", raw_text).split())
+
+
+def truncate_text(text: str, max_length: int) -> str:
+    if len(text) > max_length:
+        return text[:max_length] + TRUNCATE_SUFFIX
+    return text
+
+
+def clean_text(raw_text: str, max_length: int = 500) -> str:
+    return truncate_text(normalize_text(raw_text), max_length)
+
+
+def join_cleaned(*parts: str, max_length: int = 1500) -> str:
+    """
+    이미 정리된(normalize_text) 필드들을 이어 붙여 하나의 text로 만듦 (재정리 없음).
+    """
+    return truncate_text(" ".join(p for p in parts if p), max_length)
+
+
+def clean_records(records, field_limits, text_fields=None, text_max_length=1500,
+                  workers=None, chunk_size=512) -> list:
+    """
+    여러 레코드(dict)의 원문 필드를 한 번에 정리하는 배치 API.
+    - field_limits    : {필드명: 최대 길이} 정리 후 잘라낼 필드
+    - text_fields     : 'text'로 합칠 필드 순서 (예: ("title", "summary")).
+                        각 필드는 한 번만 정리하고, 정리된 결과를 재사용해 text를 만듦
+    - workers         : 지정 시 chunk_size 단위로 스레드 풀에 분배 (HTML이 큰 피드용)
+    반환: 레코드별 {필드명: 정리된 값, "text": 합친 값} 리스트
+    """
+    needed = set(field_limits) | set(text_fields or ())
+
+    def _clean_one(record):
+        normalized = {f: normalize_text(record.get(f) or "") for f in needed}
+        out = {f: truncate_text(normalized[f], limit) for f, limit in field_limits.items()}
+        if text_fields:
+            out["text"] = join_cleaned(*(normalized[f] for f in text_fields), max_length=text_max_length)
+        return out
+
+    def _clean_chunk(chunk):
+        return [_clean_one(r) for r in chunk]
+
+    records = list(records)
+    if not workers or len(records) <= chunk_size:
+        return _clean_chunk(records)
+
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_clean_chunk, chunks)
+    return [out for chunk in results for out in chunk]
@@ -0,0 +1,167 @@
+# tick_bus.py
+"""
+트레이더 -> 대시보드 실시간 틱 이벤트 채널 (공유 메모리 링 버퍼, DB 조회 없음).
+
+파일(data/tick_bus.ring)을 mmap으로 열어 고정 크기 슬롯 n개를 원형으로 사용.
+- 헤더 : magic, version, slot_size, n_slots, write_seq(마지막으로 쓴 이벤트 번호)
+- 슬롯 : seq(uint64) + 길이(uint32) + JSON 본문
+  쓰기 순서: 슬롯 seq=0 -> 본문 -> 슬롯 seq -> 헤더 write_seq
+  읽기 쪽은 본문 전후로 슬롯 seq를 두 번 읽어 같을 때만 사용 (쓰는 중인 슬롯은 건너뜀)
+
+작성자는 트레이더 1개 프로세스, 구독자는 여러 개 가능 (각자 마지막으로 읽은 seq만 기억).
+구독자가 n_slots개 넘게 뒤처지면 덮어쓰인 이벤트는 잃고 남아 있는 가장 오래된 것부터 읽음.
+"""
+import os
+import json
+import mmap
+import struct
+
+print("[LOG] tick_bus.py module is being imported...")
+
+TICK_BUS_FILE = "data/tick_bus.ring"
+MAGIC = b"TBUS"
+VERSION = 1
+HEADER = struct.Struct("<4sIIIQ")  # magic, version, slot_size, n_slots, write_seq
+HEADER_SIZE = 64
+SLOT_HEADER = struct.Struct("<QI")  # seq, payload 길이
+WRITE_SEQ_OFFSET = 16
+
+
+class TickPublisher:
+    """
+    트레이더 쪽 작성자. 같은 설정의 파일이 있으면 write_seq를 이어받아 구독자가 끊기지 않음.
+    """
+
+    def __init__(self, path: str = TICK_BUS_FILE, n_slots: int = 1024, slot_size: int = 512):
+        self.path = path
+        self.n_slots = n_slots
+        self.slot_size = slot_size
+        size = HEADER_SIZE + n_slots * slot_size
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        write_seq = 0
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size == size:
+                magic, version, old_slot, old_n, old_seq = HEADER.unpack(os.read(fd, HEADER.size))
+                if (magic, version, old_slot, old_n) == (MAGIC, VERSION, slot_size, n_slots):
+                    write_seq = old_seq
+            if write_seq == 0:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, slot_size, n_slots, write_seq)
+        self.seq = write_seq
+
+    def publish(self, event: dict) -> int:
+        """
+        이벤트 1개 기록. 반환: seq (본문이 슬롯보다 크면 기록하지 않고 None)
+        """
+        payload = json.dumps(event, separators=(",", ":"), default=float).encode("utf-8")
+        if len(payload) > self.slot_size - SLOT_HEADER.size:
+            print(f"[WARN] tick_bus 이벤트가 슬롯 크기를 넘어 건너뜀 ({len(payload)} bytes)")
+            return None
+
+        seq = self.seq + 1
+        offset = HEADER_SIZE + ((seq - 1) % self.n_slots) * self.slot_size
+        SLOT_HEADER.pack_into(self._mm, offset, 0, 0)
+        start = offset + SLOT_HEADER.size
+        self._mm[start:start + len(payload)] = payload
+        SLOT_HEADER.pack_into(self._mm, offset, seq, len(payload))
+        struct.pack_into("<Q", self._mm, WRITE_SEQ_OFFSET, seq)
+        self.seq = seq
+        return seq
+
+    def close(self):
+        self._mm.close()
+
+
+class TickSubscriber:
+    """
+    대시보드 쪽 구독자. poll()로 마지막으로 읽은 seq 이후 이벤트만 가져옴.
+    파일이 아직 없거나 작성자가 다른 설정으로 다시 만들면 다음 poll에서 다시 엶.
+    """
+
+    def __init__(self, path: str = TICK_BUS_FILE):
+        self.path = path
+        self.last_seq = 0
+        self.dropped = 0
+        self._mm = None
+        self._inode = None
+
+    def _open(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.close()
+            return False
+        if self._mm is not None and self._inode == (stat.st_ino, stat.st_size):
+            return True
+
+        self.close()
+        if stat.st_size < HEADER_SIZE:
+            return False
+        with open(self.path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, slot_size, n_slots, _ = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION or stat.st_size != HEADER_SIZE + slot_size * n_slots:
+            mm.close()
+            return False
+        self._mm, self._inode = mm, (stat.st_ino, stat.st_size)
+        self.slot_size, self.n_slots = slot_size, n_slots
+        return True
+
+    def _read_slot(self, seq: int):
+        offset = HEADER_SIZE + ((seq - 1) % self.n_slots) * self.slot_size
+        slot_seq, length = SLOT_HEADER.unpack_from(self._mm, offset)
+        if slot_seq != seq or length > self.slot_size - SLOT_HEADER.size:
+            return None
+        start = offset + SLOT_HEADER.size
+        payload = bytes(self._mm[start:start + length])
+        if SLOT_HEADER.unpack_from(self._mm, offset)[0] != seq:
+            return None  # 읽는 사이 덮어쓰임
+        try:
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+    def write_seq(self) -> int:
+        if not self._open():
+            return 0
+        return struct.unpack_from("<Q", self._mm, WRITE_SEQ_OFFSET)[0]
+
+    def poll(self, max_events: int = None) -> list:
+        """
+        새 이벤트 목록 (오래된 순). 각 이벤트에는 "seq" 키가 추가됨.
+        """
+        head = self.write_seq()
+        if head == 0:
+            return []
+        if head < self.last_seq:
+            # 작성자가 새 파일로 다시 시작
+            self.last_seq = 0
+        oldest = max(self.last_seq + 1, head - self.n_slots + 1)
+        if oldest > self.last_seq + 1 and self.last_seq:
+            self.dropped += oldest - self.last_seq - 1
+        if max_events is not None:
+            oldest = max(oldest, head - max_events + 1)
+
+        events = []
+        for seq in range(oldest, head + 1):
+            event = self._read_slot(seq)
+            if event is not None:
+                event["seq"] = seq
+                events.append(event)
+        self.last_seq = head
+        return events
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = None
+        self._inode = None
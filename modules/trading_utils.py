@@ -2,20 +2,26 @@
 import pandas as pd
 import datetime
 import time
+import copy
 
 print("[LOG] trading_utils.py module is being imported...")
 
-from config.config import EXCHANGE
+from modules.exchange_gateway import get_gateway
 
 def fetch_ohlc_data(symbol, timeframe='5m', limit=50):
-    """ccxt를 통해 OHLCV 데이터를 받아오는 함수"""
+    """ccxt를 통해 OHLCV 데이터를 받아오는 함수 (거래소 관문: rate limit / 요청 병합 / 재시도)"""
     print(f"[LOG] fetch_ohlc_data() -> symbol={symbol}, timeframe={timeframe}, limit={limit}")
-    ohlcv = EXCHANGE.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+    ohlcv = get_gateway().fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
     df = pd.DataFrame(ohlcv, columns=['timestamp','open','high','low','close','volume'])
     df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
     df.set_index('timestamp', inplace=True)
     return df
 
+def fetch_order_book(symbol, limit=20):
+    """ccxt를 통해 호가창 스냅샷(bids/asks)을 받아오는 함수"""
+    print(f"[LOG] fetch_order_book() -> symbol={symbol}, limit={limit}")
+    return get_gateway().fetch_order_book(symbol, limit=limit)
+
 def calculate_sma(df, window=14, column='close'):
     """ 단순 이동평균(SMA) """
     print(f"[LOG] calculate_sma() -> window={window}")
@@ -52,6 +58,115 @@ def calculate_macd(df, fast_period=12, slow_period=26, signal_period=9, column='
     df['MACD_hist'] = df['MACD'] - df['MACD_signal']
     return df
 
+# -------- 증분(incremental) 지표 상태 --------
+def init_indicator_state(sma_window=20, rsi_period=14, fast_period=12, slow_period=26, signal_period=9):
+    """
+    SMA/RSI/MACD를 캔들 단위로 이어서 계산하기 위한 상태(dict, JSON 직렬화 가능).
+    - cursor : 마지막으로 확정(commit)된 캔들의 timestamp(ms)
+    - latest : 진행 중인 마지막 캔들까지 반영한 최신 지표 값
+    """
+    return {
+        "params": {
+            "sma_window": sma_window,
+            "rsi_period": rsi_period,
+            "fast_period": fast_period,
+            "slow_period": slow_period,
+            "signal_period": signal_period
+        },
+        "cursor": None,
+        "closes": [],
+        "prev_close": None,
+        "rsi_count": 0,
+        "gain_num": 0.0,
+        "gain_den": 0.0,
+        "loss_num": 0.0,
+        "loss_den": 0.0,
+        "ema_fast": None,
+        "ema_slow": None,
+        "macd_signal": None,
+        "latest": {}
+    }
+
+def _advance_indicator_state(state, close):
+    """
+    캔들 1개(close)를 상태에 반영. calculate_sma/rsi/macd와 같은 식을 재귀형으로 계산.
+    """
+    p = state["params"]
+
+    closes = state["closes"]
+    closes.append(close)
+    if len(closes) > p["sma_window"]:
+        del closes[0]
+    sma = sum(closes) / len(closes) if len(closes) == p["sma_window"] else None
+
+    # RSI: ewm(com=period-1, adjust=True) 의 분자/분모를 누적
+    delta = 0.0 if state["prev_close"] is None else close - state["prev_close"]
+    decay = 1.0 - 1.0 / p["rsi_period"]
+    state["gain_num"] = max(delta, 0.0) + decay * state["gain_num"]
+    state["gain_den"] = 1.0 + decay * state["gain_den"]
+    state["loss_num"] = max(-delta, 0.0) + decay * state["loss_num"]
+    state["loss_den"] = 1.0 + decay * state["loss_den"]
+    state["rsi_count"] += 1
+    state["prev_close"] = close
+
+    rsi = None
+    if state["rsi_count"] >= p["rsi_period"]:
+        avg_gain = state["gain_num"] / state["gain_den"]
+        avg_loss = state["loss_num"] / state["loss_den"]
+        rsi = 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+
+    # MACD: ewm(span, adjust=False)
+    def _ema(prev, value, span):
+        return value if prev is None else prev + (2.0 / (span + 1)) * (value - prev)
+
+    state["ema_fast"] = _ema(state["ema_fast"], close, p["fast_period"])
+    state["ema_slow"] = _ema(state["ema_slow"], close, p["slow_period"])
+    macd = state["ema_fast"] - state["ema_slow"]
+    state["macd_signal"] = _ema(state["macd_signal"], macd, p["signal_period"])
+
+    state["latest"] = {
+        "close": close,
+        "sma": sma,
+        "rsi": rsi,
+        "macd": macd,
+        "macd_signal": state["macd_signal"],
+        "macd_hist": macd - state["macd_signal"]
+    }
+
+def update_indicator_state(state, df, column='close'):
+    """
+    fetch_ohlc_data() 결과(df)에서 cursor 이후 캔들만 상태에 반영.
+    마지막 캔들은 아직 진행 중이므로 확정하지 않고 latest 값 계산에만 사용.
+    재시작 후 공백이 df 범위를 넘어가면(연속성 끊김) df 전체로 다시 시작.
+    """
+    if state is None:
+        state = init_indicator_state()
+    if df.empty:
+        return state
+
+    # pandas 버전에 따라 인덱스 해상도가 ns/us/ms로 다르므로 ms로 맞춘 뒤 사용
+    timestamps = df.index.as_unit("ms").asi8.tolist()
+    closes = df[column].astype(float).tolist()
+
+    cursor = state["cursor"]
+    if cursor is not None and cursor < timestamps[0]:
+        print("[WARN] 지표 상태의 캔들 커서가 데이터 범위 밖 -> 지표 상태 재초기화")
+        state = init_indicator_state(**state["params"])
+        cursor = None
+
+    # (1) 확정된 캔들(마지막 제외) 반영
+    for ts, close in zip(timestamps[:-1], closes[:-1]):
+        if cursor is None or ts > cursor:
+            _advance_indicator_state(state, close)
+            state["cursor"] = ts
+
+    # (2) 진행 중인 캔들은 복사본에 반영해 최신 값만 갱신
+    if state["cursor"] is None or timestamps[-1] > state["cursor"]:
+        provisional = copy.deepcopy(state)
+        _advance_indicator_state(provisional, closes[-1])
+        state["latest"] = provisional["latest"]
+    return state
+
 if __name__ == "__main__":
     print("[START] trading_utils.py main()")
     # 간단 테스트 코드를 작성해도 됩니다.
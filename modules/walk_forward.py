@@ -0,0 +1,328 @@
+# walk_forward.py
+"""
+워크포워드 최적화 + 표본 외(out-of-sample) 검증.
+
+1) 전체 기간의 지표(SMA / RSI)를 파라미터별로 한 번만 계산해 2차원 배열로 보관
+2) 롤링(또는 확장) train/test 구간을 만들고, train 구간마다 전체 파라미터 격자를
+   워커 프로세스에서 벡터 연산으로 평가해 최적 파라미터 선택
+   (지표 배열은 ProcessPoolExecutor initializer로 워커당 한 번만 전달)
+3) 각 test 구간에 직전 train 구간의 최적 파라미터를 적용해 수익률을 이어 붙인
+   표본 외 자산 곡선과 요약 지표를 반환
+
+전략
+- sma : temp/simple_sma_backtest.py의 골든/데드크로스 (포지션 = sign(SMA_short - SMA_long))
+- rsi : main.py adjust_target_ratio_with_signals의 RSI 부분 (목표 비중 = base ± step)
+
+실행:
+    python -m modules.walk_forward --strategy sma --symbol BTC/USDT --timeframe 1d --limit 1000
+    python -m modules.walk_forward --strategy rsi --synthetic 20000 --train 2000 --test 500
+"""
+import os
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+print("[LOG] walk_forward.py module is being imported...")
+
+PERIODS_PER_YEAR = {"1d": 365, "4h": 365 * 6, "1h": 365 * 24, "15m": 365 * 96, "5m": 365 * 288, "1m": 365 * 1440}
+
+DEFAULT_SMA_GRID = {
+    "short": list(range(3, 31, 1)),
+    "long": list(range(10, 201, 5))
+}
+DEFAULT_RSI_GRID = {
+    "period": [7, 14, 21],
+    "base_ratio": [0.3, 0.4, 0.5, 0.6, 0.7],
+    "low": [20, 25, 30, 35],
+    "high": [65, 70, 75, 80],
+    "step": [0.1, 0.2]
+}
+
+# 워커 프로세스 공유 데이터 (initializer에서 한 번 설정)
+_SHARED = None
+
+
+###################
+# 지표 사전 계산  #
+###################
+def precompute_sma(close: np.ndarray, windows) -> np.ndarray:
+    """
+    누적합으로 여러 window의 SMA를 한 번에 계산. 반환: (len(windows), n), 워밍업 구간은 nan.
+    """
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    csum = np.concatenate([[0.0], np.cumsum(close)])
+    out = np.full((len(windows), n), np.nan)
+    for i, w in enumerate(windows):
+        if w <= n:
+            out[i, w - 1:] = (csum[w:] - csum[:-w]) / w
+    return out
+
+
+def precompute_rsi(close: np.ndarray, periods) -> np.ndarray:
+    """
+    trading_utils.calculate_rsi와 같은 식(ewm com=period-1)으로 여러 기간의 RSI를 계산. 반환: (len(periods), n)
+    """
+    delta = pd.Series(np.asarray(close, dtype=float)).diff(1)
+    gain = delta.where(delta > 0, 0)
+    loss = (-delta).where(delta < 0, 0)
+    out = np.empty((len(periods), len(delta)))
+    for i, p in enumerate(periods):
+        avg_gain = gain.ewm(com=p - 1, min_periods=p).mean()
+        avg_loss = loss.ewm(com=p - 1, min_periods=p).mean()
+        out[i] = (100 - 100 / (1 + avg_gain / avg_loss)).to_numpy()
+    return out
+
+
+def build_shared(strategy: str, close: np.ndarray, grid: dict, fee: float, allow_short: bool = True) -> dict:
+    """
+    워커에 넘길 공유 데이터: 캔들 수익률, 지표 배열, 파라미터 격자(열별 배열)와 지표 인덱스.
+    """
+    close = np.asarray(close, dtype=float)
+    returns = np.zeros(len(close))
+    returns[1:] = close[1:] / close[:-1] - 1.0
+
+    if strategy == "sma":
+        combos = [(s, l) for s, l in itertools.product(grid["short"], grid["long"]) if s < l]
+        windows = sorted({w for combo in combos for w in combo})
+        index = {w: i for i, w in enumerate(windows)}
+        params = {
+            "short": np.array([s for s, _ in combos]),
+            "long": np.array([l for _, l in combos]),
+        }
+        return {
+            "strategy": strategy, "returns": returns, "fee": fee, "allow_short": allow_short,
+            "indicator": precompute_sma(close, windows),
+            "short_idx": np.array([index[s] for s, _ in combos]),
+            "long_idx": np.array([index[l] for _, l in combos]),
+            "params": params
+        }
+
+    if strategy == "rsi":
+        keys = ("period", "base_ratio", "low", "high", "step")
+        combos = [c for c in itertools.product(*(grid[k] for k in keys)) if c[2] < c[3]]
+        periods = sorted({c[0] for c in combos})
+        index = {p: i for i, p in enumerate(periods)}
+        params = {k: np.array([c[i] for c in combos], dtype=float) for i, k in enumerate(keys)}
+        return {
+            "strategy": strategy, "returns": returns, "fee": fee,
+            "indicator": precompute_rsi(close, periods),
+            "period_idx": np.array([index[c[0]] for c in combos]),
+            "params": params
+        }
+
+    raise ValueError(f"unknown strategy: {strategy}")
+
+
+#####################
+# 전략 수익률 (벡터) #
+#####################
+def _exposures(shared: dict, start: int, end: int, rows=None) -> np.ndarray:
+    """
+    구간 [start-1, end) 시점별 노출(포지션 비중). 반환: (파라미터 수, end-start+1)
+    t 시점 노출은 t 시점까지의 지표로만 결정 (미래 정보 없음).
+    """
+    lo = max(start - 1, 0)
+    ind = shared["indicator"]
+    if shared["strategy"] == "sma":
+        s_idx = shared["short_idx"] if rows is None else shared["short_idx"][rows]
+        l_idx = shared["long_idx"] if rows is None else shared["long_idx"][rows]
+        diff = ind[s_idx, lo:end] - ind[l_idx, lo:end]
+        pos = np.nan_to_num(np.sign(diff))
+        if not shared["allow_short"]:
+            pos = np.maximum(pos, 0.0)
+        exposure = pos
+    else:
+        p = shared["params"] if rows is None else {k: v[rows] for k, v in shared["params"].items()}
+        p_idx = shared["period_idx"] if rows is None else shared["period_idx"][rows]
+        rsi = ind[p_idx, lo:end]
+        ratio = p["base_ratio"][:, None] \
+            + np.where(rsi < p["low"][:, None], p["step"][:, None], 0.0) \
+            - np.where(rsi > p["high"][:, None], p["step"][:, None], 0.0)
+        exposure = np.clip(ratio, 0.0, 1.0)
+    if start == 0:
+        exposure = np.concatenate([np.zeros((exposure.shape[0], 1)), exposure], axis=1)
+    return exposure
+
+
+def strategy_returns(shared: dict, start: int, end: int, rows=None) -> np.ndarray:
+    """
+    구간 [start, end)의 파라미터별 순수익률 (수수료 차감). 반환: (파라미터 수, end-start)
+    - t 수익 = (t-1 노출) × (t 캔들 수익률) - fee × |t-1 노출 변화|
+    - 구간 시작 시 직전 노출로 진입한다고 보고 진입 비용을 한 번 차감 (구간마다 독립 배치)
+    """
+    exposure = _exposures(shared, start, end, rows)
+    held = exposure[:, :-1]
+    changes = np.abs(np.diff(exposure, axis=1, prepend=0.0))[:, :-1]
+    return held * shared["returns"][start:end] - shared["fee"] * changes
+
+
+def score(returns: np.ndarray, objective: str = "sharpe") -> np.ndarray:
+    """
+    파라미터별 목적 함수. sharpe(구간 내 평균/표준편차) 또는 total(누적 로그수익).
+    """
+    log_ret = np.log1p(np.maximum(returns, -0.999999))
+    if objective == "total":
+        return log_ret.sum(axis=1)
+    std = returns.std(axis=1)
+    return np.divide(returns.mean(axis=1), std, out=np.full(len(std), -np.inf), where=std > 0)
+
+
+##################
+# 워커 / 구간    #
+##################
+def _init_worker(shared: dict):
+    global _SHARED
+    _SHARED = shared
+
+
+def _optimize_window(task):
+    """
+    train 구간 하나에서 전체 파라미터 격자를 평가해 최적 파라미터 인덱스와 점수 반환.
+    """
+    index, train_start, train_end, objective = task
+    scores = score(strategy_returns(_SHARED, train_start, train_end), objective)
+    best = int(np.argmax(scores))
+    return index, best, float(scores[best])
+
+
+def make_windows(n: int, train: int, test: int, step: int = None, anchored: bool = False,
+                 warmup: int = 0) -> list:
+    """
+    [(train_start, train_end, test_start, test_end)] 목록.
+    anchored=True면 train 시작을 warmup에 고정(확장 구간), 아니면 train 길이 고정(롤링).
+    """
+    step = test if step is None else step
+    windows = []
+    train_start = warmup
+    while train_start + train + test <= n:
+        train_end = train_start + train
+        windows.append((warmup if anchored else train_start, train_end, train_end, train_end + test))
+        train_start += step
+    return windows
+
+
+def run_walk_forward(close, strategy: str = "sma", grid: dict = None, train: int = 365, test: int = 90,
+                     step: int = None, anchored: bool = False, fee: float = 0.001,
+                     objective: str = "sharpe", workers: int = None, allow_short: bool = True,
+                     index=None) -> dict:
+    """
+    워크포워드 실행. 반환 dict:
+    - windows   : 구간별 최적 파라미터 / train 점수 / test 수익 (DataFrame)
+    - equity    : 표본 외 자산 곡선 (시작 1.0, pd.Series)
+    - benchmark : 같은 구간 Buy&Hold 자산 곡선
+    - summary   : 총수익, 연환산 샤프, 최대 낙폭, 파라미터 변경 횟수 등
+    step(기본 test)이 test보다 작으면 겹치는 test 구간은 다음 구간 시작 전까지만, 크면 test 구간만 이어 붙임.
+    workers=0이면 현재 프로세스에서 순차 실행.
+    """
+    grid = grid or (DEFAULT_SMA_GRID if strategy == "sma" else DEFAULT_RSI_GRID)
+    close = np.asarray(close, dtype=float)
+    started = time.perf_counter()
+    shared = build_shared(strategy, close, grid, fee, allow_short)
+    n_params = len(next(iter(shared["params"].values())))
+
+    warmup = max(grid["long"]) if strategy == "sma" else max(grid["period"])
+    windows = make_windows(len(close), train, test, step, anchored, warmup=warmup)
+    if not windows:
+        raise ValueError(f"데이터가 부족합니다: n={len(close)}, warmup={warmup}, train={train}, test={test}")
+
+    tasks = [(i, w[0], w[1], objective) for i, w in enumerate(windows)]
+    if workers == 0:
+        _init_worker(shared)
+        results = [_optimize_window(t) for t in tasks]
+    else:
+        workers = workers or min(len(tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,)) as pool:
+            results = list(pool.map(_optimize_window, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    results.sort()
+
+    # 표본 외 구간: 직전 train 최적 파라미터 적용 후 이어 붙이기.
+    # step < test면 test 구간이 겹치므로 다음 test 시작 전까지만 사용 (각 시점은 가장 최근 최적화 결과로 1번만),
+    # step > test면 구간 사이가 비므로 test 구간만 사용
+    rows = []
+    oos_returns = []
+    oos_positions = []
+    for k, ((i, best, train_score), (tr_s, tr_e, te_s, te_e)) in enumerate(zip(results, windows)):
+        test_ret = strategy_returns(shared, te_s, te_e, rows=np.array([best]))[0]
+        seg_end = min(te_e, windows[k + 1][2]) if k + 1 < len(windows) else te_e
+        oos_returns.append(test_ret[:seg_end - te_s])
+        oos_positions.append(np.arange(te_s, seg_end))
+        row = {"train_start": tr_s, "train_end": tr_e, "test_start": te_s, "test_end": te_e,
+               "train_score": train_score, "test_return": float(np.prod(1 + test_ret) - 1)}
+        row.update({k: v[best].item() for k, v in shared["params"].items()})
+        rows.append(row)
+
+    oos = np.concatenate(oos_returns)
+    positions = np.concatenate(oos_positions)
+    labels = pd.Index(index)[positions] if index is not None else positions
+    equity = pd.Series(np.cumprod(1 + oos), index=labels, name="walk_forward")
+    benchmark = pd.Series(np.cumprod(close[positions] / close[positions - 1]), index=labels, name="buy_and_hold")
+
+    df_windows = pd.DataFrame(rows)
+    param_cols = list(shared["params"])
+    summary = {
+        "strategy": strategy,
+        "objective": objective,
+        "params_evaluated": n_params,
+        "windows": len(windows),
+        "oos_periods": len(oos),
+        "total_return": float(equity.iloc[-1] - 1),
+        "buy_and_hold_return": float(benchmark.iloc[-1] - 1),
+        "sharpe_per_period": float(oos.mean() / oos.std()) if oos.std() > 0 else 0.0,
+        "max_drawdown": float((equity / equity.cummax() - 1).min()),
+        "param_changes": int((df_windows[param_cols].diff().abs().sum(axis=1) > 0).sum()),
+        "elapsed_s": round(time.perf_counter() - started, 3)
+    }
+    return {"windows": df_windows, "equity": equity, "benchmark": benchmark, "summary": summary}
+
+
+def _synthetic_close(n: int, seed: int = 42) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    # 추세가 바뀌는 구간을 섞은 가격 (레짐별 drift)
+    drift = np.repeat(rng.normal(0, 0.001, n // 500 + 1), 500)[:n]
+    return 1e8 * np.exp(np.cumsum(drift + rng.normal(0, 0.01, n)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="walk-forward optimization")
+    parser.add_argument("--strategy", choices=["sma", "rsi"], default="sma")
+    parser.add_argument("--symbol", default="BTC/USDT")
+    parser.add_argument("--timeframe", default="1d")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--synthetic", type=int, default=0, help="거래소 대신 합성 가격 n개 사용")
+    parser.add_argument("--train", type=int, default=365)
+    parser.add_argument("--test", type=int, default=90)
+    parser.add_argument("--step", type=int, default=None)
+    parser.add_argument("--anchored", action="store_true")
+    parser.add_argument("--fee", type=float, default=0.001)
+    parser.add_argument("--objective", choices=["sharpe", "total"], default="sharpe")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--long-only", action="store_true")
+    parser.add_argument("--output", default=None, help="표본 외 자산 곡선 CSV 경로")
+    args = parser.parse_args()
+
+    print("[START] walk_forward.py main()")
+    if args.synthetic:
+        close, index = _synthetic_close(args.synthetic), None
+    else:
+        import ccxt
+        ohlcv = ccxt.binance().fetch_ohlcv(args.symbol, timeframe=args.timeframe, limit=args.limit)
+        df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        close, index = df["close"].to_numpy(), pd.to_datetime(df["timestamp"], unit="ms")
+
+    result = run_walk_forward(
+        close, strategy=args.strategy, train=args.train, test=args.test, step=args.step,
+        anchored=args.anchored, fee=args.fee, objective=args.objective, workers=args.workers,
+        allow_short=not args.long_only, index=index
+    )
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(result["windows"])
+    print("[LOG] summary:", result["summary"])
+    if args.output:
+        pd.concat([result["equity"], result["benchmark"]], axis=1).to_csv(args.output)
+        print(f"[LOG] equity saved: {args.output}")
+    print("[END] walk_forward.py main()")
@@ -0,0 +1,45 @@
+# test_indicator_state.py
+"""
+update_indicator_state()의 증분 SMA/RSI/MACD가 calculate_sma/rsi/macd(전체 구간 pandas 계산)와 같은지 확인.
+fetch_ohlc_data()처럼 틱마다 최근 50개 캔들 창을 한 칸씩 밀어 가며 넣음.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("ccxt")  # trading_utils -> exchange_gateway -> ccxt
+
+from modules.trading_utils import calculate_sma, calculate_rsi, calculate_macd, update_indicator_state
+
+WINDOW = 50
+
+
+def _candles(n, unit):
+    rng = np.random.default_rng(0)
+    close = 1e8 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    index = pd.date_range("2024-01-01", periods=n, freq="5min").as_unit(unit)
+    return pd.DataFrame({"close": close}, index=index)
+
+
+@pytest.mark.parametrize("unit", ["ms", "us", "ns"])
+def test_incremental_state_matches_pandas(unit):
+    candles = _candles(300, unit)
+    expected = calculate_macd(calculate_rsi(calculate_sma(candles.copy(), window=20), period=14))
+
+    state = None
+    for end in range(WINDOW, len(candles) + 1):
+        state = update_indicator_state(state, candles.iloc[end - WINDOW:end])
+        latest, row = state["latest"], expected.iloc[end - 1]
+        assert latest["sma"] == pytest.approx(row["SMA_20"], rel=1e-9)
+        assert latest["rsi"] == pytest.approx(row["RSI_14"], rel=1e-9)
+        assert latest["macd"] == pytest.approx(row["MACD"], rel=1e-6, abs=1e-6)
+        assert latest["macd_signal"] == pytest.approx(row["MACD_signal"], rel=1e-6, abs=1e-6)
+
+    # 커서는 마지막으로 확정된(끝에서 두 번째) 캔들의 ms timestamp
+    assert state["cursor"] == int(candles.index[-2].timestamp() * 1000)
+
+
+def test_cursor_is_milliseconds_for_ms_index():
+    candles = _candles(60, "ms")
+    state = update_indicator_state(None, candles)
+    assert state["cursor"] == int(candles.index[-2].timestamp() * 1000)